@@ -5,22 +5,41 @@ Created: 04/26/2024
 Purpose: Add collisions
 """
 
+# Taken first so the startup report includes the imports
+from time import perf_counter
+IMPORT_START = perf_counter()
+
 # pip install pygame-ce
 # pip install pygame-menu
 # Import pygame and sys modules
 import pygame
-import pygame_menu as pm
 from sys import exit
-from time import sleep
-#import assets
+import os
+import sys
 import config
+
+# The shared modules live one folder up from this game,
+# player and enemy use them too
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.assets import asset_cache
+from shared.game_over import GameOverScreen
+from shared import dirty
+from shared import profiler
+from shared import replay
+from shared import sfx
+from shared import startup
+from shared.text import text_cache
+from shared.timestep import FixedTimestep, lerp_rect
+from shared.collision import sweep_rect, sweep_mask, column_spans, sweep_columns
+
 # Import the player class
 import player
 import enemy
-#import os
 
 class CarCrash:
     def __init__(self):
+        # Time each part of startup, STARTUP_REPORT=1 prints it
+        self.startup = startup.StartupTimer(IMPORT_START, startup.enabled())
 
         # Initialize mixer with larger buffer size for better performance
         pygame.mixer.pre_init(
@@ -30,64 +49,176 @@ class CarCrash:
             4096            # buffer size, larger to optimize music playback
         )
 
-        # Initialze the pygame engine
-        pygame.init()
+        # Start only the display, font and mixer parts of the Pygame engine
+        with self.startup.stage("init"):
+            startup.init_pygame()
 
-        # Create the game surface (window)
-        self.surface = pygame.display.set_mode(
-            (config.WIDTH, config.HEIGHT)
-        )
+        with self.startup.stage("display"):
+            # Create the game surface (window)
+            self.surface = pygame.display.set_mode(
+                (config.WIDTH, config.HEIGHT)
+            )
 
-        # Set window caption
-        pygame.display.set_caption("Car Crash")
+            # Set window caption
+            pygame.display.set_caption("Car Crash")
 
-        # Load background image from file into an image variable
-        self.background = pygame.image.load(
-            './assets/street.png').convert_alpha()
-        
-        # Set up computer control clock object to control the speed of the game
+        # Cut every image out of one sheet if build_assets.py made one
+        with self.startup.stage("assets"):
+            asset_cache.load_atlas("./assets/atlas.json")
+
+        # Set up computer control clock object to measure each frame
         self.clock = pygame.time.Clock()
 
+        # The game moves in fixed updates, however fast frames are drawn
+        self.timestep = FixedTimestep(config.UPDATES_PER_SECOND)
+
+        # Keys are read through the input log so a game can be recorded
+        # and replayed, RECORD_INPUT / REPLAY_INPUT turn that on
+        self.input_log = replay.from_environment()
+        if self.input_log.fast:
+            self.clock = replay.FastClock(self.timestep)
+
+        # Every random number comes from here, seeded from the input log
+        self.random = self.input_log.random()
+
+        # More than one enemy car is traffic mode, which uses the random
+        # numbers differently. A replay uses the count it was recorded
+        # with, older logs were recorded with the config's count.
+        self.enemy_count = self.input_log.variant(
+            int(os.environ.get("ENEMIES", config.ENEMIES)),
+            old_value=config.ENEMIES)
+
+        # Solid rows of each column of the car masks, see spans()
+        self.mask_spans = {}
+
         # Optimize game by only allowing these events to be captured
         pygame.event.set_allowed(
-            [pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP]
+            [pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.VIDEORESIZE]
         )
 
-        # Set window icon
-        window_icon = pygame.image.load("./assets/car.ico").convert_alpha()
-        pygame.display.set_icon(window_icon)
+        with self.startup.stage("assets"):
+            # Set window icon
+            window_icon = asset_cache.image("./assets/car.ico")
+            pygame.display.set_icon(window_icon)
 
+        # Create system font object for score
+        with self.startup.stage("font"):
+            self.font_small = pygame.font.SysFont("arialblack", 20)
+
+        with self.startup.stage("assets"):
+            # Load the crash sound now, not at the moment of the crash
+            self.sfx = sfx.SoundEffects()
+            self.sfx.load("crash", './assets/crash.wav', priority=1)
+
+            # Load background music file, set volume to 30%,
+            # range from 0.0 (mute) to 1.0 (full volume)
+            self.sfx.load_music('./assets/background_music.wav', volume=0.3)
+
+        # Optional dirty rectangle mode, only redraws what moved
+        self.dirty_rects = dirty.DirtyRects(
+            self.surface, self.make_background(), dirty.enabled())
+
+        # Time spent in each part of the game loop, F3 shows it
+        self.profiler = profiler.FrameProfiler(profiler.enabled())
+
+        # Crash sound and game over menu without blocking the game loop
+        self.game_over_screen = GameOverScreen(
+            self.surface, self.build_game_over_menu
+        )
+
+        self.reset()
+
+#-------------------------------RESET-------------------------------#
+    def reset(self):
+        """Start a new game, the window, images and music stay loaded"""
         # Create the player and enemy sprites
+        # The images come from the asset cache, so this is cheap
         self.create_sprites()
+        self.save_positions()
 
-        # Create system font object for score
-        self.font_small = pygame.font.SysFont("arialblack", 20)
-
-        # Load sound file into memory
-        pygame.mixer.music.load('./assets/background_music.wav')
+        # Don't count the time spent in the game over menu
+        self.timestep.reset()
+        self.clock.tick()
 
-        # Set volume to 30%, range from 0.0 (mute) to 1.0 (full volume)
-        pygame.mixer.music.set_volume(0.3)
+        # The game over menu covered the whole window
+        self.dirty_rects.invalidate()
 
         # Play in a loop until stopped
-        pygame.mixer.music.play(-1)
+        self.sfx.play_music()
+
+#------------------------------RESTART------------------------------#
+    def restart(self):
+        """Close the game over menu and play again in the same window"""
+        self.game_over_screen.close()
+        self.input_log.restarted()
+        self.reset()
+
+#------------------------------RESUME------------------------------#
+    def resume(self):
+        """Take the window and music back after the launcher ran another game
+
+        Images, sounds and fonts are still loaded, only the things every
+        game shares are set up again.
+        """
+        pygame.display.set_mode((config.WIDTH, config.HEIGHT))
+        pygame.display.set_caption("Car Crash")
+        pygame.display.set_icon(asset_cache.image("./assets/car.ico"))
+
+        self.sfx.load_music('./assets/background_music.wav', volume=0.3)
+
+        if self.game_over_screen.playing():
+            # Carry on where the game was left, without catching up
+            # on the time spent in the other game
+            self.timestep.reset()
+            self.clock.tick()
+            self.dirty_rects.invalidate()
+            self.sfx.play_music()
+        else:
+            # Left from the game over screen, start a new game
+            self.restart()
+
+#------------------------------QUIT------------------------------#
+    def quit(self):
+        """Close the game, the launcher replaces this to go back to its menu"""
+        # Quit pygame
+        pygame.quit()
+        # Exit Python
+        exit()
+
+#-----------------------------MAKE BACKGROUND-----------------------------#
+    def make_background(self):
+        """Load the street in the display's pixel format, it has no transparency"""
+        return asset_cache.image('./assets/street.png', convert="opaque")
+
+#-----------------------------REBUILD BACKGROUND-----------------------------#
+    def rebuild_background(self):
+        """Build the background again after a resize or a color change"""
+        self.dirty_rects.set_background(self.make_background())
 
 #------------------------------------CREATE SPRITES--------------------------------------#
     def create_sprites(self):
         # Create a Player sprite
-        self.player_sprite = player.Player()
-        self.enemy_sprite = enemy.Enemy()
+        self.player_sprite = player.Player(self.input_log)
 
         # Create Sprites Group, add Sprites to Group
         # a separate enemies group is created,
         # to allow for more enemy Sprites later if needed
         self.enemies = pygame.sprite.Group()
-        self.enemies.add(self.enemy_sprite)
- 
+
         # This group includes all sprites
         self.all_sprites = pygame.sprite.Group()
         self.all_sprites.add(self.player_sprite)
-        self.all_sprites.add(self.enemy_sprite)
+
+        # Traffic mode keeps many enemy cars in arrays instead of sprites
+        if self.enemy_count > 1:
+            # NumPy is only needed for traffic mode
+            from traffic import Traffic
+            self.traffic = Traffic(self.enemy_count, self.random)
+        else:
+            self.traffic = None
+            self.enemy_sprite = enemy.Enemy(self.random)
+            self.enemies.add(self.enemy_sprite)
+            self.all_sprites.add(self.enemy_sprite)
 
         # Even though we only have one player, we have to add it to a group
         # Only a group has a draw and update method
@@ -97,7 +228,8 @@ class CarCrash:
     def check_events(self):
         """Listen for and handle all window events"""
         # Iterate (loop) through all captured events
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
 
             # Closing the game causes the QUIT event to be fired
             if event.type == pygame.QUIT:
@@ -106,19 +238,34 @@ class CarCrash:
                 # Exit Python
                 exit()
 
+            # The ESC key will quit the game
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.quit()
+
+            # Build the background again if the window changes size
+            elif event.type == pygame.VIDEORESIZE:
+                self.rebuild_background()
+
+            # F3 turns the frame profiler on and off
+            self.profiler.handle_event(event)
+
+        # The game over menu needs the events too
+        return events
+
 #---------------------------------DISPLAY GAME OVER----------------------------------#
     def display_game_over(self):
-        """Display game over on top of the stopped game"""
+        """Stop the game and start the game over screen, the game loop keeps running"""
         # Stop background sound
-        pygame.mixer.music.stop()
+        self.sfx.stop_music()
 
-        # Play crash sound
-        crash = pygame.mixer.Sound('./assets/crash.wav')
-        crash.play()
-        #crash.set_volume(0.5)
+        # Play crash sound, the menu opens when it ends or after 3 seconds
+        self.game_over_screen.start(lambda: self.sfx.play("crash"), 3000)
 
-        # Wait 3 second
-        sleep(3)
+#---------------------------BUILD GAME OVER MENU--------------------------#
+    def build_game_over_menu(self):
+        """Create the game over menu using the Pygame Menu library"""
+        # pygame_menu is imported the first time it is needed
+        pm = startup.load_menu()
 
         # Define a meny object for the game over screen
         game_over = pm.Menu(
@@ -130,7 +277,7 @@ class CarCrash:
         )
 
         # Display final score
-        game_over.add.label(f"Score: {self.enemy_sprite.score}")
+        game_over.add.label(f"Score: {self.get_score()}")
 
         # Add label to provide space between buttons
         game_over.add.label("")
@@ -138,7 +285,7 @@ class CarCrash:
         # Add a button to the game over menu for exiting the game
         game_over.add.button(
             title="Play Again?",            # Button text
-            action=main                     # Call main() to start over
+            action=self.restart             # Play again in the same window
         )
 
         # Add a label to provide space between buttons
@@ -147,53 +294,178 @@ class CarCrash:
         # Add a button to the game over menu for exiting the game
         game_over.add.button(
             title="Exit",            # Button text
-            action=pm.events.EXIT    # Exit the game when clicked
+            action=self.quit         # Exit the game when clicked
         )
 
-        # Run the main loop of the game over menu on the specified surface
-        game_over.mainloop(self.surface)
+        return game_over
 
 #---------------------------------CHECK COLLISIONS----------------------------------#
     def check_collision(self):
         # If a collision occurs bewtween player and enemy
-        if pygame.sprite.spritecollideany(
-            self.player_sprite,
-            self.enemies
-        ):
+        # Pixel tests left for this update
+        self.mask_tests = config.MASK_TESTS
+
+        for enemy_sprite in self.enemies:
+            if self.hit_player(
+                enemy_sprite.rect,
+                enemy_sprite.mask,
+                (0, int(enemy_sprite.speed))    # move_ip drops the fraction
+            ):
+                self.display_game_over()
+                return
+
+        # Traffic mode tests only the cars near the player
+        if self.traffic is not None and self.traffic.collide(
+                self.player_sprite.rect, self.hit_player) is not None:
             self.display_game_over()
 
-#---------------------------------RUN GAME-----------------------------------------------#
-    def game_loop(self):
-        """Infinite Game Loop"""
-        while True:
-            self.check_events()
-            self.check_collision()
-
-            #----------------DRAW ON BACKBUFFER------------------#
-            # Fill in the surface with the background image loaded earlier
-            self.surface.blit(self.background, (0, 0))
-
-            #-----------------UPDATE AND DRAW SPRITES-----------------#
-            # Run the update method on all sprites
-            self.all_sprites.update()
-
-            # Draw all sprites on the surface
-            self.all_sprites.draw(self.surface)
-
-            # Render score before drawing on the surface
-            self.score = self.font_small.render(
-                str(self.enemy_sprite.score), True, config.BLACK
+#---------------------------------HIT PLAYER----------------------------------#
+    def hit_player(self, rect, mask, velocity):
+        """Return True if a car moving by velocity this update hits the player"""
+        # Check the whole move so a fast enemy can't jump over the player
+        contact = sweep_rect(rect, velocity, self.player_sprite.rect)
+        if contact is None:
+            return False
+
+        # Out of pixel tests this update, test the solid part of each
+        # column instead, it is one pass over the columns and the
+        # transparent corners still don't count
+        if self.mask_tests <= 0:
+            return sweep_columns(
+                rect, self.spans(mask), velocity,
+                self.player_sprite.rect, self.spans(self.player_sprite.mask)
             )
+        self.mask_tests -= 1
+
+        # The rects touch, check if the solid pixels do,
+        # the transparent corners of the cars don't count
+        return sweep_mask(
+            rect, mask, velocity,
+            self.player_sprite.rect, self.player_sprite.mask,
+            contact.time
+        )
 
-            # Draw score on the surface
-            self.surface.blit(self.score, (10, 10))
+#---------------------------------SPANS----------------------------------#
+    def spans(self, mask):
+        """Return the solid rows of each column of a mask, made only once"""
+        if mask not in self.mask_spans:
+            self.mask_spans[mask] = column_spans(mask)
+        return self.mask_spans[mask]
+
+#---------------------------------GET SCORE----------------------------------#
+    def get_score(self):
+        """Return the number of enemy cars dodged"""
+        if self.traffic is not None:
+            return self.traffic.score
+        return self.enemy_sprite.score
+
+#---------------------------------SAVE POSITIONS----------------------------------#
+    def save_positions(self):
+        """Remember where every sprite is before it moves"""
+        self.previous = {
+            sprite: sprite.rect.copy() for sprite in self.all_sprites
+        }
+
+        if self.traffic is not None:
+            self.traffic.save_positions()
+
+#---------------------------------UPDATE-----------------------------------------------#
+    def update(self):
+        """Move everything one fixed update"""
+        self.save_positions()
+
+        with self.profiler.phase("collision"):
+            self.check_collision()
 
-            #----------------UPDATE SURFACE----------------------------#
-            # From backbuffer, update Pygame display to reflect changes
-            pygame.display.update()
+        # Run the update method on all sprites
+        self.all_sprites.update()
+
+        if self.traffic is not None:
+            self.traffic.update()
+
+#---------------------------------DRAW-----------------------------------------------#
+    def draw(self, alpha=1.0):
+        """Draw the sprites alpha of the way from their last position"""
+        #----------------DRAW ON BACKBUFFER------------------#
+        # Put back the cached background, the whole window or only
+        # where things were last frame in dirty rectangle mode
+        self.dirty_rects.clear()
+
+        #-----------------DRAW SPRITES-----------------#
+        # Draw all sprites on the surface between their old and new position
+        for sprite in self.all_sprites:
+            rect = lerp_rect(self.previous[sprite], sprite.rect, alpha)
+            self.dirty_rects.add(self.surface.blit(sprite.image, rect))
+
+        # Every traffic car in one batched blit
+        if self.traffic is not None:
+            self.traffic.draw(self.surface, self.dirty_rects, alpha)
+
+        # Render score before drawing on the surface
+        # The text cache only renders it again when the score changes
+        self.score = text_cache.render(
+            self.font_small, str(self.get_score()), True, config.BLACK
+        )
 
-            # Cap game speed at 60 frames per second
-            self.clock.tick(60)
+        # Draw score on the surface
+        self.dirty_rects.add(self.surface.blit(self.score, (10, 10)))
+
+#---------------------------------RUN GAME-----------------------------------------------#
+    def game_loop(self):
+        """Infinite Game Loop"""
+        while True:
+            with self.profiler.phase("events"):
+                events = self.check_events()
+
+            # A replay closes the game when the log runs out
+            if self.input_log.finished():
+                self.quit()
+
+            if not self.game_over_screen.playing():
+                # Replays play again without waiting for the menu
+                if self.input_log.restart_due():
+                    self.restart()
+                else:
+                    # Crash sound or game over menu, the window stays responsive
+                    with self.profiler.phase("menu"):
+                        self.game_over_screen.update(events)
+            else:
+                self.play_frame()
+
+            # Cap drawing speed, this does not change the game speed
+            # The time tick waits is the frame's idle time
+            with self.profiler.phase("tick"):
+                self.clock.tick(config.FPS)
+
+            self.profiler.end_frame()
+
+#------------------------------PLAY FRAME------------------------------#
+    def play_frame(self):
+        """Update, draw and show one frame of the game"""
+        # Run as many fixed updates as fit in the time the last frame took
+        for _ in range(self.timestep.advance(self.clock.get_time())):
+            with self.profiler.phase("update"):
+                self.update()
+
+            # The rest of the frame's updates are dropped at game over
+            if not self.game_over_screen.playing():
+                break
+
+        with self.profiler.phase("draw"):
+            self.draw(self.timestep.alpha())
+
+            # Frame times on top of everything else
+            if self.profiler.enabled:
+                self.dirty_rects.add(self.profiler.draw(self.surface))
+
+        # From back buffer, update pygame display to reflect any changes
+        with self.profiler.phase("display"):
+            self.dirty_rects.update()
+
+        # Report the startup time and get the game over menu ready
+        # in the background once the game is on screen
+        if self.startup.first_frame():
+            startup.prewarm_menu()
 
 def main():
     # Create game instance
@@ -201,4 +473,5 @@ def main():
     # Start the game
     car_crash.game_loop()
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,244 @@
+"""
+Filename: car_crash_batch.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Run many Car Crash games at once with NumPy arrays
+"""
+
+# pip install numpy
+# pip install pygame-ce
+import numpy as np
+import pygame
+import os
+import sys
+import config
+
+# The shared modules live one folder up from this game
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.collision import MASK_STEP
+
+# Folder of this file, the masks are made from the images in its assets
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Size of assets/player.png and assets/enemy.png in pixels
+PLAYER_WIDTH = 44
+PLAYER_HEIGHT = 96
+ENEMY_WIDTH = 48
+ENEMY_HEIGHT = 93
+
+# The player car never moves up or down
+PLAYER_TOP = config.HEIGHT - 120
+
+# Pixels the player moves each frame an arrow key is pressed
+PLAYER_SPEED = 5
+
+# Enemy cars start 40 pixels away from the left and right
+ENEMY_MIN_X = 40
+ENEMY_MAX_X = config.WIDTH - 40
+
+# Enemy cars wait above the program window
+ENEMY_START_Y = -120
+
+# True where the solid pixels of the cars touch, for every offset of the
+# enemy from the player that the rects overlap at. Made once by
+# load_overlap() so the pixel test in the batch is a table lookup.
+overlap = None
+
+
+#---------------------------------LOAD OVERLAP----------------------------------#
+def load_overlap():
+    """Return the overlap table, making it from the car images the first time
+
+    Only the images' alpha is needed, so no window has to be open.
+    """
+    global overlap
+    if overlap is not None:
+        return overlap
+
+    player_mask = pygame.mask.from_surface(
+        pygame.image.load(os.path.join(HERE, "assets", "player.png")))
+    enemy_mask = pygame.mask.from_surface(
+        pygame.image.load(os.path.join(HERE, "assets", "enemy.png")))
+
+    # Row and column 0 are the enemy as far up and left as it can be
+    # while the rects still overlap
+    overlap = np.zeros(
+        (ENEMY_WIDTH + PLAYER_WIDTH - 1, ENEMY_HEIGHT + PLAYER_HEIGHT - 1),
+        dtype=bool)
+    for dx in range(1 - ENEMY_WIDTH, PLAYER_WIDTH):
+        for dy in range(1 - ENEMY_HEIGHT, PLAYER_HEIGHT):
+            overlap[dx + ENEMY_WIDTH - 1, dy + ENEMY_HEIGHT - 1] = \
+                player_mask.overlap(enemy_mask, (dx, dy)) is not None
+
+    return overlap
+
+
+class CarCrashBatch:
+    """N independent Car Crash games advanced together one frame at a time
+
+    Every game follows the same rules as CarCrash.game_loop:
+    check_collision, then Player.update, then Enemy.update.
+    Collisions are the game's too, the swept rect test and then the
+    pixel test along the enemy's move.
+    """
+
+    def __init__(self, n, seed=None):
+        # Number of games in the batch
+        self.n = n
+
+        # Random numbers for every enemy placement in the batch
+        self.rng = np.random.default_rng(seed)
+
+        # Left edge of the player car
+        self.player_x = np.empty(n, dtype=np.int32)
+
+        # Top left corner of the enemy car
+        self.enemy_x = np.empty(n, dtype=np.int32)
+        self.enemy_y = np.empty(n, dtype=np.int32)
+
+        # Enemy speed grows by config.SPEED_INCREASE every time it respawns
+        self.speed = np.empty(n, dtype=np.float64)
+        self.score = np.empty(n, dtype=np.int32)
+
+        # Games still being played and how many frames they lasted
+        self.alive = np.empty(n, dtype=bool)
+        self.frames = np.empty(n, dtype=np.int32)
+
+        self.overlap = load_overlap()
+
+        self.reset()
+
+#---------------------------------RESET------------------------------------#
+    def reset(self, mask=None):
+        """Start every game over, or only the games selected by mask"""
+        if mask is None:
+            mask = np.ones(self.n, dtype=bool)
+
+        count = int(mask.sum())
+
+        # Player car centered on the x axis
+        self.player_x[mask] = config.WIDTH // 2 - PLAYER_WIDTH // 2
+
+        # The first enemy is placed by its top left corner
+        self.enemy_x[mask] = self.rng.integers(
+            ENEMY_MIN_X, ENEMY_MAX_X + 1, count)
+        self.enemy_y[mask] = ENEMY_START_Y
+
+        self.speed[mask] = config.SPEED
+        self.score[mask] = 0
+        self.alive[mask] = True
+        self.frames[mask] = 0
+
+#---------------------------------CHECK COLLISIONS----------------------------------#
+    def check_collision(self):
+        """Return which games have the enemy car hit the player this frame
+
+        Like CarCrash.hit_player: sweep_rect over the enemy's whole move,
+        then sweep_mask from the time the rects first touch.
+        """
+        # Enemy speeds only grow, so every enemy moves down
+        velocity = np.trunc(self.speed).astype(np.int32)
+
+        # The player grown by the size of the enemy, the enemy's top left
+        # corner has to be strictly inside it, like Rect.colliderect
+        between = (self.enemy_x > self.player_x - ENEMY_WIDTH) \
+            & (self.enemy_x < self.player_x + PLAYER_WIDTH)
+        near = (PLAYER_TOP - ENEMY_HEIGHT - self.enemy_y) / velocity
+        far = (PLAYER_TOP + PLAYER_HEIGHT - self.enemy_y) / velocity
+
+        touching = between & (far > 0) & (near <= 1)
+        index = np.flatnonzero(touching)
+
+        crashed = np.zeros(self.n, dtype=bool)
+        if len(index) == 0:
+            return crashed
+
+        # Pixel test only the games whose rects touch
+        time = np.maximum(near[index], 0.0)
+        speed = velocity[index]
+        enemy_y = self.enemy_y[index]
+        dx = self.enemy_x[index] - self.player_x[index]
+
+        # Test at least every MASK_STEP pixels of the move, and at its end
+        steps = np.maximum(1, np.ceil(speed * (1.0 - time) / MASK_STEP))
+        hit = np.zeros(len(index), dtype=bool)
+        for step in range(int(steps.max()) + 1):
+            t = time + (1.0 - time) * step / steps
+            dy = np.rint(enemy_y + speed * t).astype(np.int32) - PLAYER_TOP
+
+            testing = (step <= steps) \
+                & (dy > -ENEMY_HEIGHT) & (dy < PLAYER_HEIGHT)
+            column = np.clip(dy + ENEMY_HEIGHT - 1, 0, self.overlap.shape[1] - 1)
+            hit |= testing & self.overlap[dx + ENEMY_WIDTH - 1, column]
+
+        crashed[index] = hit
+        return crashed
+
+#---------------------------------STEP------------------------------------#
+    def step(self, left, right):
+        """Advance every live game one frame
+
+        left and right are boolean arrays with the arrow key state
+        of each game. Returns a boolean array of the games that ended.
+        """
+        died = self.check_collision() & self.alive
+        self.alive &= ~died
+        alive = self.alive
+
+        #------------------UPDATE PLAYER------------------#
+        # The car can't move past the left or right edge of the surface
+        move_left = alive & left & (self.player_x > 0)
+        self.player_x -= np.where(move_left, PLAYER_SPEED, 0).astype(np.int32)
+
+        move_right = alive & right \
+            & (self.player_x + PLAYER_WIDTH < config.WIDTH)
+        self.player_x += np.where(move_right, PLAYER_SPEED, 0).astype(np.int32)
+
+        #------------------UPDATE ENEMY------------------#
+        # Rect.move_ip drops the fraction of the speed
+        self.enemy_y += np.where(alive, np.trunc(self.speed), 0).astype(np.int32)
+        self.frames += alive
+
+        # Respawn enemies that drove off the bottom of the surface,
+        # centered on a random x above the window
+        respawn = alive & (self.enemy_y > config.HEIGHT)
+        count = int(respawn.sum())
+        if count:
+            self.enemy_x[respawn] = self.rng.integers(
+                ENEMY_MIN_X, ENEMY_MAX_X + 1, count) - ENEMY_WIDTH // 2
+            self.enemy_y[respawn] = ENEMY_START_Y - ENEMY_HEIGHT // 2
+            self.speed[respawn] += config.SPEED_INCREASE
+            self.score[respawn] += 1
+
+        return died
+
+#---------------------------------OBSERVE------------------------------------#
+    def observe(self):
+        """Return an (n, 4) float array describing each game for a controller
+
+        Columns are the player x, enemy x and y relative to the player,
+        and the enemy speed.
+        """
+        return np.stack(
+            (
+                self.player_x,
+                self.enemy_x - self.player_x,
+                self.enemy_y - PLAYER_TOP,
+                self.speed,
+            ),
+            axis=1,
+        ).astype(np.float64)
+
+#---------------------------------RUN------------------------------------#
+    def run(self, controller, max_frames=10_000):
+        """Play until every game ends or max_frames pass
+
+        controller is called with the batch every frame and returns the
+        (left, right) arrays. Returns the final scores.
+        """
+        for _ in range(max_frames):
+            if not self.alive.any():
+                break
+            self.step(*controller(self))
+
+        return self.score.copy()
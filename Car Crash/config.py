@@ -16,5 +16,21 @@ SPEED = 4
 # car starts at the top of the screen
 SPEED_INCREASE = .4
 
+# Number of enemy cars on the road, more than 1 turns on traffic mode
+# which needs NumPy. The ENEMIES environment variable overrides it,
+# a replay uses the count it was recorded with.
+ENEMIES = 1
+
+# Most pixel perfect collision tests along a car's move each update,
+# the cars nearest the player get them first. Cars past this many are
+# tested with the solid part of each column of the cars, which is
+# faster and still leaves out the transparent corners.
+MASK_TESTS = 32
+
 BLACK = (0, 0, 0)
 
+# Frames drawn per second, 0 draws as fast as the computer can
+FPS = 60
+
+# Game updates per second, every speed in the game is pixels per update
+UPDATES_PER_SECOND = 60
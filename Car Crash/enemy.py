@@ -7,33 +7,39 @@ Purpose: All logic for the enemy's car is in this class
 
  # Import pygame library
 import pygame
-from random import randint
 import config
+from shared.assets import asset_cache
 
 class Enemy(pygame.sprite.Sprite):
     """Define the enemy class and methods"""
 
 #---------------------------------------INITIALIZE ENEMY SPRITE---------------------------------#
-    def __init__(self):
+    def __init__(self, random):
         """Construct a enemy object from Sprite class"""
 
         # Call the constuctor of the superclass (pygame.sprite.Sprite)
         super().__init__()
 
+        # The game's seeded Random, so a replay puts cars in the same place
+        self.random = random
+
         self.score = 0
 
         # Set the initial speed of enemy car
         self.speed = config.SPEED
 
         # Load enemy car image from file into a variable
-        self.image = pygame.image.load(
-            "./assets/enemy.png").convert_alpha()
+        # Every enemy shares the same surface from the asset cache
+        self.image = asset_cache.image("./assets/enemy.png")
+
+        # Solid pixels of the car for pixel perfect collisions
+        self.mask = asset_cache.mask("./assets/enemy.png")
 
         # Get the rectangle area of the enemy car surface
         self.rect = self.image.get_rect()
 
         # Get a random location 40 pixels away from the left and right.
-        x = randint(40, config.WIDTH - 40)
+        x = self.random.randint(40, config.WIDTH - 40)
 
         # y is -120, the car starts above the program window
         y = -120
@@ -51,7 +57,7 @@ class Enemy(pygame.sprite.Sprite):
         if (self.rect.top > config.HEIGHT):
 
             # Get a random location 40 pixels away from the left and right
-            x = randint(40, config.WIDTH -40)
+            x = self.random.randint(40, config.WIDTH -40)
 
             # Move car above program window
             y = -120
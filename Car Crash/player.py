@@ -8,21 +8,26 @@ Purpose: All logic for the player's car is in this class
  # Import pygame library
 import pygame
 import config
+from shared.assets import asset_cache
 
 class Player(pygame.sprite.Sprite):
     """Define the player class and methods"""
 
 #---------------------------------------INITIALIZE PLAYER OBJECT---------------------------------#
-    def __init__(self):
+    def __init__(self, input_log):
         """Construct a player object from Sprite class"""
 
         # Call the constuctor of the superclass (pygame.sprite.Sprite)
         super().__init__()
 
+        # Keys come from the game's input log so they can be replayed
+        self.input_log = input_log
+
         # Load player car image from file into a variable
-        self.image = pygame.image.load(
-            "./assets/player.png"
-        ).convert_alpha()
+        self.image = asset_cache.image("./assets/player.png")
+
+        # Solid pixels of the car for pixel perfect collisions
+        self.mask = asset_cache.mask("./assets/player.png")
 
         # Get the rectangle area of the player car surface
         self.rect = self.image.get_rect()
@@ -45,7 +50,7 @@ class Player(pygame.sprite.Sprite):
         """Update the car's position"""
         # Called each time through the game loop
         # Read the keyboard to see if any keys pressed
-        pressedKeys = pygame.key.get_pressed()
+        pressedKeys = self.input_log.get_pressed()
 
         # Keep the player on the screen
         # The sprite can't move past the left edge of the surface
@@ -0,0 +1,163 @@
+"""
+Filename: traffic.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Many enemy cars at once, stored in arrays instead of one sprite each
+"""
+
+# pip install numpy
+import numpy as np
+import pygame
+import config
+from shared.assets import asset_cache
+from shared.timestep import SNAP_DISTANCE
+
+# Enemy cars start 40 pixels away from the left and right
+ENEMY_MIN_X = 40
+ENEMY_MAX_X = config.WIDTH - 40
+
+# Enemy cars wait above the program window, the first wave is spread
+# over this many pixels so they don't all arrive at once
+ENEMY_START_Y = -120
+START_SPREAD = config.HEIGHT * 2
+
+# Respawned cars are spread out too
+RESPAWN_SPREAD = config.HEIGHT // 2
+
+# Size of a broad phase grid cell in pixels
+CELL_SIZE = 64
+
+
+class Traffic:
+    """Every enemy car's position and speed in NumPy arrays
+
+    Follows the same rules as the Enemy sprite: move down speed pixels,
+    start again at the top a little faster after leaving the window,
+    one point for each car dodged. All cars share one enemy.png surface
+    and are drawn with one batched blit.
+    """
+
+    def __init__(self, count, random):
+        # The game's seeded Random, so replays put cars in the same place
+        self.random = random
+
+        # Every car shares the same surface from the asset cache
+        self.image = asset_cache.image("./assets/enemy.png")
+        self.width, self.height = self.image.get_size()
+        self.mask = asset_cache.mask("./assets/enemy.png")
+
+        # Top left corner and speed of each car
+        self.x = np.array(
+            [random.randint(ENEMY_MIN_X, ENEMY_MAX_X) for _ in range(count)],
+            dtype=np.int64
+        )
+        self.y = np.array(
+            [ENEMY_START_Y - random.randint(0, START_SPREAD)
+             for _ in range(count)],
+            dtype=np.int64
+        )
+        self.speed = np.full(count, float(config.SPEED))
+
+        # Where each car was before the last update, for drawing
+        self.previous_x = self.x.copy()
+        self.previous_y = self.y.copy()
+
+        self.score = 0
+
+#---------------------------------SAVE POSITIONS----------------------------------#
+    def save_positions(self):
+        """Remember where every car is before it moves"""
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+
+#---------------------------------UPDATE----------------------------------#
+    def update(self):
+        """Move every car down, start the ones past the bottom again"""
+        # move_ip drops the fraction of the speed
+        self.y += self.speed.astype(np.int64)
+
+        gone = np.flatnonzero(self.y > config.HEIGHT)
+        for i in gone:
+            # Same as Enemy, the center goes to x, a little above the window
+            x = self.random.randint(ENEMY_MIN_X, ENEMY_MAX_X)
+            y = ENEMY_START_Y - self.random.randint(0, RESPAWN_SPREAD)
+            self.x[i] = x - self.width // 2
+            self.y[i] = y - self.height // 2
+
+        self.speed[gone] += config.SPEED_INCREASE
+        self.score += len(gone)
+
+#---------------------------------CANDIDATES----------------------------------#
+    def candidates(self, player_rect):
+        """Broad phase, return the cars in grid cells the player is in
+
+        Each car covers the cells from where it is to where it will be
+        after this update. Only those cars need an exact test.
+        """
+        reach = self.y + self.height + self.speed.astype(np.int64)
+
+        # Cells each car covers, columns are the road's lanes
+        left = self.x // CELL_SIZE
+        right = (self.x + self.width - 1) // CELL_SIZE
+        top = self.y // CELL_SIZE
+        bottom = (reach - 1) // CELL_SIZE
+
+        # Cells the player covers
+        player_left = player_rect.left // CELL_SIZE
+        player_right = (player_rect.right - 1) // CELL_SIZE
+        player_top = player_rect.top // CELL_SIZE
+        player_bottom = (player_rect.bottom - 1) // CELL_SIZE
+
+        return np.flatnonzero(
+            (left <= player_right) & (right >= player_left)
+            & (top <= player_bottom) & (bottom >= player_top)
+        )
+
+#---------------------------------COLLIDE----------------------------------#
+    def collide(self, player_rect, hit):
+        """Return the index of a car that hits the player this update, or None
+
+        hit(rect, mask, velocity) is the exact test for one car. The cars
+        nearest the player are tested first, so they get the full pixel
+        tests while there are any left this update.
+        """
+        cars = self.candidates(player_rect)
+        distance = np.abs(self.y[cars] + self.height // 2 - player_rect.centery) \
+            + np.abs(self.x[cars] + self.width // 2 - player_rect.centerx)
+
+        for i in cars[np.argsort(distance, kind="stable")]:
+            rect = pygame.Rect(int(self.x[i]), int(self.y[i]),
+                               self.width, self.height)
+
+            # move_ip drops the fraction of the speed
+            if hit(rect, self.mask, (0, int(self.speed[i]))):
+                return int(i)
+
+        return None
+
+#---------------------------------DRAW----------------------------------#
+    def draw(self, surface, dirty_rects, alpha=1.0):
+        """Draw every car alpha of the way from its last position"""
+        dx = self.x - self.previous_x
+        dy = self.y - self.previous_y
+
+        # Cars that started again at the top are drawn where they are now
+        jumped = np.abs(dx) + np.abs(dy) > SNAP_DISTANCE
+        x = np.where(jumped, self.x, np.rint(self.previous_x + dx * alpha))
+        y = np.where(jumped, self.y, np.rint(self.previous_y + dy * alpha))
+        x = x.astype(np.int64)
+        y = y.astype(np.int64)
+
+        # Only cars inside the window are drawn
+        visible = (y + self.height > 0) & (y < surface.get_height())
+        positions = zip(x[visible].tolist(), y[visible].tolist())
+        blits = [(self.image, position) for position in positions]
+
+        # fblits is faster but doesn't return the rects drawn
+        if dirty_rects.enabled:
+            for rect in surface.blits(blits):
+                dirty_rects.add(rect)
+        elif hasattr(surface, "fblits"):
+            surface.fblits(blits)
+        else:
+            surface.blits(blits, doreturn=False)
@@ -11,3 +11,17 @@ HEIGHT = 600
 
 # Setup color constant for sky
 SKY_BLUE = (135, 206, 235)
+
+# Pipe pairs on the way at once and the pixels between them. With
+# 2 pairs 320 apart two pairs are often on screen together, and the
+# pair leaving is always back on the right by the time it is needed.
+# Only one pair is on screen at a time when PIPE_COUNT is 1, replays
+# keep the pipe count they were recorded with.
+PIPE_COUNT = 2
+PIPE_SPACING = 320
+
+# Frames drawn per second, 0 draws as fast as the computer can
+FPS = 60
+
+# Game updates per second, every speed in the game is pixels per update
+UPDATES_PER_SECOND = 60
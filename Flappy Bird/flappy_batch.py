@@ -0,0 +1,224 @@
+"""
+Filename: flappy_batch.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Run many Flappy Bird games at once with NumPy arrays
+"""
+
+# pip install numpy
+import numpy as np
+import config
+
+# Size of assets/flappy_bird.png and assets/pipe.png in pixels,
+# the batch never loads images so it can run without pygame
+BIRD_WIDTH = 34
+BIRD_HEIGHT = 24
+PIPE_WIDTH = 78
+
+# Starting location of the bird
+BIRD_X = 150
+BIRD_Y = config.HEIGHT // 2
+
+# Pixels the bird falls each frame, and how far a flap lifts it
+GRAVITY = 3
+FLAP = -5
+
+# Range for the bottom of the upper pipe
+PIPE_MIN_BOTTOM = 50
+PIPE_MAX_BOTTOM = config.HEIGHT // 2
+
+
+class FlappyBatch:
+    """N independent Flappy Bird games advanced together one frame at a time
+
+    Every game follows the same rules as FlappyBird.game_loop:
+    detect_collision, gravity, difficulty, scoring, then movement.
+    Each game has pipe_count pipe pairs spacing pixels apart, kept in a
+    ring like PipePool, so pipe arrays have one column for each pair.
+    """
+
+    def __init__(self, n, seed=None, pipe_count=config.PIPE_COUNT,
+                 spacing=config.PIPE_SPACING):
+        # Number of games in the batch
+        self.n = n
+        self.pipe_count = pipe_count
+        self.spacing = spacing
+
+        # Row numbers, to pick one pair in every game
+        self.rows = np.arange(n)
+
+        # Random numbers for every pipe placement in the batch
+        self.rng = np.random.default_rng(seed)
+
+        # Bird only moves up and down, x never changes
+        self.bird_y = np.empty(n, dtype=np.int32)
+
+        # Left of both pipes, bottom of the upper and top of the lower pipe
+        # of every pair, and the pair furthest left in each game
+        self.pipe_x = np.empty((n, pipe_count), dtype=np.int32)
+        self.pipe_upper_bottom = np.empty((n, pipe_count), dtype=np.int32)
+        self.pipe_lower_top = np.empty((n, pipe_count), dtype=np.int32)
+        self.head = np.empty(n, dtype=np.int32)
+
+        # Difficulty of each game
+        self.pipe_move = np.empty(n, dtype=np.int32)
+        self.pipe_gap_size = np.empty(n, dtype=np.float64)
+
+        self.score = np.empty(n, dtype=np.int32)
+        self.score_counted = np.empty((n, pipe_count), dtype=bool)
+
+        # Games still being played and how many frames they lasted
+        self.alive = np.empty(n, dtype=bool)
+        self.frames = np.empty(n, dtype=np.int32)
+
+        self.reset()
+
+#---------------------------------RESET------------------------------------#
+    def reset(self, mask=None):
+        """Start every game over, or only the games selected by mask"""
+        if mask is None:
+            mask = np.ones(self.n, dtype=bool)
+
+        count = int(mask.sum())
+
+        self.bird_y[mask] = BIRD_Y
+        self.pipe_gap_size[mask] = BIRD_HEIGHT * 5
+        self.pipe_move[mask] = 4
+        self.score[mask] = 0
+        self.alive[mask] = True
+        self.frames[mask] = 0
+
+        # Pipes line up off screen to the right
+        self.pipe_x[mask] = config.WIDTH \
+            + np.arange(self.pipe_count) * self.spacing
+        upper_bottom = self.rng.integers(
+            PIPE_MIN_BOTTOM, PIPE_MAX_BOTTOM + 1, (count, self.pipe_count))
+        self.pipe_upper_bottom[mask] = upper_bottom
+        self.pipe_lower_top[mask] = upper_bottom \
+            + np.rint(self.pipe_gap_size[mask]).astype(np.int32)[:, None]
+        self.score_counted[mask] = False
+        self.head[mask] = 0
+
+#---------------------------------DETECT COLLISIONS--------------------------------#
+    def detect_collision(self):
+        """Return which games hit the screen edge or a pipe this frame"""
+        bird_top = self.bird_y
+        bird_bottom = self.bird_y + BIRD_HEIGHT
+        bird_right = BIRD_X + BIRD_WIDTH
+
+        # The bird hits the top or bottom of the screen
+        crashed = (bird_bottom > config.HEIGHT) | (bird_top < 0)
+
+        # The bird is between the pipes of a pair and runs into one of them
+        between = (bird_right > self.pipe_x) \
+            & (bird_right < self.pipe_x + PIPE_WIDTH)
+        crashed |= (between & (
+            (bird_top[:, None] < self.pipe_upper_bottom)
+            | (bird_bottom[:, None] > self.pipe_lower_top)
+        )).any(axis=1)
+
+        return crashed
+
+#---------------------------------STEP------------------------------------#
+    def step(self, flap):
+        """Advance every live game one frame
+
+        flap is a boolean array, True where the UP key is pressed.
+        Returns a boolean array of the games that ended this frame.
+        """
+        alive = self.alive
+
+        died = self.detect_collision() & alive
+        self.alive &= ~died
+        alive = self.alive
+
+        # Gravity is 3 pixels down, pressing UP moves 2 up instead
+        gravity = np.where(flap, GRAVITY + FLAP, GRAVITY)
+
+        #------------------INCREASE DIFFICULTY-------------------#
+        # Change takes effect the next time the pipes are reset
+        level_1 = alive & (self.score >= 5) & (self.score < 10)
+        level_2 = alive & (self.score >= 10) & (self.score < 20)
+        self.pipe_move[level_1] = 5
+        self.pipe_gap_size[level_1] = BIRD_HEIGHT * 4
+        self.pipe_move[level_2] = 7
+        self.pipe_gap_size[level_2] = BIRD_HEIGHT * 3.5
+
+        #------------------SCORING-------------------#
+        # Each pair the bird got past scores once
+        passed = alive[:, None] & ~self.score_counted \
+            & (BIRD_X > self.pipe_x + PIPE_WIDTH)
+        self.score += passed.sum(axis=1, dtype=np.int32)
+        self.score_counted |= passed
+
+        #------------------MOVE------------------#
+        self.bird_y += np.where(alive, gravity, 0).astype(np.int32)
+        self.pipe_x -= np.where(alive, self.pipe_move, 0)[:, None]
+        self.frames += alive
+
+        #------------------RECYCLE PIPES------------------#
+        # Only the pair furthest left can be off the screen, it moves
+        # behind the last pair but never on screen
+        while True:
+            head = self.head
+            off_screen = alive & (self.pipe_x[self.rows, head] + PIPE_WIDTH < 0)
+            games = np.flatnonzero(off_screen)
+            if len(games) == 0:
+                break
+
+            pair = head[games]
+            last = (pair - 1) % self.pipe_count
+            left = np.maximum(
+                config.WIDTH, self.pipe_x[games, last] + self.spacing)
+
+            upper_bottom = self.rng.integers(
+                PIPE_MIN_BOTTOM, PIPE_MAX_BOTTOM + 1, len(games))
+            self.pipe_upper_bottom[games, pair] = upper_bottom
+            self.pipe_lower_top[games, pair] = upper_bottom \
+                + np.rint(self.pipe_gap_size[games]).astype(np.int32)
+            self.pipe_x[games, pair] = left
+            self.score_counted[games, pair] = False
+
+            self.head[games] = (pair + 1) % self.pipe_count
+
+        return died
+
+#---------------------------------OBSERVE------------------------------------#
+    def observe(self):
+        """Return an (n, 5) float array describing each game for a controller
+
+        Columns are bird y, pipe distance ahead of the bird, distance to the
+        upper pipe, distance to the lower pipe, and the pipe speed, for the
+        first pair the bird hasn't got past yet.
+        """
+        # Pairs the bird is past come first in the ring, the next pair is
+        # after them. With every pair past it is the furthest left again.
+        behind = (self.pipe_x + PIPE_WIDTH < BIRD_X).sum(axis=1)
+        pair = (self.head + behind) % self.pipe_count
+
+        pipe_x = self.pipe_x[self.rows, pair]
+        return np.stack(
+            (
+                self.bird_y,
+                pipe_x + PIPE_WIDTH - BIRD_X,
+                self.bird_y - self.pipe_upper_bottom[self.rows, pair],
+                self.pipe_lower_top[self.rows, pair]
+                - (self.bird_y + BIRD_HEIGHT),
+                self.pipe_move,
+            ),
+            axis=1,
+        ).astype(np.float64)
+
+#---------------------------------RUN------------------------------------#
+    def run(self, controller, max_frames=10_000):
+        """Play until every game ends or max_frames pass
+
+        controller is called with the batch every frame and returns the
+        flap array. Returns the final scores.
+        """
+        for _ in range(max_frames):
+            if not self.alive.any():
+                break
+            self.step(controller(self))
+
+        return self.score.copy()
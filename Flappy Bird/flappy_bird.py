@@ -5,21 +5,40 @@ Created: 04/26/2024
 Purpose: Add collisions and End Game screen
 """
 
+# Taken first so the startup report includes the imports
+from time import perf_counter
+IMPORT_START = perf_counter()
+
 # pip install pygame-ce
 
 # Import pygame library
 import pygame
 # pip install pygame-menu
-import pygame_menu as pm
 # Import exit for clean program shutdown
 from sys import exit
-from random import randint
-from time import sleep
+import os
+import sys
 import config
 
+# The shared modules live one folder up from this game
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.assets import asset_cache
+from shared.game_over import GameOverScreen
+from shared import dirty
+from shared import profiler
+from shared import replay
+from shared import sfx
+from shared import startup
+from shared.text import text_cache
+from shared.timestep import FixedTimestep, lerp_rect
+from pipes import PipePool
+
 class FlappyBird:
 
     def __init__(self):
+        # Time each part of startup, STARTUP_REPORT=1 prints it
+        self.startup = startup.StartupTimer(IMPORT_START, startup.enabled())
+
         # Initialize mixer with larger buffer size for better performance
         pygame.mixer.pre_init(
             44100,          # frequency (Hz)
@@ -28,85 +47,169 @@ class FlappyBird:
             4096            # buffer size, larger to optimize music playback
         )
 
-        # Initialize the Pygame engine
-        pygame.init()
+        # Start only the display, font and mixer parts of the Pygame engine
+        with self.startup.stage("init"):
+            startup.init_pygame()
 
-        # set screen width and height as a tuple
-        self.surface = pygame.display.set_mode(
-            (config.WIDTH, config.HEIGHT)
-        )
+        with self.startup.stage("display"):
+            # set screen width and height as a tuple
+            self.surface = pygame.display.set_mode(
+                (config.WIDTH, config.HEIGHT)
+            )
 
-        # Set window caption
-        pygame.display.set_caption("Flappy Bird")
+            # Set window caption
+            pygame.display.set_caption("Flappy Bird")
 
-        # Define the clock object to keep the game running at a set speed
+        # Cut every image out of one sheet if build_assets.py made one
+        with self.startup.stage("assets"):
+            asset_cache.load_atlas("./assets/atlas.json")
+
+        # Define the clock object to measure how long each frame takes
         self.clock = pygame.time.Clock()
+
+        # The game moves in fixed updates, however fast frames are drawn
+        self.timestep = FixedTimestep(config.UPDATES_PER_SECOND)
+
+        # Keys are read through the input log so a game can be recorded
+        # and replayed, RECORD_INPUT / REPLAY_INPUT turn that on
+        self.input_log = replay.from_environment()
+        if self.input_log.fast:
+            self.clock = replay.FastClock(self.timestep)
+
+        # Every random number comes from here, seeded from the input log
+        self.random = self.input_log.random()
         
-        self.init_bird()
-        self.init_pipes()
+        with self.startup.stage("assets"):
+            # Load flappy bird png icon
+            self.bird_ico = asset_cache.image("./assets/flappy_bird_ico.png")
 
-        # Load flappy bird png icon
-        self.bird_ico = pygame.image.load("./assets/flappy_bird_ico.png").convert_alpha()
+            pygame.display.set_icon(self.bird_ico)
 
-        pygame.display.set_icon(self.bird_ico)
+            # Load the crash sound now, not at the moment of the crash
+            self.sfx = sfx.SoundEffects()
+            self.sfx.load("crash", './assets/crash_short.wav', priority=1)
 
-        # Load background music file into memory
-        pygame.mixer.music.load('./assets/flying_minimal.mp3')
+            # Load background music file, set volume to 30%,
+            # range from 0.0 (mute) to 1.0 (full volume)
+            self.sfx.load_music('./assets/flying_minimal.mp3', volume=0.3)
 
-        # Set volume to 30%, range from 0.0 (mute) to 1.0 (full volume)
-        pygame.mixer.music.set_volume(0.3)
+        with self.startup.stage("font"):
+            self.score_font = pygame.font.SysFont("arialblack", 18)
 
-        # Play in a loop until stopped
-        pygame.mixer.music.play(-1)
+        # Every pipe pair is made once here and reused for every game.
+        # A replay uses the pipe count it was recorded with, older logs
+        # were all recorded with one pair.
+        pipe_count = self.input_log.variant(config.PIPE_COUNT, old_value=1)
+        with self.startup.stage("assets"):
+            self.pipes = PipePool(
+                pipe_count, config.PIPE_SPACING, self.random)
+
+        # Optional dirty rectangle mode, only redraws what moved
+        self.dirty_rects = dirty.DirtyRects(
+            self.surface, self.make_background(), dirty.enabled())
+
+        # Time spent in each part of the game loop, F3 shows it
+        self.profiler = profiler.FrameProfiler(profiler.enabled())
+
+        # Crash sound and game over menu without blocking the game loop
+        self.game_over_screen = GameOverScreen(
+            self.surface, self.build_game_over_menu
+        )
+
+        self.reset()
+
+#-------------------------------RESET-------------------------------#
+    def reset(self):
+        """Start a new game, the window, images and music stay loaded"""
+        # The images come from the asset cache, so this is cheap
+        self.init_bird()
+        self.init_pipes()
 
         self.score = 0
         self.game_over = False
         self.pass_pipe = False
-        self.score_font = pygame.font.SysFont("arialblack", 18)
+        self.save_positions()
+
+        # Don't count the time spent in the game over menu
+        self.timestep.reset()
+        self.clock.tick()
+
+        # The game over menu covered the whole window
+        self.dirty_rects.invalidate()
+
+        # Play in a loop until stopped
+        self.sfx.play_music()
+
+#------------------------------RESTART------------------------------#
+    def restart(self):
+        """Close the game over menu and play again in the same window"""
+        self.game_over_screen.close()
+        self.input_log.restarted()
+        self.reset()
+
+#------------------------------RESUME------------------------------#
+    def resume(self):
+        """Take the window and music back after the launcher ran another game
+
+        Images, sounds and fonts are still loaded, only the things every
+        game shares are set up again.
+        """
+        pygame.display.set_mode((config.WIDTH, config.HEIGHT))
+        pygame.display.set_caption("Flappy Bird")
+        pygame.display.set_icon(self.bird_ico)
+
+        self.sfx.load_music('./assets/flying_minimal.mp3', volume=0.3)
+
+        if self.game_over_screen.playing():
+            # Carry on where the game was left, without catching up
+            # on the time spent in the other game
+            self.timestep.reset()
+            self.clock.tick()
+            self.dirty_rects.invalidate()
+            self.sfx.play_music()
+        else:
+            # Left from the game over screen, start a new game
+            self.restart()
+
+#------------------------------QUIT------------------------------#
+    def quit(self):
+        """Close the game, the launcher replaces this to go back to its menu"""
+        # Quit pygame
+        pygame.quit()
+        # Exit Python
+        exit()
+
+#-----------------------------MAKE BACKGROUND-----------------------------#
+    def make_background(self):
+        """Create the sky the bird and pipes are drawn on"""
+        background = pygame.Surface(self.surface.get_size()).convert()
+        background.fill(config.SKY_BLUE)
+        return background
+
+#-----------------------------REBUILD BACKGROUND-----------------------------#
+    def rebuild_background(self):
+        """Build the background again after a resize or a color change"""
+        self.dirty_rects.set_background(self.make_background())
+
 #---------------------------------INIT PIPES------------------------------------#
     def init_pipes(self):
-        """Load pipe images, get rect, set initial positions"""
+        """Set the starting difficulty and line the pipes up off screen"""
         # Set the gap between the pipes
         self.pipe_gap_size = self.bird_rect.height * 5
 
         # How many pixels at a time the pipes move
         self.pipe_move = 4
 
-        # Load pipe images
-        self.pipe_lower = pygame.image.load(
-            "./assets/pipe.png").convert_alpha()
-        
-        # Rotate upper pipe 180 degrees 
-        self.pipe_upper = pygame.transform.rotate(
-            pygame.image.load("./assets/pipe.png").convert_alpha(), 180
-        )
-
-        # Get rectangles around images for easier manipulation
-        self.pipe_lower_rect = self.pipe_lower.get_rect()
-        self.pipe_upper_rect = self.pipe_upper.get_rect()
-
-        # Set initial pipe location off screen to right
-        self.pipe_lower_rect.left = config.WIDTH
-        self.pipe_upper_rect.left = config.WIDTH
+        # Difficulty level, it picks the color of new pipes
+        self.pipe_level = 0
 
-        # Initial placement of pipes vertically
-        self.pipe_upper_rect.bottom = randint(
-            50,                                 # Stay 50 away from top
-            config.HEIGHT // 2                  # Upper range of random numbers
-        )
-
-        # Set lower pipe vertical location
-        self.pipe_lower_rect.top = self.pipe_upper_rect.bottom + self.pipe_gap_size
-
-        # Set score counted to false
-        self.score_counted = False
+        self.pipes.reset(self.pipe_gap_size)
 
 #----------------------------------INIT FLAPPY BIRD-----------------------------#
     def init_bird(self):
         """Load bird image, get rect, set initial position"""
         # Load the bird image into a variable
-        self.bird = pygame.image.load(
-            "./assets/flappy_bird.png").convert_alpha()
+        self.bird = asset_cache.image("./assets/flappy_bird.png")
 
         # Get rectangle around bird for easier game manipulation
         self.bird_rect = self.bird.get_rect()
@@ -117,49 +220,35 @@ class FlappyBird:
             config.HEIGHT // 2      # Vertical (y) position
         )
 
-#-----------------------RESET PIPES-------------------------#
-    def reset_pipes(self):
-        """Reset pipes every time they leave the screen"""
-        # Pick a random height for the bottom of the top pipe
-        self.pipe_upper_rect.bottom = randint(
-            50,                             # Set the maximum random number to 50
-            config.HEIGHT // 2              # Set maximum to half the surface height
-        )
-
-        # Set lower pipe top to upper pipe bottom plus pipe gap
-        self.pipe_lower_rect.top = self.pipe_upper_rect.bottom \
-            + self.pipe_gap_size
-    
-        # Set initial off screen to right
-        self.pipe_upper_rect.left = config.WIDTH
-        self.pipe_lower_rect.left = config.WIDTH
-
-        # New set of pipes, reset score counter
-        self.score_counted = False
+        # Where the bird was before the last update, for drawing
+        self.previous_bird = self.bird_rect.copy()
 
 #---------------------------DISPLAY SCORE--------------------------#
     def display_score(self):
         """Display the score on the screen"""
         # Create text image for the score display
-        text = self.score_font.render(f"Score: {self.score}", True, "white")
-        self.surface.blit(
+        # The text cache only renders it again when the score changes
+        text = text_cache.render(
+            self.score_font, f"Score: {self.score}", True, "white")
+        self.dirty_rects.add(self.surface.blit(
             text,       # Image to display
             [3, 3]      # x, y to display the image
-        )
+        ))
 
 #---------------------------DISPLAY GAME OVER--------------------------#
     def display_game_over(self):
-        """Display game over menu using the Pygame Menu library"""
+        """Stop the game and start the game over screen, the game loop keeps running"""
         # Stop background sound
-        pygame.mixer.music.stop()
+        self.sfx.stop_music()
 
-        # Play crash sound
-        crash = pygame.mixer.Sound('./assets/crash_short.wav')
-        crash.play()
-        #crash.set_volume(0.3)
+        # Play crash sound, the menu opens when it ends or after 3 seconds
+        self.game_over_screen.start(lambda: self.sfx.play("crash"), 3000)
 
-        # Wait 4 seconds while crash plays
-        sleep(3)
+#---------------------------BUILD GAME OVER MENU--------------------------#
+    def build_game_over_menu(self):
+        """Create the game over menu using the Pygame Menu library"""
+        # pygame_menu is imported the first time it is needed
+        pm = startup.load_menu()
 
         # Define a menu object for the game over screen
         game_over = pm.Menu(
@@ -179,7 +268,7 @@ class FlappyBird:
         # Add a button to the game over menu for exiting the game
         game_over.add.button(
             title="Play Again?",                # Button text
-            action=main                         # Call main() to start over
+            action=self.restart                 # Play again in the same window
         )
 
         # Add label to provide space between buttons
@@ -188,11 +277,10 @@ class FlappyBird:
         # Add a button to the game over menu for exiting the game
         game_over.add.button(
             title="Exit",                       # Button text
-            action=pm.events.EXIT               # Exit the game when clicked
+            action=self.quit                    # Exit the game when clicked
         )
 
-        # Run the main loop of the game over menu on the specified surface
-        game_over.mainloop(self.surface)
+        return game_over
     
 #---------------------------------DETECT COLLISIONS--------------------------------#
     def detect_collision(self):
@@ -200,22 +288,19 @@ class FlappyBird:
         if self.bird_rect.bottom > config.HEIGHT\
                 or self.bird_rect.top < 0:
             self.display_game_over()
+            return
 
-        # The bird is between the pipes
-        if self.bird_rect.right > self.pipe_upper_rect.left \
-                and self.bird_rect.right < self.pipe_upper_rect.right:
-            
-            # If the bird runs into a pipe, game over
-            if self.bird_rect.top < self.pipe_upper_rect.bottom \
-                    or self.bird_rect.bottom > self.pipe_lower_rect.top:
-                self.display_game_over()
+        # Only the pipes the bird is flying through are tested
+        if self.pipes.hit(self.bird_rect):
+            self.display_game_over()
 
 
 #---------------------------------CHECK EVENTS--------------------------------#
     def check_events(self):
         """Listen for and handle all program events"""
         # Iterate (loop) through all captured events
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
 
             # Closing the game causes the QUIT event to be fired
             if event.type == pygame.QUIT:
@@ -224,88 +309,149 @@ class FlappyBird:
                 # Exit Python
                 exit()
 
-#-------------------------------GAME LOOP-------------------------------#
-    def game_loop(self):
-        """Infinite game loop"""
-        while True:
-            self.check_events()
-            self.detect_collision()
-            # Simulate gravity by moving the bird down
-            # unless the UP key is pressed
-            # Reset gravity to 3 each time through the loop
-            gravity = 3
-
-            # Get list of keys being pressed
-            key_input = pygame.key.get_pressed()
-            
-            # If up cursor pressed, move up 5 pixels
-            if key_input[pygame.K_UP]:
-                gravity -= 5
-
-            #------------------INCREASE DIFFICULTY-------------------#
-
-            # Adding difficulty relative to score
-            # Increase the speed and decrease the gap of blocks
-            if 5 <= self.score < 10:
-                self.pipe_move = 5
-                self.pipe_gap_size = self.bird_rect.height * 4
-
-            elif 10 <= self.score < 20:
-                self.pipe_move = 7
-                self.pipe_gap_size = self.bird_rect.height * 3.5
-
-            #------------------SCORING-------------------#            
-            # If the bird makes it past the pipes, increase score
-            if self.bird_rect.left > self.pipe_upper_rect.right \
-                    and not self.score_counted:
-                
-                # Increase score
-                self.score += 1
-
-                # Track whether the current set of pipes have had a score
-                self.score_counted = True
-
-
-#------------------MOVE SPRITES--------------------#
-            # Move the bird by adding gravity value to y location
-            self.bird_rect.y = self.bird_rect.y + gravity
-
-            # Move pipe images from right to left
-            self.pipe_upper_rect.left = self.pipe_upper_rect.left - self.pipe_move
-            self.pipe_lower_rect.left = self.pipe_lower_rect.left - self.pipe_move
-
-            # If the pipes are off the screen, reset them
-            if self.pipe_upper_rect.right < 0:
-                self.reset_pipes()
-
-            #--------------------DRAW ON BACKBUFFER-----------------------#
-            # Draw everything in the backbuffer first
-            # Fill the display surface with blue
-            self.surface.fill(config.SKY_BLUE)
-           
-            # Draw bird to the backbuffer
-            self.surface.blit(
-                self.bird,       # Source image
-                self.bird_rect   # Destination location of image
-            )
+            # The ESC key will quit the game
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.quit()
 
-            # Draw pipes to the backbuffer
-            self.surface.blit(
-                self.pipe_lower,                # Source image
-                self.pipe_lower_rect            # Destination location of image
-            )
-            self.surface.blit(
-                self.pipe_upper,                # Source image
-                self.pipe_upper_rect            # Destination location of image
-            )
+            # Build the background again if the window changes size
+            elif event.type == pygame.VIDEORESIZE:
+                self.rebuild_background()
+
+            # F3 turns the frame profiler on and off
+            self.profiler.handle_event(event)
 
-            #-------------------------UPDATE SURFACE----------------------#
-            # From back buffer, update pygame display to reflect any changes
-            pygame.display.update()
+        # The game over menu needs the events too
+        return events
 
-            # Cap game speed to 60 fps
-            self.clock.tick(60)
+#-------------------------------SAVE POSITIONS-------------------------------#
+    def save_positions(self):
+        """Remember where the bird and pipes are before they move"""
+        self.previous_bird.update(self.bird_rect)
+        self.pipes.save_positions()
 
+#-------------------------------UPDATE-------------------------------#
+    def update(self):
+        """Move everything one fixed update"""
+        self.save_positions()
+
+        with self.profiler.phase("collision"):
+            self.detect_collision()
+        # Simulate gravity by moving the bird down
+        # unless the UP key is pressed
+        # Reset gravity to 3 each time through the loop
+        gravity = 3
+
+        # Get list of keys being pressed
+        key_input = self.input_log.get_pressed()
+
+        # If up cursor pressed, move up 5 pixels
+        if key_input[pygame.K_UP]:
+            gravity -= 5
+
+        #------------------INCREASE DIFFICULTY-------------------#
+
+        # Adding difficulty relative to score
+        # Increase the speed and decrease the gap of blocks
+        if 5 <= self.score < 10:
+            self.pipe_move = 5
+            self.pipe_gap_size = self.bird_rect.height * 4
+            self.pipe_level = 1
+
+        elif 10 <= self.score < 20:
+            self.pipe_move = 7
+            self.pipe_gap_size = self.bird_rect.height * 3.5
+            self.pipe_level = 2
+
+        #------------------SCORING-------------------#
+        # If the bird makes it past the pipes, increase score
+        # Each pair of pipes only scores once
+        self.score += self.pipes.passed(self.bird_rect)
+
+        #------------------MOVE SPRITES--------------------#
+        # Move the bird by adding gravity value to y location
+        self.bird_rect.y = self.bird_rect.y + gravity
+
+        # Move pipe images from right to left
+        # Pipes that are off the screen start again behind the last pair
+        self.pipes.move(self.pipe_move, self.pipe_gap_size, self.pipe_level)
+
+#-------------------------------DRAW-------------------------------#
+    def draw(self, alpha=1.0):
+        """Draw the bird and pipes alpha of the way from their last position"""
+        #--------------------DRAW ON BACKBUFFER-----------------------#
+        # Draw everything in the backbuffer first
+        # Put back the cached background, the whole window or only
+        # where things were last frame in dirty rectangle mode
+        self.dirty_rects.clear()
+
+        # Draw bird to the backbuffer
+        self.dirty_rects.add(self.surface.blit(
+            self.bird,       # Source image
+            lerp_rect(self.previous_bird, self.bird_rect, alpha)
+        ))
+
+        # Draw pipes to the backbuffer
+        self.pipes.draw(self.surface, self.dirty_rects, alpha)
+
+        # Draw score on top of the pipes
+        self.display_score()
+
+#-------------------------------GAME LOOP-------------------------------#
+    def game_loop(self):
+        """Infinite game loop"""
+        while True:
+            with self.profiler.phase("events"):
+                events = self.check_events()
+
+            # A replay closes the game when the log runs out
+            if self.input_log.finished():
+                self.quit()
+
+            if not self.game_over_screen.playing():
+                # Replays play again without waiting for the menu
+                if self.input_log.restart_due():
+                    self.restart()
+                else:
+                    # Crash sound or game over menu, the window stays responsive
+                    with self.profiler.phase("menu"):
+                        self.game_over_screen.update(events)
+            else:
+                self.play_frame()
+
+            # Cap drawing speed, this does not change the game speed
+            # The time tick waits is the frame's idle time
+            with self.profiler.phase("tick"):
+                self.clock.tick(config.FPS)
+
+            self.profiler.end_frame()
+
+#------------------------------PLAY FRAME------------------------------#
+    def play_frame(self):
+        """Update, draw and show one frame of the game"""
+        # Run as many fixed updates as fit in the time the last frame took
+        for _ in range(self.timestep.advance(self.clock.get_time())):
+            with self.profiler.phase("update"):
+                self.update()
+
+            # The rest of the frame's updates are dropped at game over
+            if not self.game_over_screen.playing():
+                break
+
+        with self.profiler.phase("draw"):
+            self.draw(self.timestep.alpha())
+
+            # Frame times on top of everything else
+            if self.profiler.enabled:
+                self.dirty_rects.add(self.profiler.draw(self.surface))
+
+        # From back buffer, update pygame display to reflect any changes
+        with self.profiler.phase("display"):
+            self.dirty_rects.update()
+
+        # Report the startup time and get the game over menu ready
+        # in the background once the game is on screen
+        if self.startup.first_frame():
+            startup.prewarm_menu()
 
 def main():
     # Create flappy bird program object
@@ -314,4 +460,5 @@ def main():
     flappy_bird.game_loop()
 
 # Start the program
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
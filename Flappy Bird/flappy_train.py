@@ -0,0 +1,240 @@
+"""
+Filename: flappy_train.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Train and evaluate Flappy Bird controllers on every CPU core
+
+    python flappy_train.py                        Train for 20 generations
+    python flappy_train.py --generations 50 --population 64 --workers 8
+    python flappy_train.py --scaling              Episodes per second for
+                                                  1 worker up to every core
+
+Nothing is drawn and no images are loaded. Each worker process plays
+its games with FlappyBatch, which follows the same rules as the game.
+
+A controller is a line through the five numbers FlappyBatch.observe()
+returns: it flaps when weights . observation + bias > 0. Training keeps
+the best controllers of each generation and picks the next generation
+around them.
+
+Every controller in a generation plays the same number of games from
+the same seed, made from the run seed and the generation number, in
+its own batch. So the same seed always gives the same scores, no matter
+how many workers share the work.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+# pip install numpy
+import numpy as np
+import config
+from flappy_batch import FlappyBatch
+
+# observe() is in pixels, this brings each column to about 0 to 1
+FEATURE_SCALE = np.array(
+    [config.HEIGHT, config.WIDTH, config.HEIGHT, config.HEIGHT, 10.0])
+
+# Weights and bias of a controller to start the search from:
+# flap when the bird is within 30 pixels of the lower pipe
+START = np.array([0.0, 0.0, 0.0, -1.0, 0.0, 0.05])
+
+# Controllers kept from each generation to pick the next one around
+ELITE_FRACTION = 0.2
+
+# Controllers sent to a worker at a time
+CHUNK_SIZE = 4
+
+
+#------------------------------PLAY------------------------------#
+def play(params, seed, episodes, max_frames):
+    """Play one controller for a batch of games, return each game's score"""
+    weights = params[:-1] / FEATURE_SCALE
+    bias = params[-1]
+
+    batch = FlappyBatch(episodes, seed)
+    scores = batch.run(
+        lambda games: games.observe() @ weights + bias > 0, max_frames)
+
+    return scores, int(batch.frames.sum())
+
+
+#------------------------------PLAY CHUNK------------------------------#
+def play_chunk(task):
+    """Play a few controllers in a worker process
+
+    Returns an array of scores, one row per controller, and the number
+    of frames played.
+    """
+    population, seed, episodes, max_frames = task
+
+    scores = np.empty((len(population), episodes), dtype=np.int32)
+    frames = 0
+    for row, params in enumerate(population):
+        scores[row], played = play(params, seed, episodes, max_frames)
+        frames += played
+
+    return scores, frames
+
+
+#------------------------------EVALUATE------------------------------#
+def evaluate(population, seed, episodes, max_frames, executor=None):
+    """Play every controller, return (scores, frames played)
+
+    With an executor the controllers are split into chunks of CHUNK_SIZE
+    and played in the worker processes, otherwise in this process.
+    """
+    tasks = [
+        (population[start:start + CHUNK_SIZE], seed, episodes, max_frames)
+        for start in range(0, len(population), CHUNK_SIZE)
+    ]
+
+    if executor is None:
+        results = map(play_chunk, tasks)
+    else:
+        results = executor.map(play_chunk, tasks)
+
+    # map returns the chunks in the order they were sent
+    results = list(results)
+    scores = np.concatenate([scores for scores, _ in results])
+    frames = sum(frames for _, frames in results)
+
+    return scores, frames
+
+
+#------------------------------MAKE EXECUTOR------------------------------#
+def make_executor(workers):
+    """Return a process pool, or None to play in this process"""
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+#------------------------------TRAIN------------------------------#
+def train(args):
+    """Search for a good controller, print the best of each generation"""
+    rng = np.random.default_rng(args.seed)
+
+    mean = START.copy()
+    std = np.full(len(START), args.sigma)
+    elite_count = max(1, int(args.population * ELITE_FRACTION))
+
+    best_params = mean
+    best_score = -1.0
+
+    executor = make_executor(args.workers)
+    try:
+        for generation in range(args.generations):
+            population = mean + std * rng.standard_normal(
+                (args.population, len(START)))
+
+            # The same games for every controller in this generation
+            seed = np.random.SeedSequence([args.seed, generation])
+
+            started = perf_counter()
+            scores, frames = evaluate(
+                population, seed, args.episodes, args.max_frames, executor)
+            seconds = perf_counter() - started
+
+            # Keep the best controllers and search around them next time
+            fitness = scores.mean(axis=1)
+            elite = population[np.argsort(fitness)[-elite_count:]]
+            mean = elite.mean(axis=0)
+            std = elite.std(axis=0) + args.sigma * 0.1
+
+            if fitness.max() > best_score:
+                best_score = fitness.max()
+                best_params = population[fitness.argmax()]
+
+            episodes = scores.size
+            print(f"generation {generation:3d}  best {fitness.max():7.2f}"
+                  f"  mean {fitness.mean():7.2f}"
+                  f"  {episodes / seconds:8.1f} episodes/s"
+                  f"  {frames / seconds:10.0f} frames/s")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    print("best controller", np.round(best_params, 4).tolist(),
+          f"mean score {best_score:.2f}")
+
+
+#------------------------------SCALING------------------------------#
+def scaling(args):
+    """Time the same evaluation with more and more workers"""
+    rng = np.random.default_rng(args.seed)
+    population = START + args.sigma * rng.standard_normal(
+        (args.population, len(START)))
+    seed = np.random.SeedSequence([args.seed, 0])
+
+    # 1, 2, 4, ... workers up to every core, unless --worker-counts was given
+    cores = os.cpu_count() or 1
+    if args.worker_counts:
+        counts = args.worker_counts
+    else:
+        counts = [1]
+        while counts[-1] * 2 <= cores:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != cores:
+            counts.append(cores)
+
+    print(f"{cores} cores, {args.population} controllers"
+          f" x {args.episodes} episodes")
+
+    baseline = None
+    for workers in counts:
+        executor = make_executor(workers)
+        try:
+            started = perf_counter()
+            scores, frames = evaluate(
+                population, seed, args.episodes, args.max_frames, executor)
+            seconds = perf_counter() - started
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        rate = scores.size / seconds
+        if baseline is None:
+            baseline = (rate, scores)
+
+        # Seeded games must score the same however the work is split
+        same = np.array_equal(scores, baseline[1])
+
+        print(f"workers {workers:3d}  {rate:8.1f} episodes/s"
+              f"  {frames / seconds:10.0f} frames/s"
+              f"  speedup {rate / baseline[0]:5.2f}"
+              f"  {'same scores' if same else 'SCORES DIFFER'}")
+
+
+#------------------------------MAIN------------------------------#
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train Flappy Bird controllers without a window")
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--population", type=int, default=32,
+                        help="controllers in each generation")
+    parser.add_argument("--episodes", type=int, default=16,
+                        help="games each controller plays per generation")
+    parser.add_argument("--max-frames", type=int, default=3000,
+                        help="longest a game can last")
+    parser.add_argument("--sigma", type=float, default=0.5,
+                        help="how far the first generation spreads out")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes, 1 plays in this process")
+    parser.add_argument("--scaling", action="store_true",
+                        help="report episodes/s for different worker counts")
+    parser.add_argument("--worker-counts", type=int, nargs="+",
+                        help="worker counts for --scaling")
+    args = parser.parse_args()
+
+    if args.scaling:
+        scaling(args)
+    else:
+        train(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Filename: pipes.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: A stream of pipe pairs that are reused as they leave the screen
+"""
+
+# pip install pygame-ce
+import pygame
+import config
+from shared.assets import asset_cache
+from shared.timestep import lerp_rect
+
+# Pipe images for each difficulty level, the colored pipes are stretched
+# to the size of pipe.png so every pipe plays the same
+PIPE_IMAGES = (
+    "./assets/pipe.png",
+    "./assets/pipe-green.png",
+    "./assets/pipe-red.png",
+)
+
+# Range for the bottom of the upper pipe
+PIPE_MIN_BOTTOM = 50
+PIPE_MAX_BOTTOM = config.HEIGHT // 2
+
+
+class PipePool:
+    """A fixed number of pipe pairs kept in a ring buffer
+
+    Every rect is made once when the pool is created. The pair at head is
+    the one furthest left. When it leaves the screen it is moved to the
+    back of the line, spacing pixels behind the last pair, and head moves
+    on to the next pair. Pairs stay in order from left to right, so tests
+    against the bird can stop at the first pair past it.
+    """
+
+    def __init__(self, count, spacing, random):
+        self.count = count
+        self.spacing = spacing
+
+        # The game's seeded Random, so replays get the same pipes
+        self.random = random
+
+        # Upper and lower pipe image for each difficulty level
+        pipe, *colors = PIPE_IMAGES
+        size = asset_cache.image(pipe).get_size()
+        self.lower_images = [asset_cache.image(pipe)] + [
+            asset_cache.image(path, size=size) for path in colors
+        ]
+        self.upper_images = [asset_cache.image(pipe, angle=180)] + [
+            asset_cache.image(path, angle=180, size=size) for path in colors
+        ]
+
+        # Every pair's rects, where they were before the last move,
+        # difficulty level and whether it has been scored
+        self.upper = [pygame.Rect((0, 0), size) for _ in range(count)]
+        self.lower = [pygame.Rect((0, 0), size) for _ in range(count)]
+        self.previous_upper = [pygame.Rect((0, 0), size) for _ in range(count)]
+        self.previous_lower = [pygame.Rect((0, 0), size) for _ in range(count)]
+        self.level = [0] * count
+        self.score_counted = [False] * count
+
+        self.head = 0
+
+#---------------------------------RESET------------------------------------#
+    def reset(self, gap_size):
+        """Line the pairs up off screen to the right"""
+        self.head = 0
+        for i in range(self.count):
+            self.place(i, config.WIDTH + i * self.spacing, gap_size, 0)
+        self.save_positions()
+
+#---------------------------------PLACE------------------------------------#
+    def place(self, i, left, gap_size, level):
+        """Move pair i to left with its gap at a random height"""
+        upper = self.upper[i]
+        lower = self.lower[i]
+
+        # Pick a random height for the bottom of the top pipe
+        upper.bottom = self.random.randint(PIPE_MIN_BOTTOM, PIPE_MAX_BOTTOM)
+
+        # Set lower pipe top to upper pipe bottom plus pipe gap
+        lower.top = upper.bottom + gap_size
+
+        upper.left = left
+        lower.left = left
+
+        self.level[i] = level
+
+        # New set of pipes, reset score counter
+        self.score_counted[i] = False
+
+#---------------------------------SAVE POSITIONS------------------------------------#
+    def save_positions(self):
+        """Remember where every pair is before it moves, without new rects"""
+        for i in range(self.count):
+            self.previous_upper[i].update(self.upper[i])
+            self.previous_lower[i].update(self.lower[i])
+
+#---------------------------------MOVE------------------------------------#
+    def move(self, pixels, gap_size, level):
+        """Move every pair left, recycle the pairs that left the screen"""
+        for i in range(self.count):
+            self.upper[i].left -= pixels
+            self.lower[i].left -= pixels
+
+        # Only the pair furthest left can be off the screen
+        while self.upper[self.head].right < 0:
+            last = self.upper[(self.head - 1) % self.count]
+
+            # Behind the last pair, but never on screen
+            left = max(config.WIDTH, last.left + self.spacing)
+            self.place(self.head, left, gap_size, level)
+
+            self.head = (self.head + 1) % self.count
+
+#---------------------------------HIT------------------------------------#
+    def hit(self, bird_rect):
+        """Return True if the bird runs into the pair it is flying through"""
+        for k in range(self.count):
+            i = (self.head + k) % self.count
+            upper = self.upper[i]
+
+            # Every pair after this one is further right
+            if upper.left >= bird_rect.right:
+                return False
+
+            # The bird is between the pipes
+            if upper.left < bird_rect.right < upper.right:
+
+                # If the bird runs into a pipe, game over
+                if bird_rect.top < upper.bottom \
+                        or bird_rect.bottom > self.lower[i].top:
+                    return True
+
+        return False
+
+#---------------------------------PASSED------------------------------------#
+    def passed(self, bird_rect):
+        """Return how many pairs the bird just got past, they are scored once"""
+        points = 0
+        for k in range(self.count):
+            i = (self.head + k) % self.count
+
+            # Every pair after this one is further right
+            if self.upper[i].right >= bird_rect.left:
+                break
+
+            if not self.score_counted[i]:
+                # Track whether this set of pipes has had a score
+                self.score_counted[i] = True
+                points += 1
+
+        return points
+
+#---------------------------------DRAW------------------------------------#
+    def draw(self, surface, dirty_rects, alpha=1.0):
+        """Draw the pairs on screen alpha of the way from their last position"""
+        for i in range(self.count):
+            # Pairs waiting off screen to the right are not drawn
+            if self.previous_upper[i].left >= config.WIDTH \
+                    and self.upper[i].left >= config.WIDTH:
+                continue
+
+            level = self.level[i]
+            dirty_rects.add(surface.blit(
+                self.lower_images[level],
+                lerp_rect(self.previous_lower[i], self.lower[i], alpha)
+            ))
+            dirty_rects.add(surface.blit(
+                self.upper_images[level],
+                lerp_rect(self.previous_upper[i], self.upper[i], alpha)
+            ))
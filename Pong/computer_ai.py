@@ -0,0 +1,109 @@
+"""
+Filename: computer_ai.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Move a paddle to where the ball is going to be
+"""
+
+import config
+
+
+#------------------------------SIGN------------------------------#
+def sign(value):
+    """Return -1, 0 or 1 for the direction of value"""
+    return (value > 0) - (value < 0)
+
+
+class PaddleAI:
+    """Moves a paddle to meet the ball, for either side of the table
+
+    Where the ball will cross the paddle is worked out in one step, with
+    the bounces off the top and bottom walls folded in, instead of
+    following the ball frame by frame. It is only worked out again when
+    the ball changes direction, so each update is the same small cost.
+
+    Difficulty:
+        reaction_frames  frames to wait after the ball turns around
+        max_speed        most pixels the paddle moves in one update
+        error            aim up to this many pixels off, picked at random
+                         for each shot
+    """
+
+    def __init__(self, paddle, random,
+                 reaction_frames=config.AI_REACTION_FRAMES,
+                 max_speed=config.AI_MAX_SPEED, error=config.AI_ERROR):
+        self.paddle = paddle
+
+        # The simulation's Random, so games can be repeated
+        self.random = random
+
+        self.reaction_frames = reaction_frames
+        self.max_speed = max_speed
+        self.error = error
+
+        self.reset()
+
+#------------------------------RESET------------------------------#
+    def reset(self):
+        """Forget the last shot, call after every serve"""
+        # Ball direction the target was worked out for
+        self.direction = None
+
+        # y the paddle's center is moving to
+        self.target = config.HEIGHT // 2
+
+        self.offset = 0
+        self.wait = 0
+
+#------------------------------UPDATE------------------------------#
+    def update(self, ball, speed_x, speed_y):
+        """Move the paddle one update toward where the ball will be"""
+        direction = (sign(speed_x), sign(speed_y))
+
+        if direction != self.direction:
+            # A new shot: aim a little off and wait before reacting
+            if self.direction is None or direction[0] != self.direction[0]:
+                self.wait = self.reaction_frames
+                if self.error:
+                    self.offset = self.random.randint(-self.error, self.error)
+
+            # A wall bounce only needs the target again, from closer up
+            self.direction = direction
+            self.target = self.predict(ball, speed_x, speed_y) + self.offset
+
+        if self.wait > 0:
+            self.wait -= 1
+            return
+
+        self.paddle.move_toward(self.target, self.max_speed)
+
+#------------------------------PREDICT------------------------------#
+    def predict(self, ball, speed_x, speed_y):
+        """Return the y of the ball's center when it reaches the paddle
+
+        A ball moving away from the paddle sends it back to the middle.
+        """
+        rect = self.paddle.rect
+
+        # Pixels the ball has to travel to reach the front of the paddle
+        if rect.centerx > ball.centerx:
+            distance = rect.left - ball.right
+            coming = speed_x > 0
+        else:
+            distance = ball.left - rect.right
+            coming = speed_x < 0
+
+        if not coming or distance < 0:
+            return config.HEIGHT // 2
+
+        # Where the ball's top would be with no walls
+        y = ball.top + speed_y * distance / abs(speed_x)
+
+        # The top moves between 0 and span. Unfolded, the path repeats
+        # every 2 * span pixels, and the second half goes back up.
+        span = config.HEIGHT - ball.height
+        y %= 2 * span
+        if y > span:
+            y = 2 * span - y
+
+        return round(y) + ball.height // 2
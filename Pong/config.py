@@ -16,3 +16,15 @@ BLACK = (0, 0, 0)
 # Radius of ball
 BALL_RADIUS = 15
 
+# Frames drawn per second, 0 draws as fast as the computer can
+FPS = 60
+
+# Game updates per second, every speed in the game is pixels per update
+UPDATES_PER_SECOND = 60
+
+# Computer paddle difficulty: frames it waits before reacting to a shot,
+# most pixels it moves per update and how many pixels its aim can be off.
+# Aim off by more than half the paddle's height (50) can miss the ball.
+AI_REACTION_FRAMES = 8
+AI_MAX_SPEED = 5
+AI_ERROR = 30
@@ -50,17 +50,14 @@ class Paddle:
             # which moves the paddle downwards
             self.rect.y = self.rect.y + self.speed
 
-#-----------------MOVE COMPUTER PADDLE----------------#
-    def move_computer_paddle(self):
-        """Move computer paddle up and down"""
-        # If the computer paddle is inside the top and bottom border
-        # keep moving in the same direction
-        if self.rect.top + self.speed > 20 and \
-                self.rect.bottom + self.speed < config.HEIGHT - 20:
-            
-            # Move computer paddle in the current direction
-            self.rect.y += self.speed
+#-----------------MOVE TOWARD----------------#
+    def move_toward(self, center_y, max_speed):
+        """Move the paddle's center toward center_y, at most max_speed pixels"""
+        distance = center_y - self.rect.centery
 
-        else:
-            # Reverse paddle direction multiply by -1
-            self.speed = self.speed * -1
\ No newline at end of file
+        # Don't move further than max_speed in either direction
+        distance = max(-max_speed, min(max_speed, distance))
+        self.rect.y += distance
+
+        # Stay on the table
+        self.rect.clamp_ip((0, 0, config.WIDTH, config.HEIGHT))
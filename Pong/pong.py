@@ -5,23 +5,38 @@ Created: 04/26/2024
 Purpose: Add sound and game over
 """
 
+# Taken first so the startup report includes the imports
+from time import perf_counter
+IMPORT_START = perf_counter()
+
 # pip install pygame-ce
 
 # Import pygame library
 import pygame
-#pip install pygame-ce
-import pygame_menu as pm
 # Import exit for clean program shutdown
 from sys import exit
-from random import randint
-random.seed()
-from time import sleep
+import os
+import sys
 import config
-from paddle import Paddle
+from pong_sim import PongSimulation, BALL_OUT, PLAYER_HIT, COMPUTER_HIT
+
+# The shared modules live one folder up from this game
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.game_over import GameOverScreen
+from shared import dirty
+from shared import profiler
+from shared import replay
+from shared import sfx
+from shared import startup
+from shared.text import text_cache
+from shared.timestep import FixedTimestep, lerp_rect
 
 class Pong:
 
     def __init__(self):
+        # Time each part of startup, STARTUP_REPORT=1 prints it
+        self.startup = startup.StartupTimer(IMPORT_START, startup.enabled())
+
         # Initialize mixer with larger buffer size for better performance
         pygame.mixer.pre_init(
             44100,          # frequency (Hz)
@@ -30,73 +45,133 @@ class Pong:
             4096            # buffer size, larger to optimize music playback
         )
 
-        # Initialize the Pygame engine
-        pygame.init()
+        # Start only the display, font and mixer parts of the Pygame engine
+        with self.startup.stage("init"):
+            startup.init_pygame()
 
-        # Set screen width and height as a tuple
-        self.surface = pygame.display.set_mode(
-            (config.WIDTH, config.HEIGHT)
-        )
+        with self.startup.stage("display"):
+            # Set screen width and height as a tuple
+            self.surface = pygame.display.set_mode(
+                (config.WIDTH, config.HEIGHT)
+            )
 
-        # Set window caption
-        pygame.display.set_caption("Pong")
+            # Set window caption
+            pygame.display.set_caption("Pong")
 
-        # Define the clock to keep the game running at a set speed
+        # Define the clock to measure how long each frame takes
         self.clock = pygame.time.Clock()
 
-        # Create the ball rectangle object
-        self.ball = pygame.Rect(
-            config.WIDTH // 2 - config.BALL_RADIUS,             # Set x- coordinate
-            config.HEIGHT // 2 - config.BALL_RADIUS,            # Set y- coordinate
-            config.BALL_RADIUS,                                 # Set width of ball
-            config.BALL_RADIUS                                  # Set height of ball
-        )
+        # The game moves in fixed updates, however fast frames are drawn
+        self.timestep = FixedTimestep(config.UPDATES_PER_SECOND)
 
-        self.set_ball_direction()
+        # Keys are read through the input log so a game can be recorded
+        # and replayed, RECORD_INPUT / REPLAY_INPUT turn that on
+        self.input_log = replay.from_environment()
+        if self.input_log.fast:
+            self.clock = replay.FastClock(self.timestep)
 
-        # Set up player paddles
-        self.player = Paddle(
-            5,                              # x coordinate
-            (config.HEIGHT - 100) // 2      # y coordinate
-        )
+        # Ball, paddles and score live in the simulation,
+        # this class only reads the keyboard, draws and plays sound
+        self.sim = PongSimulation(self.input_log.seed)
 
-        self.computer = Paddle(
-            config.WIDTH - 15,              # x coordinate
-            (config.HEIGHT - 100) // 2      # y coordinate
+        with self.startup.stage("assets"):
+            # Load sound effects once, they are played on channels kept
+            # for them, two hits can overlap
+            self.sfx = sfx.SoundEffects()
+            self.sfx.load("hit", './pong_assets/hit.wav', volume=0.3, voices=2)
+            self.sfx.load("game_over", './pong_assets/game_over.wav', priority=1)
+
+            # Load background music file, set volume to 30%,
+            # range from 0.0 (mute) to 1.0 (full volume)
+            self.sfx.load_music(
+                './assets/inspiring-and-uplifting-indie-rock.mp3', volume=0.3)
+
+        with self.startup.stage("font"):
+            self.score_font = pygame.font.SysFont("freesansbold", 18)
+
+        # Optional dirty rectangle mode, only redraws what moved
+        self.dirty_rects = dirty.DirtyRects(
+            self.surface, self.make_background(), dirty.enabled())
+
+        # Time spent in each part of the game loop, F3 shows it
+        self.profiler = profiler.FrameProfiler(profiler.enabled())
+
+        # Crash sound and game over menu without blocking the game loop
+        self.game_over_screen = GameOverScreen(
+            self.surface, self.build_game_over_menu
         )
 
-        self.computer_speed = 3
+        self.reset()
+
+#-------------------------------RESET-------------------------------#
+    def reset(self):
+        """Start a new game, the window, sounds and music stay loaded"""
+        self.sim.reset()
+        self.save_positions()
 
-        # Load background music file into memory
-        pygame.mixer.music.load('./assets/inspiring-and-uplifting-indie-rock.mp3')
+        # Don't count the time spent in the game over menu
+        self.timestep.reset()
+        self.clock.tick()
 
-        # Set volume to 30%, range from 0.0 (mute) to 1.0 (full volume)
-        pygame.mixer.music.set_volume(0.3)
+        # The game over menu covered the whole window
+        self.dirty_rects.invalidate()
 
         # Play in a loop until stopped
-        pygame.mixer.music.play(-1)
+        self.sfx.play_music()
+
+#------------------------------RESTART------------------------------#
+    def restart(self):
+        """Close the game over menu and play again in the same window"""
+        self.game_over_screen.close()
+        self.input_log.restarted()
+        self.reset()
+
+#------------------------------RESUME------------------------------#
+    def resume(self):
+        """Take the window and music back after the launcher ran another game
+
+        Images, sounds and fonts are still loaded, only the things every
+        game shares are set up again.
+        """
+        pygame.display.set_mode((config.WIDTH, config.HEIGHT))
+        pygame.display.set_caption("Pong")
 
-        self.score_font = pygame.font.SysFont("freesansbold", 18)
-        self.player_score = 0
-        self.computer_score = 0
+        self.sfx.load_music(
+            './assets/inspiring-and-uplifting-indie-rock.mp3', volume=0.3)
 
-        # Movement of ping pong ball in pixels
-        self.ball_speed_x = 3
-        self.ball_speed_y = 3
+        if self.game_over_screen.playing():
+            # Carry on where the game was left, without catching up
+            # on the time spent in the other game
+            self.timestep.reset()
+            self.clock.tick()
+            self.dirty_rects.invalidate()
+            self.sfx.play_music()
+        else:
+            # Left from the game over screen, start a new game
+            self.restart()
+
+#------------------------------QUIT------------------------------#
+    def quit(self):
+        """Close the game, the launcher replaces this to go back to its menu"""
+        # Quit pygame
+        pygame.quit()
+        # Exit Python
+        exit()
 
 #---------------------------DISPLAY GAME OVER--------------------------#
     def game_over(self):
-        """Display game over menu using the Pygame Menu library"""
+        """Stop the game and start the game over screen, the game loop keeps running"""
         # Stop background sound
-        pygame.mixer.music.stop()
+        self.sfx.stop_music()
 
-        # Play crash sound
-        crash = pygame.mixer.Sound('./assets/game_over.wav')
-        crash.play()
-        #crash.set_volume(0.3)
+        # Play crash sound, the menu opens when it ends or after 2 seconds
+        self.game_over_screen.start(lambda: self.sfx.play("game_over"), 2000)
 
-        # Wait 2 seconds while crash plays
-        sleep(2)
+#---------------------------BUILD GAME OVER MENU--------------------------#
+    def build_game_over_menu(self):
+        """Create the game over menu using the Pygame Menu library"""
+        # pygame_menu is imported the first time it is needed
+        pm = startup.load_menu()
 
         # Define a menu object for the game over screen
         game_over = pm.Menu(
@@ -108,8 +183,8 @@ class Pong:
         )
 
         # Display final score
-        game_over.add.label(f"Player Score: {self.player_score}")
-        game_over.add.label(f"Computer Score: {self.computer_score}")
+        game_over.add.label(f"Player Score: {self.sim.player_score}")
+        game_over.add.label(f"Computer Score: {self.sim.computer_score}")
 
         # Add label to provide space between buttons
         game_over.add.label("")
@@ -117,7 +192,7 @@ class Pong:
         # Add a button to the game over menu for exiting the game
         game_over.add.button(
             title="Play Again?",                # Button text
-            action=main                         # Call main() to start over
+            action=self.restart                 # Play again in the same window
         )
 
         # Add label to provide space between buttons
@@ -126,88 +201,30 @@ class Pong:
         # Add a button to the game over menu for exiting the game
         game_over.add.button(
             title="Exit",                       # Button text
-            action=pm.events.EXIT               # Exit the game when clicked
+            action=self.quit                    # Exit the game when clicked
         )
 
-        # Run the main loop of the game over menu on the specified surface
-        game_over.mainloop(self.surface)
-
-#------------------------------SET BALL DIRECTION----------------------#
-    def set_ball_direction(self):
-        """Set initial ball direction along the x and y axis"""
-        # Randomly determine the initial direction of the ball
-        # along the x-axis (left or right)
-        ball_direction_x = random.randint(0, 1)
-
-        # If the randomly chosen direction is 0 (left),
-        # set the horizontal speed of the ball to move to the right
-        if ball_direction_x == 0:
-            self.ball_speed_x = 3
-
-        # If the randomly chosen direction is 1 (right),
-        # set the horizontal speed of the ball to move to the left
-        else:
-            self.ball_speed_x = -3
-
-        # Randomly determine the initial direction of the ball
-        # along the y-axis (up or down)
-        ball_direction_y = randint(0, 1)
-
-        # If the randomly chosen direction is 0 (up),
-        # set the vertical speed of the ball to move downwards
-        if ball_direction_y == 0:
-            self.ball_speed_y = 3
-
-        # If the randomly chosen direction is 1 (down),
-        # set the vertical speed of the ball to move upwards
-        else:
-            self.ball_speed_y = -3
+        return game_over
 
 #------------------------------CHECK COLLISION----------------------------#
     def check_collision(self):
-        """Check for all collisions"""
-        # Check for collision with left or right wall
-        # Subtract ball radius to bounce off the edge of the ball
-        if self.ball.left < 0 or self.ball.right >= config.WIDTH:
+        """Check for all collisions, play sound or end the game"""
+        event = self.sim.check_collision()
 
+        if event == BALL_OUT:
             # Ball goes off the table
             self.game_over()
 
-            # Reverse y direction multiply by -1
-            self.ball_speed_x = self.ball_speed_x * -1
-
-        # Check for collision with top or bottom wall
-        if self.ball.top < 0 or self.ball.bottom >= config.HEIGHT:
-
-            # Reverse y direction multiply by -1
-            self.ball_speed_y = self.ball_speed_y * -1
-
-        # Ball collisions with paddles
-        if self.ball.colliderect(self.player):
-            # Reverse ball direction
-            self.ball_speed_x *= -1
-            self.player_score += 1
-
-            # Play ball bounce sound
-            crash = pygame.mixer.Sound('./assests/hit.wav')
-            crash.play()
-            crash.set_volume(0.3)
-
-        elif self.ball.colliderect(self.computer):
-            # Reverse ball direction
-            self.ball_speed_x *= -1
-            self.computer_score += 1
-
+        elif event == PLAYER_HIT or event == COMPUTER_HIT:
             # Play ball bounce sound
-            crash = pygame.mixer.Sound('./assests/hit.wav')
-            crash.play()
-            crash.set_volume(0.3)        
+            self.sfx.play("hit")
 
 #------------------------------CHECK EVENTS----------------------------#
     def check_events(self):
         """"Listen for and handle all program events"""
         # Iterate (loop) through all captured events
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
 
             # Closing the game causes the QUIT event to be fired
             if event.type == pygame.QUIT:
@@ -216,100 +233,180 @@ class Pong:
                 # Exit Python
                 exit()
 
+            # Build the background again if the window changes size
+            elif event.type == pygame.VIDEORESIZE:
+                self.rebuild_background()
+
+            # F3 turns the frame profiler on and off
+            self.profiler.handle_event(event)
+
+        # The game over menu needs the events too
+        return events
+
 #--------------------GET KEYS------------------#
     def get_keys(self):
         # Update player paddle position
         # Get the state of all keyboard keys pressed at the moment
-        keys = pygame.key.get_pressed()
+        keys = self.input_log.get_pressed()
 
-        # Check if the UP arrow key is pressed
-        if keys[pygame.K_UP]:
-            # If the UP arrow key is pressed, move the player up
-            self.player.move_up()
-
-        # Check if the DOWN arrow key is pressed
-        if keys[pygame.K_DOWN]:
-            # If the DOWN arrow key is pressed, move the player down
-            self.player.move_down()
+        # Move the player up while the UP arrow key is pressed
+        # and down while the DOWN arrow key is pressed
+        self.sim.move_player(keys[pygame.K_UP], keys[pygame.K_DOWN])
 
         # The ESC key will quit the game
         if keys[pygame.K_ESCAPE]:
-            # Quit Pygame
-            pygame.quit()
-            # Exit Python
-            exit()
+            self.quit()
 
-#------------------------------------GAME LOOP----------------------------#
-    def game_loop(self):
-        """Infinite game loop"""
-        while True:
-            self.check_events()
-
-            self.computer.move_computer_paddle()
-            self.get_keys()
+#------------------------------------SAVE POSITIONS----------------------------#
+    def save_positions(self):
+        """Remember where the paddles and ball are before they move"""
+        self.previous_player = self.sim.player.rect.copy()
+        self.previous_computer = self.sim.computer.rect.copy()
+        self.previous_ball = self.sim.ball.copy()
 
-            self.check_collision()
+#------------------------------------UPDATE----------------------------#
+    def update(self):
+        """Move everything one fixed update"""
+        self.save_positions()
 
-            #----------------------------DRAW ON BACKBUFFER-----------------------#
-            # Draw everything in the backbuffer first
-            # Fill the display surface with black
-            self.surface.fill(config.BLACK)
+        self.sim.move_computer()
+        self.get_keys()
 
-            self.draw_net()
-
-            # Draw a rectangle for the player's paddle
-            # on the screen using Pygame's draw function
-            pygame.draw.rect(
-                self.surface,           # Surface to draw on
-                config.WHITE,           # Color to draw with
-                self.player             # rect image object to draw
-            )
-
-            # Draw a rectangle for the computer's paddle
-            # on the screen using Pygame's draw function
-            pygame.draw.rect(
-                self.surface,           # Surface to draw on
-                config.WHITE,           # Color to draw with
-                self.computer           # rect image object to draw
-            )
-
-            # Move the ball position every frame
-            self.ball.x += self.ball_speed_x
-            self.ball.y += self.ball_speed_y
+        with self.profiler.phase("collision"):
+            self.check_collision()
 
-            # Draw ball to the backbuffer
-            pygame.draw.ellipse(
-                self.surface,           # Surface to draw on
-                config.WHITE,           # Color to draw with
-                self.ball               # Rect image object to draw
-            )
+        # Move the ball position every update
+        self.sim.move_ball()
 
-            # Render the player's score text using specified font,
-            # color, and score value
-            player_score = self.score_font.render(
-                "Player:" + str(self.player_score), True, config.WHITE)
-            
-            # Render the computer's score text using specified font,
-            # color, and score value
-            computer_score = self.score_font.render(
-                "Computer:" + str(self.computer_score), True, config.WHITE)
-
-            # Display the player's score text on the game surface
-            # at the specified position
-            self.surface.blit(player_score, (30, 5))
-            # Display the computer's score text on the game surface
-            # at the specified position
-            self.surface.blit(computer_score, (config.WIDTH - 150, 5)) 
-
-            #----------------------UPDATE SURFACE---------------------------#
-            # From back buffer, update pygame display to reflect any changes
-            pygame.display.update()
-
-            # Cap game speed to 60 fps
-            self.clock.tick(60)
+#------------------------------------GAME LOOP----------------------------#
+    def game_loop(self):
+        """Infinite game loop"""
+        while True:
+            with self.profiler.phase("events"):
+                events = self.check_events()
+
+            # A replay closes the game when the log runs out
+            if self.input_log.finished():
+                self.quit()
+
+            if not self.game_over_screen.playing():
+                # Replays play again without waiting for the menu
+                if self.input_log.restart_due():
+                    self.restart()
+                else:
+                    # Crash sound or game over menu, the window stays responsive
+                    with self.profiler.phase("menu"):
+                        self.game_over_screen.update(events)
+            else:
+                self.play_frame()
+
+            # Cap drawing speed, this does not change the game speed
+            # The time tick waits is the frame's idle time
+            with self.profiler.phase("tick"):
+                self.clock.tick(config.FPS)
+
+            self.profiler.end_frame()
+
+#------------------------------PLAY FRAME------------------------------#
+    def play_frame(self):
+        """Update, draw and show one frame of the game"""
+        # Run as many fixed updates as fit in the time the last frame took
+        for _ in range(self.timestep.advance(self.clock.get_time())):
+            with self.profiler.phase("update"):
+                self.update()
+
+            # The rest of the frame's updates are dropped at game over
+            if not self.game_over_screen.playing():
+                break
+
+        with self.profiler.phase("draw"):
+            self.draw(self.timestep.alpha())
+
+            # Frame times on top of everything else
+            if self.profiler.enabled:
+                self.dirty_rects.add(self.profiler.draw(self.surface))
+
+        # From back buffer, update pygame display to reflect any changes
+        with self.profiler.phase("display"):
+            self.dirty_rects.update()
+
+        # Report the startup time and get the game over menu ready
+        # in the background once the game is on screen
+        if self.startup.first_frame():
+            startup.prewarm_menu()
+
+#------------------------------------DRAW----------------------------------#
+    def draw(self, alpha=1.0):
+        """Draw the current state of the simulation on the backbuffer
+
+        Moving objects are drawn alpha of the way from where they were
+        before the last update to where they are now.
+        """
+        # Put back the cached background, the whole window or only
+        # where things were last frame in dirty rectangle mode
+        self.dirty_rects.clear()
+
+        # Draw a rectangle for the player's paddle
+        # on the screen using Pygame's draw function
+        self.dirty_rects.add(pygame.draw.rect(
+            self.surface,           # Surface to draw on
+            config.WHITE,           # Color to draw with
+            lerp_rect(self.previous_player, self.sim.player.rect, alpha)
+        ))
+
+        # Draw a rectangle for the computer's paddle
+        # on the screen using Pygame's draw function
+        self.dirty_rects.add(pygame.draw.rect(
+            self.surface,           # Surface to draw on
+            config.WHITE,           # Color to draw with
+            lerp_rect(self.previous_computer, self.sim.computer.rect, alpha)
+        ))
+
+        # Draw ball to the backbuffer
+        self.dirty_rects.add(pygame.draw.ellipse(
+            self.surface,           # Surface to draw on
+            config.WHITE,           # Color to draw with
+            lerp_rect(self.previous_ball, self.sim.ball, alpha)
+        ))
+
+        # Render the player's score text using specified font,
+        # color, and score value
+        # The text cache only renders it again when the score changes
+        player_score = text_cache.render(self.score_font,
+            "Player:" + str(self.sim.player_score), True, config.WHITE)
+
+        # Render the computer's score text using specified font,
+        # color, and score value
+        computer_score = text_cache.render(self.score_font,
+            "Computer:" + str(self.sim.computer_score), True, config.WHITE)
+
+        # Display the player's score text on the game surface
+        # at the specified position
+        self.dirty_rects.add(self.surface.blit(player_score, (30, 5)))
+        # Display the computer's score text on the game surface
+        # at the specified position
+        self.dirty_rects.add(
+            self.surface.blit(computer_score, (config.WIDTH - 150, 5)))
+
+#----------------------------------MAKE BACKGROUND----------------------------------#
+    def make_background(self):
+        """Draw the parts of the table that never move on their own surface
+
+        The net is drawn once here instead of every frame.
+        """
+        background = pygame.Surface(self.surface.get_size()).convert()
+        background.fill(config.BLACK)
+        self.draw_net(background)
+        return background
+
+#----------------------------------REBUILD BACKGROUND----------------------------------#
+    def rebuild_background(self):
+        """Build the background again after a resize or a color change"""
+        self.dirty_rects.set_background(self.make_background())
 
 #----------------------------------DRAW NET----------------------------------#
-    def draw_net(self):
+    def draw_net(self, surface):
+        """Draw the dashed net down the middle of surface"""
         # Define the width of the net lines
         net_width = 2
 
@@ -319,7 +416,7 @@ class Pong:
 
             # Draw a rectangle representing a part of the net
             pygame.draw.rect(
-                self.surface,               # Surface to draw on
+                surface,                    # Surface to draw on
                 config.WHITE,               # Color of the rectangle (white)
                 (                           # Rectangle coordinates and size
                     # x-coordinate of the left corner of the rectangle
@@ -337,4 +434,5 @@ def main():
     # Start infinite game loop
     pong.game_loop()
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,322 @@
+"""
+Filename: pong_batch.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Run many Pong rallies at once with NumPy arrays
+"""
+
+# pip install numpy
+import numpy as np
+import config
+
+# Size of a Paddle and how far move_up and move_down move it,
+# the batch never makes pygame Rects so it can run without pygame
+PADDLE_WIDTH = 10
+PADDLE_HEIGHT = 100
+PADDLE_SPEED = 5
+
+# Paddles never move left or right
+PLAYER_X = 5
+COMPUTER_X = config.WIDTH - 15
+
+# Paddles start in the middle of the table
+PADDLE_START_Y = (config.HEIGHT - PADDLE_HEIGHT) // 2
+
+# The ball is a square BALL_RADIUS pixels wide, served from the center
+BALL_SIZE = config.BALL_RADIUS
+BALL_START_X = config.WIDTH // 2 - config.BALL_RADIUS
+BALL_START_Y = config.HEIGHT // 2 - config.BALL_RADIUS
+BALL_SPEED = 3
+
+
+class PongBatch:
+    """N independent Pong rallies advanced together one frame at a time
+
+    Every rally follows the same rules as PongSimulation.step:
+    the computer paddle's PaddleAI, the player paddle, check_collision
+    with the swept paddle bounces, then the ball moves. A rally ends when
+    the ball goes out, and the ball stays where it went out.
+
+    The computer's difficulty can be a single number for every rally or
+    an array with one number for each rally.
+    """
+
+    def __init__(self, n, seed=None,
+                 reaction_frames=config.AI_REACTION_FRAMES,
+                 max_speed=config.AI_MAX_SPEED, error=config.AI_ERROR):
+        # Number of rallies in the batch
+        self.n = n
+
+        # Random numbers for every serve and computer aim in the batch
+        self.rng = np.random.default_rng(seed)
+
+        # Computer difficulty for each rally
+        self.reaction_frames = np.broadcast_to(reaction_frames, n).astype(np.int32)
+        self.max_speed = np.broadcast_to(max_speed, n).astype(np.int32)
+        self.error = np.broadcast_to(error, n).astype(np.int32)
+
+        # Top of each paddle
+        self.player_y = np.empty(n, dtype=np.int32)
+        self.computer_y = np.empty(n, dtype=np.int32)
+
+        # Top left corner of the ball and its speed, the speed only
+        # ever changes direction
+        self.ball_x = np.empty(n, dtype=np.int32)
+        self.ball_y = np.empty(n, dtype=np.int32)
+        self.speed_x = np.empty(n, dtype=np.int32)
+        self.speed_y = np.empty(n, dtype=np.int32)
+
+        # PaddleAI for each rally: ball direction the target was worked
+        # out for (0 before the first update), the y the paddle's center
+        # moves to, how far off it aims and frames left to wait
+        self.direction_x = np.empty(n, dtype=np.int32)
+        self.direction_y = np.empty(n, dtype=np.int32)
+        self.target = np.empty(n, dtype=np.int32)
+        self.offset = np.empty(n, dtype=np.int32)
+        self.wait = np.empty(n, dtype=np.int32)
+
+        self.player_hits = np.empty(n, dtype=np.int32)
+        self.computer_hits = np.empty(n, dtype=np.int32)
+
+        # Rallies still being played and how many frames they lasted
+        self.alive = np.empty(n, dtype=bool)
+        self.frames = np.empty(n, dtype=np.int32)
+
+        self.reset()
+
+#---------------------------------RESET------------------------------------#
+    def reset(self, mask=None):
+        """Serve every rally again, or only the rallies selected by mask"""
+        if mask is None:
+            mask = np.ones(self.n, dtype=bool)
+
+        count = int(mask.sum())
+
+        self.player_y[mask] = PADDLE_START_Y
+        self.computer_y[mask] = PADDLE_START_Y
+
+        # Serve from the center, randomly left or right and up or down
+        self.ball_x[mask] = BALL_START_X
+        self.ball_y[mask] = BALL_START_Y
+        self.speed_x[mask] = self.rng.choice((-BALL_SPEED, BALL_SPEED), count)
+        self.speed_y[mask] = self.rng.choice((-BALL_SPEED, BALL_SPEED), count)
+
+        self.direction_x[mask] = 0
+        self.direction_y[mask] = 0
+        self.target[mask] = config.HEIGHT // 2
+        self.offset[mask] = 0
+        self.wait[mask] = 0
+
+        self.player_hits[mask] = 0
+        self.computer_hits[mask] = 0
+        self.alive[mask] = True
+        self.frames[mask] = 0
+
+#---------------------------------PREDICT------------------------------------#
+    def predict(self, index):
+        """Return the y of the ball's center when it reaches the computer paddle
+
+        Only the rallies in the index array are worked out. Same as
+        PaddleAI.predict: the bounces off the top and bottom walls are
+        folded in, and a ball moving away gives the middle of the table.
+        """
+        speed_x = self.speed_x[index]
+        distance = COMPUTER_X - (self.ball_x[index] + BALL_SIZE)
+        coming = (speed_x > 0) & (distance >= 0)
+
+        # Where the ball's top would be with no walls, then folded back
+        # between 0 and span like it bounces
+        y = self.ball_y[index] \
+            + self.speed_y[index] * distance / np.abs(speed_x)
+        span = config.HEIGHT - BALL_SIZE
+        y = np.mod(y, 2 * span)
+        y = np.where(y > span, 2 * span - y, y)
+
+        return np.where(
+            coming, np.rint(y).astype(np.int32) + BALL_SIZE // 2,
+            config.HEIGHT // 2)
+
+#---------------------------------MOVE COMPUTER------------------------------------#
+    def move_computer(self, alive):
+        """Move each computer paddle one update, like PaddleAI.update"""
+        sign_x = np.sign(self.speed_x)
+        sign_y = np.sign(self.speed_y)
+
+        # A new shot aims a little off and waits before reacting,
+        # a wall bounce only works out the target again
+        turned = alive & (sign_x != self.direction_x)
+        new_shot = alive & (turned | (sign_y != self.direction_y))
+
+        count = int(turned.sum())
+        if count:
+            self.wait[turned] = self.reaction_frames[turned]
+            error = self.error[turned]
+            self.offset[turned] = self.rng.integers(-error, error + 1, count)
+
+        self.direction_x[new_shot] = sign_x[new_shot]
+        self.direction_y[new_shot] = sign_y[new_shot]
+
+        # Only a few rallies change direction each frame
+        index = np.flatnonzero(new_shot)
+        self.target[index] = self.predict(index) + self.offset[index]
+
+        waiting = alive & (self.wait > 0)
+        self.wait -= waiting
+
+        # Paddle.move_toward, then stay on the table
+        moving = alive & ~waiting
+        distance = self.target - (self.computer_y + PADDLE_HEIGHT // 2)
+        distance = np.clip(distance, -self.max_speed, self.max_speed)
+        self.computer_y = np.where(
+            moving,
+            np.clip(self.computer_y + distance, 0, config.HEIGHT - PADDLE_HEIGHT),
+            self.computer_y).astype(np.int32)
+
+#---------------------------------MOVE PLAYER------------------------------------#
+    def move_player(self, alive, up, down):
+        """Move each player paddle like Paddle.move_up and Paddle.move_down"""
+        move_up = alive & up & (self.player_y > 0)
+        self.player_y -= np.where(move_up, PADDLE_SPEED, 0).astype(np.int32)
+
+        move_down = alive & down \
+            & (self.player_y < config.HEIGHT - PADDLE_HEIGHT)
+        self.player_y += np.where(move_down, PADDLE_SPEED, 0).astype(np.int32)
+
+#---------------------------------BOUNCE OFF------------------------------------#
+    def bounce_off(self, check, paddle_x, paddle_y):
+        """Bounce the balls whose next move hits the paddle, return the hits
+
+        The same slab test as sweep_rect: the paddle is grown by the size
+        of the ball and the ball's top left corner is a ray moving by its
+        speed. The ball's speed is never 0 on either axis.
+        """
+        hit = np.zeros(self.n, dtype=bool)
+
+        # Sides of the grown paddle
+        left = paddle_x - BALL_SIZE
+        right = paddle_x + PADDLE_WIDTH
+
+        # Only balls within one move of the paddle on x can reach it,
+        # the rest are skipped before any dividing
+        index = np.flatnonzero(
+            check & (self.ball_x >= left - BALL_SPEED)
+            & (self.ball_x <= right + BALL_SPEED))
+        if len(index) == 0:
+            return hit
+
+        ball_x = self.ball_x[index]
+        ball_y = self.ball_y[index]
+        speed_x = self.speed_x[index]
+        speed_y = self.speed_y[index]
+        top = paddle_y[index] - BALL_SIZE
+        bottom = paddle_y[index] + PADDLE_HEIGHT
+
+        # Time the ball crosses the near and far side on each axis
+        moving_right = speed_x > 0
+        near_x = (np.where(moving_right, left, right) - ball_x) / speed_x
+        far_x = (np.where(moving_right, right, left) - ball_x) / speed_x
+
+        moving_down = speed_y > 0
+        near_y = (np.where(moving_down, top, bottom) - ball_y) / speed_y
+        far_y = (np.where(moving_down, bottom, top) - ball_y) / speed_y
+
+        # The last axis to be entered is the side that gets hit, the side
+        # always faces the ball so a ball inside is never moving out of it
+        t_enter = np.maximum(near_x, near_y)
+        t_exit = np.minimum(far_x, far_y)
+        hits = (t_enter < t_exit) & (t_exit > 0) & (t_enter <= 1)
+
+        # Mirror the ball's start across the side it hits, so after
+        # the move it ends up exactly where the bounce would put it
+        time = np.maximum(t_enter, 0.0)
+        side = hits & (near_y <= near_x)
+        end = hits & (near_y > near_x)
+
+        self.ball_x[index] += np.where(
+            side, np.rint(2 * speed_x * time), 0).astype(np.int32)
+        self.speed_x[index] = np.where(side, -speed_x, speed_x)
+        self.ball_y[index] += np.where(
+            end, np.rint(2 * speed_y * time), 0).astype(np.int32)
+        self.speed_y[index] = np.where(end, -speed_y, speed_y)
+
+        hit[index] = hits
+        return hit
+
+#---------------------------------STEP------------------------------------#
+    def step(self, up, down):
+        """Advance every live rally one frame
+
+        up and down are boolean arrays with the key state of each player
+        paddle. Returns a boolean array of the rallies that ended.
+        """
+        alive = self.alive
+
+        self.move_computer(alive)
+        self.move_player(alive, up, down)
+
+        #------------------CHECK COLLISION------------------#
+        # Ball goes off the left or right side of the table
+        died = alive & ((self.ball_x < 0)
+                        | (self.ball_x + BALL_SIZE >= config.WIDTH))
+        self.alive &= ~died
+        alive = self.alive
+
+        # Top or bottom wall
+        wall = alive & ((self.ball_y < 0)
+                        | (self.ball_y + BALL_SIZE >= config.HEIGHT))
+        self.speed_y[wall] *= -1
+
+        # A ball that hits the player paddle isn't checked
+        # against the computer paddle in the same frame
+        player_hit = self.bounce_off(alive, PLAYER_X, self.player_y)
+        computer_hit = self.bounce_off(
+            alive & ~player_hit, COMPUTER_X, self.computer_y)
+        self.player_hits += player_hit
+        self.computer_hits += computer_hit
+
+        #------------------MOVE BALL------------------#
+        self.ball_x += np.where(alive, self.speed_x, 0).astype(np.int32)
+        self.ball_y += np.where(alive, self.speed_y, 0).astype(np.int32)
+        self.frames += alive
+
+        return died
+
+#---------------------------------OBSERVE------------------------------------#
+    def observe(self):
+        """Return an (n, 5) float array describing each rally for a controller
+
+        Columns are the player paddle's center, the ball's center x and y,
+        and the ball's speed on x and y.
+        """
+        return np.stack(
+            (
+                self.player_y + PADDLE_HEIGHT // 2,
+                self.ball_x + BALL_SIZE // 2,
+                self.ball_y + BALL_SIZE // 2,
+                self.speed_x,
+                self.speed_y,
+            ),
+            axis=1,
+        ).astype(np.float64)
+
+#---------------------------------RUN------------------------------------#
+    def run(self, controller=None, max_frames=100_000):
+        """Play until every rally ends or max_frames pass
+
+        controller is called with the batch every frame and returns the
+        (up, down) arrays, with no controller the player paddle stays put.
+        Returns the number of paddle hits in each rally, like
+        PongSimulation.rally.
+        """
+        still = np.zeros(self.n, dtype=bool)
+
+        for _ in range(max_frames):
+            if not self.alive.any():
+                break
+
+            if controller is None:
+                self.step(still, still)
+            else:
+                self.step(*controller(self))
+
+        return self.player_hits + self.computer_hits
@@ -0,0 +1,198 @@
+"""
+Filename: pong_sim.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Pong game rules without a window, mixer, or clock
+"""
+
+# pip install pygame-ce
+
+# Only pygame.Rect is used here, it works without pygame.init()
+import pygame
+import os
+import sys
+from random import Random
+import config
+from paddle import Paddle
+from computer_ai import PaddleAI
+
+# The shared modules live one folder up from this game
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.collision import sweep_rect
+
+# Events returned by the simulation each time it is stepped
+NO_EVENT = 0
+PLAYER_HIT = 1
+COMPUTER_HIT = 2
+BALL_OUT = 3
+
+
+class PongSimulation:
+    """Ball, paddles and score of one Pong game, stepped one frame at a time"""
+
+    def __init__(self, seed=None):
+        # Each simulation owns its random numbers so games can be repeated
+        self.random = Random(seed)
+        self.reset()
+
+#-------------------------------RESET-------------------------------#
+    def reset(self):
+        """Put the paddles, ball and score back to the start of a game"""
+        # Set up player paddles
+        self.player = Paddle(
+            5,                              # x coordinate
+            (config.HEIGHT - 100) // 2      # y coordinate
+        )
+
+        self.computer = Paddle(
+            config.WIDTH - 15,              # x coordinate
+            (config.HEIGHT - 100) // 2      # y coordinate
+        )
+
+        # Moves the computer paddle to where the ball is going
+        self.computer_ai = PaddleAI(self.computer, self.random)
+
+        self.player_score = 0
+        self.computer_score = 0
+
+        # Set to True when the ball leaves the table
+        self.game_over = False
+
+        self.serve()
+
+#-------------------------------SERVE-------------------------------#
+    def serve(self):
+        """Place the ball in the center of the table moving in a random direction"""
+        # Create the ball rectangle object
+        self.ball = pygame.Rect(
+            config.WIDTH // 2 - config.BALL_RADIUS,             # Set x- coordinate
+            config.HEIGHT // 2 - config.BALL_RADIUS,            # Set y- coordinate
+            config.BALL_RADIUS,                                 # Set width of ball
+            config.BALL_RADIUS                                  # Set height of ball
+        )
+
+        self.set_ball_direction()
+
+        # A new ball, the computer works out where it goes again
+        self.computer_ai.reset()
+
+#------------------------------SET BALL DIRECTION----------------------#
+    def set_ball_direction(self):
+        """Set initial ball direction along the x and y axis"""
+        # Randomly move the ball to the right (0) or left (1)
+        if self.random.randint(0, 1) == 0:
+            self.ball_speed_x = 3
+        else:
+            self.ball_speed_x = -3
+
+        # Randomly move the ball down (0) or up (1)
+        if self.random.randint(0, 1) == 0:
+            self.ball_speed_y = 3
+        else:
+            self.ball_speed_y = -3
+
+#------------------------------MOVE COMPUTER----------------------------#
+    def move_computer(self):
+        """Move the computer paddle one frame toward where the ball is going"""
+        self.computer_ai.update(self.ball, self.ball_speed_x, self.ball_speed_y)
+
+#------------------------------MOVE PLAYER----------------------------#
+    def move_player(self, up, down):
+        """Move the player paddle from the state of the up and down keys"""
+        if up:
+            self.player.move_up()
+
+        if down:
+            self.player.move_down()
+
+#------------------------------CHECK COLLISION----------------------------#
+    def check_collision(self):
+        """Check for all collisions, return the event that happened"""
+        # Ball goes off the left or right side of the table
+        if self.ball.left < 0 or self.ball.right >= config.WIDTH:
+            self.game_over = True
+            return BALL_OUT
+
+        # Check for collision with top or bottom wall
+        if self.ball.top < 0 or self.ball.bottom >= config.HEIGHT:
+            # Reverse y direction multiply by -1
+            self.ball_speed_y = self.ball_speed_y * -1
+
+        # Ball collisions with paddles, checked along the whole move
+        # the ball is about to make so a fast ball can't pass through
+        if self.bounce_off(self.player.rect):
+            self.player_score += 1
+            return PLAYER_HIT
+
+        if self.bounce_off(self.computer.rect):
+            self.computer_score += 1
+            return COMPUTER_HIT
+
+        return NO_EVENT
+
+#------------------------------BOUNCE OFF----------------------------#
+    def bounce_off(self, paddle):
+        """Bounce the ball if its next move hits the paddle, return True on a hit"""
+        velocity = (self.ball_speed_x, self.ball_speed_y)
+        contact = sweep_rect(self.ball, velocity, paddle)
+
+        if contact is None:
+            return False
+
+        normal_x, normal_y = contact.normal
+
+        # Ignore a ball that is already inside the paddle and moving out
+        if normal_x * velocity[0] + normal_y * velocity[1] > 0:
+            return False
+
+        # Mirror the ball's start across the side it hits, so after
+        # move_ball it ends up exactly where the bounce would put it
+        if normal_y == 0:
+            self.ball.x += round(2 * self.ball_speed_x * contact.time)
+            self.ball_speed_x *= -1
+        else:
+            self.ball.y += round(2 * self.ball_speed_y * contact.time)
+            self.ball_speed_y *= -1
+
+        return True
+
+#------------------------------MOVE BALL----------------------------#
+    def move_ball(self):
+        """Move the ball position one frame"""
+        self.ball.x += self.ball_speed_x
+        self.ball.y += self.ball_speed_y
+
+#------------------------------STEP----------------------------#
+    def step(self, up=False, down=False):
+        """Advance the game one frame, return the event that happened"""
+        self.move_computer()
+        self.move_player(up, down)
+        event = self.check_collision()
+        self.move_ball()
+        return event
+
+#------------------------------RALLY----------------------------#
+    def rally(self, controller=None, max_frames=100_000):
+        """Play from a new serve until the ball goes out
+
+        controller is called with the simulation every frame and returns
+        the (up, down) key state for the player paddle.
+        Returns the number of paddle hits in the rally.
+        """
+        self.serve()
+        self.game_over = False
+        hits = 0
+
+        for _ in range(max_frames):
+            if controller is None:
+                event = self.step()
+            else:
+                event = self.step(*controller(self))
+
+            if event == BALL_OUT:
+                break
+
+            if event != NO_EVENT:
+                hits += 1
+
+        return hits
@@ -12,4 +12,8 @@ HEIGHT = 675
 # RGB constant for Cougar Gold
 COUGAR_GOLD = (249, 190, 0)
 
+# Frames drawn per second, 0 draws as fast as the computer can
+FPS = 60
 
+# Game updates per second, every speed in the game is pixels per update
+UPDATES_PER_SECOND = 60
@@ -5,17 +5,37 @@ Created: 04/26/2024
 Purpose: Finishing up
 """
 
+# Taken first so the startup report includes the imports
+from time import perf_counter
+IMPORT_START = perf_counter()
+
 # pip install pygame-ce
 # Import pygame library
 import pygame
-import pygame_menu as pm
-from random import randint
 # Import exit for clean program shutdown
 from sys import exit
+import os
+import sys
 import config
 
+# The shared modules live one folder up from this game
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.assets import asset_cache
+from shared.game_over import GameOverScreen
+from shared import dirty
+from shared import profiler
+from shared import replay
+from shared import sfx
+from shared import startup
+from shared.text import text_cache
+from shared.timestep import FixedTimestep, lerp_rect
+from shared.collision import sweep_rect
+
 class TractorPong:
     def __init__(self):
+        # Time each part of startup, STARTUP_REPORT=1 prints it
+        self.startup = startup.StartupTimer(IMPORT_START, startup.enabled())
+
         # Initialize mixer with larger buffer size for better performance
         pygame.mixer.pre_init(
             44100,          # frequency (Hz)
@@ -24,34 +44,107 @@ class TractorPong:
             4096            # buffer size, larger to optimize music playback
         )
 
-        # Initialize the Pygame engine
-        pygame.init()
+        # Start only the display, font and mixer parts of the Pygame engine
+        with self.startup.stage("init"):
+            startup.init_pygame()
 
-        # Create the game surface (window)
-        self.surface = pygame.display.set_mode(
-            (config.WIDTH, config.HEIGHT)
-        )
+        with self.startup.stage("display"):
+            # Create the game surface (window)
+            self.surface = pygame.display.set_mode(
+                (config.WIDTH, config.HEIGHT)
+            )
 
-        # Set window caption
-        pygame.display.set_caption("Tractor Pong")
+            # Set window caption
+            pygame.display.set_caption("Tractor Pong")
 
-        # Set up computer control clock object to control the speed of the game
+        # Cut every image out of one sheet if build_assets.py made one
+        with self.startup.stage("assets"):
+            asset_cache.load_atlas("./assets/atlas.json")
+
+        # Set up computer control clock object to measure each frame
         self.clock = pygame.time.Clock()
 
+        # The game moves in fixed updates, however fast frames are drawn
+        self.timestep = FixedTimestep(config.UPDATES_PER_SECOND)
+
+        # Keys are read through the input log so a game can be recorded
+        # and replayed, RECORD_INPUT / REPLAY_INPUT turn that on
+        self.input_log = replay.from_environment()
+        if self.input_log.fast:
+            self.clock = replay.FastClock(self.timestep)
+
+        # Every random number comes from here, seeded from the input log
+        self.random = self.input_log.random()
+
         self.load_assets()
 
+        # Optional dirty rectangle mode, only redraws what moved
+        self.dirty_rects = dirty.DirtyRects(
+            self.surface, self.make_background(), dirty.enabled())
+
+        # Time spent in each part of the game loop, F3 shows it
+        self.profiler = profiler.FrameProfiler(profiler.enabled())
+
+        # Crash sound and game over menu without blocking the game loop
+        self.game_over_screen = GameOverScreen(
+            self.surface, self.build_game_over_menu
+        )
+
+        self.reset()
+
 #------------------------------LOAD ASSETS-------------------------------#
     def load_assets(self):
-        # Load png impge, use as program icon
-        self.ball_ico = pygame.image.load("./assets/soccer_ball.png").convert_alpha()
-        pygame.display.set_icon(self.ball_ico)
+        with self.startup.stage("assets"):
+            # Load png impge, use as program icon
+            self.ball_ico = asset_cache.image("./assets/soccer_ball.png")
+            pygame.display.set_icon(self.ball_ico)
+
+            # Load the images from the asset cache into a variable
+            # The ball is the same image as the icon, so it is not read again
+            self.ball = asset_cache.image("./assets/soccer_ball.png")
+            self.tractor = asset_cache.image("./assets/green_tractor.png")
+
+            # Sound effects are loaded once and played on channels kept
+            # for them, volume is in range 0.0 to 1.0
+            self.sfx = sfx.SoundEffects()
+            self.sfx.load("ball_hit", "./assets/ball.mp3", voices=2)
+            self.sfx.load("game_over", "./assets/tractor_driving_game_over.wav",
+                          volume=.5, priority=1)
+
+            # Load background music file, set volume to 30%,
+            # range from 0.0 (mute) to 1.0 (full volume)
+            self.sfx.load_music("./assets/tractor_driving.wav", volume=0.3)
+
+        # Create font for scoring
+        with self.startup.stage("font"):
+            self.font_score = pygame.font.SysFont("Veranda", 20)
 
-        # Load the images from the file system into a variable
-        self.ball = pygame.image.load(
-            "assets/soccer_ball.png").convert_alpha()
-        self.tractor = pygame.image.load(
-            "assets/green_tractor.png").convert_alpha()
-        
+        # Only allow these events to be captured
+        # This helps optimize the game for slower computers
+        pygame.event.set_allowed(
+            [
+                pygame.QUIT,
+                pygame.KEYDOWN,
+                pygame.KEYUP,
+                pygame.VIDEORESIZE,
+            ]
+        )
+
+#-----------------------------MAKE BACKGROUND-----------------------------#
+    def make_background(self):
+        """Create the field the ball and tractor are drawn on"""
+        background = pygame.Surface(self.surface.get_size()).convert()
+        background.fill(config.COUGAR_GOLD)
+        return background
+
+#-----------------------------REBUILD BACKGROUND-----------------------------#
+    def rebuild_background(self):
+        """Build the background again after a resize or a color change"""
+        self.dirty_rects.set_background(self.make_background())
+
+#-------------------------------RESET-------------------------------#
+    def reset(self):
+        """Start a new game, the window, images and sounds stay loaded"""
         # Create a rectangle the same size as the image
         # rect is used to set the location of the image
         self.ball_rect = self.ball.get_rect()
@@ -63,6 +156,7 @@ class TractorPong:
         # Initial position of the ball rectangle x random, y/top = 10
         self.set_ball_location()
         self.ball_rect.y = 10
+        self.ball_start = self.ball_rect.copy()
 
         # Ball speed in pixels for x, y
         self.set_ball_direction()
@@ -75,64 +169,147 @@ class TractorPong:
         # Keep track of score
         self.score = 0
 
-        self.ball_hit = pygame.mixer.Sound("./assets/ball.mp3")
-        self.game_over_snd = pygame.mixer.Sound("./assets/tractor_driving_game_over.wav")
+        self.save_positions()
 
-        # Set volume for sound effect in range 0.0 to 1.0
-        pygame.mixer.Sound.set_volume(self.game_over_snd, .5)
+        # Don't count the time spent in the game over menu
+        self.timestep.reset()
+        self.clock.tick()
 
-        # Load and play back background music
-        pygame.mixer.music.load("./assets/tractor_driving.wav")
+        # The game over menu covered the whole window
+        self.dirty_rects.invalidate()
 
-        # Set volume to 30%, range from 0.0 (mute) to 1.0 (full volume)
-        pygame.mixer.music.set_volume(0.3)
-
-        # Stop any other music from playing
-        pygame.mixer.stop()
+        # Stop any other sound from playing,
+        # including the looping game over sound
+        self.sfx.stop()
 
         # Play background game music in continuous loop from the beginning
-        pygame.mixer.music.play(-1)
-
-        # Create font for scoring
-        self.font_score = pygame.font.SysFont("Veranda", 20)
+        self.sfx.play_music()
+
+#------------------------------RESTART------------------------------#
+    def restart(self):
+        """Close the game over menu and play again in the same window"""
+        self.game_over_screen.close()
+        self.input_log.restarted()
+        self.reset()
+
+#------------------------------RESUME------------------------------#
+    def resume(self):
+        """Take the window and music back after the launcher ran another game
+
+        Images, sounds and fonts are still loaded, only the things every
+        game shares are set up again.
+        """
+        pygame.display.set_mode((config.WIDTH, config.HEIGHT))
+        pygame.display.set_caption("Tractor Pong")
+        pygame.display.set_icon(self.ball_ico)
 
-        # Only allow these events to be captured
-        # This helps optimize the game for slower computers
-        pygame.event.set_allowed(
-            [
-                pygame.QUIT,
-                pygame.KEYDOWN,
-                pygame.KEYUP,
-            ]
-        )
+        self.sfx.load_music("./assets/tractor_driving.wav", volume=0.3)
 
+        if self.game_over_screen.playing():
+            # Carry on where the game was left, without catching up
+            # on the time spent in the other game
+            self.timestep.reset()
+            self.clock.tick()
+            self.dirty_rects.invalidate()
+            self.sfx.play_music()
+        else:
+            # Left from the game over screen, start a new game
+            self.restart()
+
+#------------------------------QUIT------------------------------#
+    def quit(self):
+        """Close the game, the launcher replaces this to go back to its menu"""
+        # Quit pygame
+        pygame.quit()
+        # Exit Python
+        exit()
+
+#--------------------------------SAVE POSITIONS---------------------------#
+    def save_positions(self):
+        """Remember where the ball and tractor are before they move"""
+        self.previous_ball = self.ball_rect.copy()
+        self.previous_tractor = self.tractor_rect.copy()
+
+#--------------------------------UPDATE---------------------------#
+    def update(self):
+        """Move everything one fixed update"""
+        self.save_positions()
+        self.update_tractor()
+        self.update_ball()
+
+        with self.profiler.phase("collision"):
+            self.check_collision()
 
 #--------------------------------GAME LOOP---------------------------#
     def game_loop(self):
         """Infinite game loop"""
         while True:
-            self.check_events()
-            self.update_tractor()
-            self.update_ball()
-            self.check_collision()
-            self.draw()
-
-            # Cap game speed to 60 fps
-            self.clock.tick(60)
+            with self.profiler.phase("events"):
+                events = self.check_events()
+
+            # A replay closes the game when the log runs out
+            if self.input_log.finished():
+                self.quit()
+
+            if not self.game_over_screen.playing():
+                # Replays play again without waiting for the menu
+                if self.input_log.restart_due():
+                    self.restart()
+                else:
+                    # Crash sound or game over menu, the window stays responsive
+                    with self.profiler.phase("menu"):
+                        self.game_over_screen.update(events)
+            else:
+                self.play_frame()
+
+            # Cap drawing speed, this does not change the game speed
+            # The time tick waits is the frame's idle time
+            with self.profiler.phase("tick"):
+                self.clock.tick(config.FPS)
+
+            self.profiler.end_frame()
+
+#------------------------------PLAY FRAME------------------------------#
+    def play_frame(self):
+        """Update, draw and show one frame of the game"""
+        # Run as many fixed updates as fit in the time the last frame took
+        for _ in range(self.timestep.advance(self.clock.get_time())):
+            with self.profiler.phase("update"):
+                self.update()
+
+            # The rest of the frame's updates are dropped at game over
+            if not self.game_over_screen.playing():
+                break
+
+        with self.profiler.phase("draw"):
+            self.draw(self.timestep.alpha())
+
+            # Frame times on top of everything else
+            if self.profiler.enabled:
+                self.dirty_rects.add(self.profiler.draw(self.surface))
+
+        # From back buffer, update pygame display to reflect any changes
+        with self.profiler.phase("display"):
+            self.dirty_rects.update()
+
+        # Report the startup time and get the game over menu ready
+        # in the background once the game is on screen
+        if self.startup.first_frame():
+            startup.prewarm_menu()
 
 #-------------------------------SET BALL LOCATION--------------------#
     def set_ball_location(self):
         """Set random initial ball direction along the x axis"""
         # Randomly determine the initial x coordinate of the ball
         # along the x-axis (left or right)
-        self.ball_rect.x = randint(20, config.WIDTH - 20)
+        self.ball_rect.x = self.random.randint(20, config.WIDTH - 20)
 
 #-------------------------SET BALL DIRECTION---------------------------#
     def set_ball_direction(self):
         """Set random initial ball direction along the x axis"""
         # Randomly determine the initial direction of the ball
         # along the x-axis (left or right)
-        ball_direction_x = randint(0, 1)
+        ball_direction_x = self.random.randint(0, 1)
 
         # If the randomly chosen direction is 0 (left),
         # set the horizontal speed of the ball to move to the right
@@ -147,7 +324,8 @@ class TractorPong:
 #--------------------------CHECK EVENTS-----------------------------#
     def check_events(self):
         """Listen for and handle all program events"""
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
 
             # Closing the game causes the QUIT event to be fired
             if event.type == pygame.QUIT:
@@ -156,14 +334,32 @@ class TractorPong:
                 # Exit Python
                 exit()
 
+            # Build the background again if the window changes size
+            elif event.type == pygame.VIDEORESIZE:
+                self.rebuild_background()
+
+            # F3 turns the frame profiler on and off
+            self.profiler.handle_event(event)
+
+        # The game over menu needs the events too
+        return events
+
 #---------------------------------DISPLAY GAME OVER----------------------------------#
     def game_over(self):
-        """Display game over on top of the stopped game"""
+        """Stop the game and start the game over screen, the game loop keeps running"""
         # Stop background sound
-        pygame.mixer.music.stop()
+        self.sfx.stop_music()
 
-        # Play game_over music until user clicks a button
-        pygame.mixer.Sound.play(self.game_over_snd, loops=-1)
+        # Play game_over music until user clicks a button,
+        # the menu opens right away
+        self.game_over_screen.start(
+            lambda: self.sfx.play("game_over", loops=-1), 0)
+
+#---------------------------BUILD GAME OVER MENU--------------------------#
+    def build_game_over_menu(self):
+        """Create the game over menu using the Pygame Menu library"""
+        # pygame_menu is imported the first time it is needed
+        pm = startup.load_menu()
 
         # Define a meny object for the game over screen
         game_over = pm.Menu(
@@ -183,7 +379,7 @@ class TractorPong:
         # Add a button to the game over menu for exiting the game
         game_over.add.button(
             title="Play Again?",            # Button text
-            action=main                     # Call main() to start over
+            action=self.restart             # Play again in the same window
         )
 
         # Add a label to provide space between buttons
@@ -192,27 +388,36 @@ class TractorPong:
         # Add a button to the game over menu for exiting the game
         game_over.add.button(
             title="Exit",            # Button text
-            action=pm.events.EXIT    # Exit the game when clicked
+            action=self.quit         # Exit the game when clicked
         )
 
-        # Run the main loop of the game over menu on the specified surface
-        game_over.mainloop(self.surface)
+        return game_over
 
 #---------------------CHECK COLLISION-------------------#
     def check_collision(self):
-        """Check for collision between to rects"""
-        # The ball has to be above the tractor to collide
-        # Does the ball collide with the tractor?
+        """Check for collision between the ball and the tractor"""
+        # Check the whole move the ball made this frame, not only where
+        # it ended up, so a fast ball can't pass through the tractor
+        move = (
+            self.ball_rect.x - self.ball_start.x,
+            self.ball_rect.y - self.ball_start.y
+        )
+        contact = sweep_rect(self.ball_start, move, self.tractor_rect)
+
+        # The ball has to come down onto the top of the tractor to bounce
         # If so, reverse the ball y direction [1]
-        if self.tractor_rect.colliderect(
-            self.ball_rect
-        ) and self.ball_rect.bottom < self.tractor_rect.top + 4:
-            
+        if contact is not None and contact.normal == (0, -1) \
+                and self.speed_y > 0:
+
+            # Put the ball on top of the tractor where it hit
+            self.ball_rect.x = self.ball_start.x + round(move[0] * contact.time)
+            self.ball_rect.bottom = self.tractor_rect.top
+
             # Reverse y direction
             self.speed_y = self.speed_y * -1
 
             # Randomly change x direction
-            direction = randint(0, 1)
+            direction = self.random.randint(0, 1)
             if direction == 0:
                 self.speed_x = self.speed_x * -1
 
@@ -222,12 +427,18 @@ class TractorPong:
 
             # Increase score by 1
             self.score = self.score + 1
-            pygame.mixer.Sound(self.ball_hit)
+
+            # Play the ball bounce sound
+            self.sfx.play("ball_hit")
+
+        # Ball hits bottom, player loses
+        elif self.ball_rect.bottom > config.HEIGHT:
+            self.game_over()
 
 #---------------------UPDATE TRACTOR-------------------#
     def update_tractor(self):
         # Capture key pressed events into a list
-        keys = pygame.key.get_pressed()
+        keys = self.input_log.get_pressed()
 
         # Check if the left arrow key is pressed
         if keys[pygame.K_LEFT]:
@@ -245,10 +456,7 @@ class TractorPong:
 
         # The ESC key will quit the game
         if keys[pygame.K_ESCAPE]:
-            # Quit Pygame
-            pygame.quit()
-            # Exit Python
-            exit()
+            self.quit()
 
 #------------------------UPDATE BALL-----------------------------#
     def update_ball(self):
@@ -262,53 +470,55 @@ class TractorPong:
             # Reverse y direction multiply by -1
             self.speed_y = self.speed_y * -1
 
+        # Remember where the ball started for check_collision
+        self.ball_start = self.ball_rect.copy()
+
         # Move ball position every frame
         self.ball_rect.x = self.ball_rect.x + self.speed_x
         self.ball_rect.y = self.ball_rect.y + self.speed_y
 
-        # Ball hits bottom, player loses
-        if self.ball_rect.bottom > config.HEIGHT:
-            self.game_over()
-
 #------------------------------DRAW--------------------------------#
-    def draw(self):
-        """Draw everything onto the backbuffer"""
-        # Fill the display surface to clear the previous screen
-        # Comment out this line to see why it is necessary
-        self.surface.fill(config.COUGAR_GOLD)
+    def draw(self, alpha=1.0):
+        """Draw everything onto the backbuffer
+
+        The ball and tractor are drawn alpha of the way from where they
+        were before the last update to where they are now.
+        """
+        # Put back the cached background, the whole window or only
+        # where things were last frame in dirty rectangle mode
+        self.dirty_rects.clear()
 
         # Draw the ball on the surface
-        self.surface.blit(
+        self.dirty_rects.add(self.surface.blit(
             self.ball,             # Image to draw
-            self.ball_rect         # Location to draw the image
-        )
-        
+            lerp_rect(self.previous_ball, self.ball_rect, alpha)
+        ))
+
         # Draw the tractor on the backbuffer
-        self.surface.blit(
+        self.dirty_rects.add(self.surface.blit(
             self.tractor,           # Image to draw
-            self.tractor_rect       # Locaton to draw the image
-        )
+            lerp_rect(self.previous_tractor, self.tractor_rect, alpha)
+        ))
 
         # Render score before drawing it on the surface
-        score_display = self.font_score.render(
+        # The text cache only renders it again when the score changes
+        score_display = text_cache.render(
+            self.font_score,        # Font
             f"{self.score}",        # Score
             True,                   # Antialiasing true
             "black"                 # Font color
         )
 
         # Draw score on the surface
-        self.surface.blit(score_display, (10, 10))
-
-        #-----------COPY BACKBUFFER INTO VIDEO MEMORY--------------#
-        # Copy the backbuffer into video memory
-        pygame.display.update()
+        self.dirty_rects.add(self.surface.blit(score_display, (10, 10)))
 
 def main():
     # Initialize program object and start game
     tractor_pong = TractorPong()
     tractor_pong.game_loop()
 
-main()
+if __name__ == "__main__":
+    main()
 
 
 
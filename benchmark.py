@@ -0,0 +1,336 @@
+"""
+Filename: benchmark.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Run every game headless with scripted keys and report how fast it runs
+
+    python benchmark.py                         Run all games, print JSON
+    python benchmark.py --frames 2000 pong      Run only Pong for 2000 frames
+    python benchmark.py --output result.json    Save the results
+    python benchmark.py --save-baseline base.json
+    python benchmark.py --baseline base.json    Exit 1 if anything got slower
+
+Each game runs in its own process, because every game folder has its own
+config module, with the dummy SDL video and audio drivers. The clock does
+not wait between frames and every frame runs exactly one fixed update, so
+the same keys always play the same game. A game over restarts right away.
+"""
+
+# Taken first so startup includes importing pygame and the game
+from time import perf_counter
+START = perf_counter()
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+
+# resource is not available on Windows, peak RSS is left out there
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Folder this file is in, the game folders are next to it
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Game name -> folder, module and class
+GAMES = {
+    "pong": ("Pong", "pong", "Pong"),
+    "car_crash": ("Car Crash", "car_crash", "CarCrash"),
+    "flappy_bird": ("Flappy Bird", "flappy_bird", "FlappyBird"),
+    "tractor_pong": ("Tractor Pong", "tractor_pong", "TractorPong"),
+}
+
+# Keys held down by each game, (frames, key names) repeated over and over
+SCRIPTS = {
+    "pong": [(40, ["K_UP"]), (40, ["K_DOWN"])],
+    "car_crash": [(30, ["K_LEFT"]), (30, ["K_RIGHT"])],
+    "flappy_bird": [(6, ["K_UP"]), (10, [])],
+    "tractor_pong": [(50, ["K_LEFT"]), (50, ["K_RIGHT"])],
+}
+
+DEFAULT_FRAMES = 1000
+
+# How much worse than the baseline each result can be before it fails,
+# 0.10 is 10%. fps fails if it is lower, the rest if they are higher.
+THRESHOLDS = {
+    "fps": 0.10,
+    "frame_ms_p99": 0.20,
+    "startup_ms": 0.20,
+    "peak_rss_mb": 0.10,
+}
+HIGHER_IS_BETTER = {"fps"}
+
+
+#------------------------------PERCENTILE------------------------------#
+def percentile(values, p):
+    """Return the p-th percentile (0 to 100) of values, nearest rank"""
+    ordered = sorted(values)
+    rank = round(p / 100 * (len(ordered) - 1))
+    return ordered[rank]
+
+
+#------------------------------PEAK RSS------------------------------#
+def peak_rss_mb():
+    """Return the most memory this process has used in MB, or None"""
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports KB, macOS reports bytes
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+class StopBenchmark(Exception):
+    """Raised by the clock to leave the game's infinite loop"""
+
+
+class ScriptedKeys:
+    """Stands in for pygame.key.get_pressed(), holds the scripted keys"""
+
+    def __init__(self, script):
+        import pygame
+
+        # Expand the script into one set of key codes per step
+        self.steps = []
+        for frames, names in script:
+            keys = {getattr(pygame, name) for name in names}
+            self.steps += [keys] * frames
+
+        self.frame = 0
+
+    def __getitem__(self, key):
+        return key in self.steps[self.frame % len(self.steps)]
+
+    def get_pressed(self):
+        return self
+
+
+class BenchmarkClock:
+    """Replaces the game's clock
+
+    tick() never waits and records how long each frame took.
+    get_time() always returns one fixed update so every frame runs exactly
+    one update no matter how fast the machine is.
+    """
+
+    def __init__(self, game, keys, frames):
+        self.game = game
+        self.keys = keys
+        self.frames = frames
+
+        self.frame_ms = []
+        self.restarts = 0
+        self.restarting = False
+        self.first_frame = None
+        self.last = perf_counter()
+
+    def tick(self, framerate=0):
+        # reset() ticks the clock too, that is not a frame
+        if self.restarting:
+            return 0
+
+        now = perf_counter()
+        if self.first_frame is None:
+            self.first_frame = now
+
+            # The game imports pygame_menu on a thread after its first
+            # frame, finish that here so it isn't in the frame times
+            import pygame_menu
+            now = perf_counter()
+        else:
+            self.frame_ms.append((now - self.last) * 1000)
+        self.last = now
+
+        # Skip the crash sound and menu, start playing again
+        if not self.game.game_over_screen.playing():
+            self.restarts += 1
+            self.restarting = True
+            self.game.restart()
+            self.restarting = False
+
+        self.keys.frame += 1
+        if len(self.frame_ms) >= self.frames:
+            raise StopBenchmark
+        return 0
+
+    def get_time(self):
+        return self.game.timestep.step_ms
+
+    def get_fps(self):
+        return 0.0
+
+
+#------------------------------RUN GAME------------------------------#
+def run_game(name, frames):
+    """Play one game in this process and return its results"""
+    folder, module_name, class_name = GAMES[name]
+
+    # Games load their assets relative to their own folder
+    path = os.path.join(ROOT, folder)
+    os.chdir(path)
+    sys.path.insert(0, path)
+
+    import importlib
+    import pygame
+
+    keys = ScriptedKeys(SCRIPTS[name])
+    pygame.key.get_pressed = keys.get_pressed
+
+    module = importlib.import_module(module_name)
+    game = getattr(module, class_name)()
+
+    clock = BenchmarkClock(game, keys, frames)
+    game.clock = clock
+
+    try:
+        game.game_loop()
+    except StopBenchmark:
+        pass
+
+    total_ms = sum(clock.frame_ms)
+    return {
+        "frames": len(clock.frame_ms),
+        "fps": 1000 * len(clock.frame_ms) / total_ms,
+        "frame_ms_mean": total_ms / len(clock.frame_ms),
+        "frame_ms_min": min(clock.frame_ms),
+        "frame_ms_p50": percentile(clock.frame_ms, 50),
+        "frame_ms_p90": percentile(clock.frame_ms, 90),
+        "frame_ms_p99": percentile(clock.frame_ms, 99),
+        "frame_ms_max": max(clock.frame_ms),
+        "startup_ms": (clock.first_frame - START) * 1000,
+        "startup_stages_ms": game.startup.times_ms(),
+        "peak_rss_mb": peak_rss_mb(),
+        "restarts": clock.restarts,
+    }
+
+
+#------------------------------RUN ALL------------------------------#
+def run_all(names, frames):
+    """Run each game in a new process, return {name: results}
+
+    A game that fails gets {"error": ..., "exit_code": ...} as its results
+    and the rest still run.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+
+    results = {}
+    for name in names:
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__),
+             "--child", name, "--frames", str(frames)],
+            env=env, capture_output=True, text=True
+        )
+        if child.returncode != 0:
+            sys.stderr.write(child.stderr)
+
+            # The last line of the traceback says what went wrong
+            lines = child.stderr.strip().splitlines()
+            results[name] = {
+                "error": lines[-1] if lines else "no output",
+                "exit_code": child.returncode,
+            }
+            continue
+
+        # The results are the last line, pygame prints its banner first
+        results[name] = json.loads(child.stdout.strip().splitlines()[-1])
+
+    return results
+
+
+#------------------------------COMPARE------------------------------#
+def compare(results, baseline, scale=1.0):
+    """Return a list of messages for results worse than the baseline"""
+    failures = []
+    for name, result in results.items():
+        base = baseline.get("games", {}).get(name)
+        if base is None:
+            continue
+
+        for metric, threshold in THRESHOLDS.items():
+            new, old = result.get(metric), base.get(metric)
+            if new is None or old is None:
+                continue
+
+            allowed = threshold * scale
+            if metric in HIGHER_IS_BETTER:
+                worse = new < old * (1 - allowed)
+            else:
+                worse = new > old * (1 + allowed)
+
+            if worse:
+                failures.append(
+                    f"{name} {metric}: {new:.2f} vs baseline {old:.2f}"
+                    f" (allowed {allowed:.0%})"
+                )
+    return failures
+
+
+#------------------------------MAIN------------------------------#
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the games")
+    parser.add_argument("games", nargs="*",
+                        help="games to run, all of them by default: "
+                        + ", ".join(GAMES))
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES,
+                        help="frames to time in each game")
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--baseline",
+                        help="compare with this file, exit 1 on a slowdown")
+    parser.add_argument("--save-baseline",
+                        help="write the results as a new baseline")
+    parser.add_argument("--threshold-scale", type=float, default=1.0,
+                        help="multiply every threshold, 2 allows twice as much")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    for name in args.games:
+        if name not in GAMES:
+            parser.error(f"unknown game {name}")
+
+    # Inside the process that plays one game
+    if args.child:
+        print(json.dumps(run_game(args.child, args.frames)))
+        return
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "frames": args.frames,
+        "games": run_all(args.games or list(GAMES), args.frames),
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as file:
+                file.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        failures = compare(report["games"], baseline, args.threshold_scale)
+        for failure in failures:
+            print("SLOWER:", failure, file=sys.stderr)
+        if failures:
+            sys.exit(1)
+
+    # Every game that ran is in the report, but a failed one still fails the run
+    failed = [name for name, result in report["games"].items()
+              if "error" in result]
+    if failed:
+        print("FAILED:", ", ".join(failed), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
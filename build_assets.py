@@ -0,0 +1,244 @@
+"""
+Filename: build_assets.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Prepare each game's images and sounds ahead of time for a fast start
+
+    python build_assets.py                  Build every game's assets
+    python build_assets.py "Flappy Bird"    Build one game's assets
+
+Writes assets/atlas.png and assets/atlas.json in each game folder.
+The games load the sheet once at startup and cut every image out of it,
+instead of decoding each small PNG and rotating or scaling at load.
+
+The atlas sheet and the short sound effects also get a .raw copy that
+is already decoded: BGRA pixels, and samples resampled to the mixer
+format the games ask for in pygame.mixer.pre_init. The games map these
+files into memory instead of decoding PNG, WAV and MP3 files. A raw
+sound records its mixer format, and the game decodes the file instead
+if its mixer ended up in a different one. WAV clips long enough to be
+streamed get no raw copy, the game never decodes them.
+
+Run this again after changing any of the images or sounds.
+"""
+
+# The mixer is opened to resample the sounds, it doesn't need a sound card
+import os
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# pip install pygame-ce
+import json
+import math
+import sys
+import pygame
+from shared.assets import (RAW_SUFFIX, IMAGE_HEADER, IMAGE_MAGIC,
+                           IMAGE_FORMAT, SOUND_HEADER, SOUND_MAGIC)
+from shared.sfx import DEFAULT_STREAM_SECONDS, wav_seconds
+
+# Folder this file is in, the game folders are next to it
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Images in each game's atlas as (file in assets, angle, size), where
+# size is None or the image whose size it is stretched to. Images the
+# game asks for that aren't here are loaded from their own files, and
+# the game loads an image from its file again if it changed since the
+# atlas was built.
+ATLASES = {
+    "Car Crash": [
+        ("car.ico", 0, None),
+        ("street.png", 0, None),
+        ("player.png", 0, None),
+        ("enemy.png", 0, None),
+    ],
+    "Flappy Bird": [
+        ("flappy_bird_ico.png", 0, None),
+        ("flappy_bird.png", 0, None),
+        ("pipe.png", 0, None),
+        ("pipe.png", 180, None),
+        ("pipe-green.png", 0, "pipe.png"),
+        ("pipe-green.png", 180, "pipe.png"),
+        ("pipe-red.png", 0, "pipe.png"),
+        ("pipe-red.png", 180, "pipe.png"),
+    ],
+    "Tractor Pong": [
+        ("soccer_ball.png", 0, None),
+        ("green_tractor.png", 0, None),
+    ],
+}
+
+# Sound effects loaded with asset_cache.sound() in each game,
+# background music is streamed and left as it is
+SOUNDS = {
+    "Car Crash": ["assets/crash.wav"],
+    "Flappy Bird": ["assets/crash_short.wav"],
+    "Pong": ["pong_assets/hit.wav", "pong_assets/game_over.wav"],
+    "Tractor Pong": ["assets/ball.mp3", "assets/tractor_driving_game_over.wav"],
+}
+
+# Mixer format every game sets with pygame.mixer.pre_init
+MIXER_FORMAT = (44100, 16, 2, 4096)
+
+# Empty pixels around each image so neighbours never bleed into it
+PADDING = 1
+
+ATLAS_IMAGE = "atlas.png"
+ATLAS_MANIFEST = "atlas.json"
+
+
+#------------------------------PREPARE------------------------------#
+def prepare(path, angle, size):
+    """Load an image and scale then rotate it like AssetCache.image()"""
+    image = pygame.image.load(path)
+
+    if size is not None:
+        image = pygame.transform.scale(image, size)
+    if angle:
+        image = pygame.transform.rotate(image, angle)
+
+    return image
+
+
+#------------------------------PACK------------------------------#
+def pack(sizes):
+    """Place rects of the given sizes on shelves, tallest first
+
+    Returns the sheet size and the (x, y) of each rect in the order given.
+    """
+    total_area = sum((w + PADDING) * (h + PADDING) for w, h in sizes)
+    widest = max(w for w, h in sizes) + PADDING
+    sheet_width = max(widest, math.ceil(math.sqrt(total_area)))
+
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    for i in order:
+        width, height = sizes[i]
+
+        # Start a new shelf when this one is full
+        if x + width + PADDING > sheet_width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+
+        positions[i] = (x, y)
+        x += width + PADDING
+        shelf_height = max(shelf_height, height + PADDING)
+
+    return (sheet_width, y + shelf_height), positions
+
+
+#------------------------------BUILD ATLAS------------------------------#
+def build_atlas(folder, sprites):
+    """Pack a game's images into assets/atlas.png with a manifest"""
+    assets = os.path.join(ROOT, folder, "assets")
+
+    # Sizes given as an image, like the colored pipes that the game
+    # stretches to the size of pipe.png
+    sprites = [
+        (file, angle, pygame.image.load(os.path.join(assets, size)).get_size()
+         if isinstance(size, str) else size)
+        for file, angle, size in sprites
+    ]
+
+    images = [
+        prepare(os.path.join(assets, file), angle, size)
+        for file, angle, size in sprites
+    ]
+    sheet_size, positions = pack([image.get_size() for image in images])
+
+    sheet = pygame.Surface(sheet_size, pygame.SRCALPHA)
+    manifest = {"image": ATLAS_IMAGE, "sprites": []}
+
+    for (file, angle, size), image, position in zip(sprites, images, positions):
+        sheet.blit(image, position)
+
+        # The game checks these to tell if the file changed since
+        source = os.stat(os.path.join(assets, file))
+        manifest["sprites"].append({
+            "file": file,
+            "angle": angle,
+            "size": size,
+            "rect": list(position) + list(image.get_size()),
+            "source": {"bytes": source.st_size,
+                       "mtime_ns": source.st_mtime_ns},
+        })
+
+    pygame.image.save(sheet, os.path.join(assets, ATLAS_IMAGE))
+    write_raw_image(sheet, os.path.join(assets, ATLAS_IMAGE))
+    with open(os.path.join(assets, ATLAS_MANIFEST), "w") as file:
+        json.dump(manifest, file, indent=2)
+
+    print(f"{folder}: {len(sprites)} images in {sheet_size[0]}x{sheet_size[1]}")
+
+
+#------------------------------WRITE RAW IMAGE------------------------------#
+def write_raw_image(surface, path):
+    """Write the pixels of surface for shared.assets.load_raw_image()"""
+    width, height = surface.get_size()
+
+    with open(path + RAW_SUFFIX, "wb") as file:
+        file.write(IMAGE_HEADER.pack(IMAGE_MAGIC, width, height))
+        file.write(pygame.image.tobytes(surface, IMAGE_FORMAT))
+
+
+#------------------------------WRITE RAW SOUND------------------------------#
+def write_raw_sound(path):
+    """Decode and resample a sound for shared.assets.load_raw_sound()"""
+    sound = pygame.mixer.Sound(path)
+
+    with open(path + RAW_SUFFIX, "wb") as file:
+        file.write(SOUND_HEADER.pack(SOUND_MAGIC, *pygame.mixer.get_init()))
+        file.write(sound.get_raw())
+
+    return sound.get_length()
+
+
+#------------------------------BUILD SOUNDS------------------------------#
+def build_sounds(folder, sounds):
+    """Write a raw copy of each of a game's short sound effects
+
+    Long clips stream from their file, and a WAV's length is read from
+    its header, so they get no raw copy. Other long files keep theirs,
+    the game needs it to know their length without decoding them.
+    """
+    for sound in sounds:
+        path = os.path.join(ROOT, folder, sound)
+
+        seconds = None
+        if path.lower().endswith(".wav"):
+            seconds = wav_seconds(path)
+
+        if seconds is not None and seconds > DEFAULT_STREAM_SECONDS:
+            # A raw copy from an older build would only take up space
+            if os.path.exists(path + RAW_SUFFIX):
+                os.remove(path + RAW_SUFFIX)
+            print(f"{folder}: {sound} {seconds:.2f} s, streamed, no raw copy")
+            continue
+
+        length = write_raw_sound(path)
+        print(f"{folder}: {sound} {length:.2f} s")
+
+
+#------------------------------MAIN------------------------------#
+def main():
+    games = sorted(set(ATLASES) | set(SOUNDS))
+    folders = sys.argv[1:] or games
+
+    # Same mixer format as the games, so the samples are used as they are
+    pygame.mixer.pre_init(*MIXER_FORMAT)
+    pygame.mixer.init()
+    print(f"Sounds resampled for mixer format {pygame.mixer.get_init()}")
+
+    for folder in folders:
+        if folder not in games:
+            sys.exit(f"No assets for {folder}, choose from: {', '.join(games)}")
+
+        if folder in ATLASES:
+            build_atlas(folder, ATLASES[folder])
+        if folder in SOUNDS:
+            build_sounds(folder, SOUNDS[folder])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Filename: launcher.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Play every game in one window and switch between them without restarting
+
+    python launcher.py
+    STARTUP_REPORT=1 python launcher.py    Also print how long each switch takes
+
+Every game folder has its own config module, so the games can't simply
+be imported side by side. Each game is imported with its own folder
+first on sys.path, and the modules it loads from that folder are kept
+with the game when it is left. Before the game runs again they are put
+back in sys.modules under their plain names, so an "import config" or
+"from traffic import Traffic" inside the game still finds its own.
+
+Pygame, the window and the mixer are started once. A game stays loaded
+after it is left, so going back to it only takes the window and music
+back and carries on where it was. ESC or the game over Exit button go
+back to the launcher, closing the window quits everything.
+"""
+
+# Taken first so the startup report includes the imports
+from time import perf_counter
+IMPORT_START = perf_counter()
+
+# pip install pygame-ce
+# pip install pygame-menu
+import importlib
+import os
+import sys
+import pygame
+from shared import startup
+
+# Folder this file is in, the game folders are next to it
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Menu button -> folder, module and class
+GAMES = {
+    "Pong": ("Pong", "pong", "Pong"),
+    "Car Crash": ("Car Crash", "car_crash", "CarCrash"),
+    "Flappy Bird": ("Flappy Bird", "flappy_bird", "FlappyBird"),
+    "Tractor Pong": ("Tractor Pong", "tractor_pong", "TractorPong"),
+}
+
+# Size of the launcher menu window
+WIDTH = 500
+HEIGHT = 600
+
+FPS = 60
+
+
+class LeaveGame(Exception):
+    """Raised by a game's quit() to go back to the launcher menu"""
+
+
+class GameScene:
+    """One game in the launcher and the modules from its folder
+
+    The game is made the first time it is played and kept after that.
+    """
+
+    def __init__(self, folder, module_name, class_name):
+        self.path = os.path.join(ROOT, folder)
+        self.module_name = module_name
+        self.class_name = class_name
+
+        # Plain module name -> module, for modules in this game's folder
+        self.modules = {}
+
+        self.game = None
+
+#------------------------------ENTER------------------------------#
+    def enter(self):
+        """Make this game's folder and modules the ones Python finds"""
+        # Games load their assets relative to their own folder
+        os.chdir(self.path)
+        sys.path.insert(0, self.path)
+        sys.modules.update(self.modules)
+
+#------------------------------LEAVE------------------------------#
+    def leave(self):
+        """Move this game's modules out of sys.modules and keep them here"""
+        for name, module in list(sys.modules.items()):
+            file = getattr(module, "__file__", None)
+            if file and os.path.dirname(os.path.abspath(file)) == self.path:
+                self.modules[name] = module
+                del sys.modules[name]
+
+        sys.path.remove(self.path)
+        os.chdir(ROOT)
+
+#------------------------------START------------------------------#
+    def start(self, leave_game):
+        """Make the game the first time, take the window back after that"""
+        if self.game is None:
+            module = importlib.import_module(self.module_name)
+            self.game = getattr(module, self.class_name)()
+
+            # ESC and the Exit button come back to the launcher
+            self.game.quit = leave_game
+        else:
+            self.game.resume()
+
+
+class Launcher:
+    """A menu of every game, each game runs in the same window when picked"""
+
+    def __init__(self):
+        # Time each part of startup, STARTUP_REPORT=1 prints it
+        self.startup = startup.StartupTimer(IMPORT_START, startup.enabled())
+
+        # Same mixer settings as every game, so the mixer is opened once
+        pygame.mixer.pre_init(44100, 16, 2, 4096)
+
+        with self.startup.stage("init"):
+            startup.init_pygame()
+
+        with self.startup.stage("display"):
+            self.surface = pygame.display.set_mode((WIDTH, HEIGHT))
+            pygame.display.set_caption("Python Games")
+
+        self.clock = pygame.time.Clock()
+
+        self.scenes = {
+            title: GameScene(*game) for title, game in GAMES.items()
+        }
+
+        # Game picked in the menu, started after the menu is done updating
+        self.chosen = None
+
+        self.menu = self.build_menu()
+
+#------------------------------BUILD MENU------------------------------#
+    def build_menu(self):
+        """Create the launcher menu using the Pygame Menu library"""
+        pm = startup.load_menu()
+
+        menu = pm.Menu(
+            title="Python Games",
+            width=WIDTH,
+            height=HEIGHT,
+            theme=pm.themes.THEME_DARK
+        )
+
+        # One button for each game
+        for title in GAMES:
+            menu.add.button(title, self.choose, title)
+
+        # Add label to provide space between buttons
+        menu.add.label("")
+
+        menu.add.button(title="Exit", action=self.quit)
+
+        return menu
+
+#------------------------------CHOOSE------------------------------#
+    def choose(self, title):
+        """Remember the game picked, it starts after the menu update"""
+        self.chosen = title
+
+#------------------------------LEAVE GAME------------------------------#
+    def leave_game(self):
+        """Replaces each game's quit(), goes back to the launcher menu"""
+        raise LeaveGame
+
+#------------------------------QUIT------------------------------#
+    def quit(self):
+        """Close the launcher and every game in it"""
+        pygame.quit()
+        sys.exit()
+
+#------------------------------PLAY------------------------------#
+    def play(self, title):
+        """Run a game in the launcher window until it quits"""
+        scene = self.scenes[title]
+        started = perf_counter()
+
+        scene.enter()
+        try:
+            scene.start(self.leave_game)
+
+            if self.startup.enabled:
+                ms = (perf_counter() - started) * 1000
+                print(f"{title} ready in {ms:.1f} ms")
+
+            scene.game.game_loop()
+        except LeaveGame:
+            pass
+        finally:
+            scene.leave()
+
+        # Silence the game and take the window back for the menu
+        if pygame.mixer.get_init():
+            pygame.mixer.stop()
+            pygame.mixer.music.stop()
+        pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Python Games")
+
+#------------------------------RUN------------------------------#
+    def run(self):
+        """Show the menu until a game is picked, then play it"""
+        while True:
+            events = pygame.event.get()
+            for event in events:
+                # Closing the window quits everything
+                if event.type == pygame.QUIT:
+                    self.quit()
+
+            self.menu.update(events)
+
+            if self.chosen is not None:
+                title, self.chosen = self.chosen, None
+                self.play(title)
+                continue
+
+            self.menu.draw(self.surface)
+            pygame.display.update()
+            self.startup.first_frame()
+
+            self.clock.tick(FPS)
+
+
+#------------------------------MAIN------------------------------#
+def main():
+    launcher = Launcher()
+    launcher.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Filename: __init__.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Modules shared by all of the games
+"""
@@ -0,0 +1,312 @@
+"""
+Filename: assets.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Load each image and sound once and share it between all game objects
+"""
+
+# pip install pygame-ce
+import json
+import mmap
+import os
+import struct
+import sys
+from collections import OrderedDict
+import pygame
+
+# Default memory budget for cached assets in bytes
+DEFAULT_BUDGET = 64 * 1024 * 1024
+
+# build_assets.py writes a decoded copy of an asset next to it with this
+# added to the file name, it is used instead of the file while it is newer
+RAW_SUFFIX = ".raw"
+
+# Header of a raw image: magic, width, height, then BGRA pixels
+IMAGE_HEADER = struct.Struct("<4sII")
+IMAGE_MAGIC = b"IMG1"
+IMAGE_FORMAT = "BGRA"
+
+# Header of a raw sound: magic, then pygame.mixer.get_init(), then samples
+SOUND_HEADER = struct.Struct("<4siii")
+SOUND_MAGIC = b"PCM1"
+
+
+#------------------------------RAW PATH------------------------------#
+def raw_path(path):
+    """Return the preprocessed copy of path, or None if missing or stale"""
+    raw = path + RAW_SUFFIX
+    try:
+        if os.path.getmtime(raw) >= os.path.getmtime(path):
+            return raw
+    except OSError:
+        pass
+    return None
+
+
+#------------------------------LOAD RAW IMAGE------------------------------#
+def load_raw_image(path):
+    """Return a surface from a raw image file without decoding, or None"""
+    raw = raw_path(path)
+    if raw is None:
+        return None
+
+    # Map the file instead of reading it, the pixels are copied once
+    with open(raw, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, width, height = IMAGE_HEADER.unpack_from(data)
+        if magic != IMAGE_MAGIC:
+            return None
+
+        with memoryview(data) as view:
+            pixels = view[IMAGE_HEADER.size:]
+            surface = pygame.image.frombuffer(
+                pixels, (width, height), IMAGE_FORMAT).copy()
+            pixels.release()
+
+    return surface
+
+
+#------------------------------LOAD RAW SOUND------------------------------#
+def load_raw_sound(path):
+    """Return a Sound from a raw sound file without decoding, or None
+
+    The samples are only used if they are in the mixer's current format,
+    the file's header has the format they were made for.
+    """
+    raw = raw_path(path)
+    if raw is None:
+        return None
+
+    with open(raw, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, *mixer_format = SOUND_HEADER.unpack_from(data)
+        if magic != SOUND_MAGIC:
+            return None
+
+        # The sound card didn't give the mixer the format asked for
+        if tuple(mixer_format) != pygame.mixer.get_init():
+            print(f"{raw} is for mixer format {tuple(mixer_format)} but "
+                  f"the mixer is {pygame.mixer.get_init()}, decoding "
+                  f"{path} instead. Run build_assets.py on this computer.",
+                  file=sys.stderr)
+            return None
+
+        # Sound copies the samples, so the file can be closed
+        with memoryview(data) as view:
+            samples = view[SOUND_HEADER.size:]
+            sound = pygame.mixer.Sound(buffer=samples)
+            samples.release()
+
+    return sound
+
+
+class AssetCache:
+    """Images and sounds keyed by file path and conversion
+
+    When the cached assets use more than budget bytes, the least
+    recently used ones are dropped and loaded from disk again if needed.
+    """
+
+    def __init__(self, budget=DEFAULT_BUDGET):
+        self.budget = budget
+
+        # key -> (asset, size in bytes), oldest used first
+        self.assets = OrderedDict()
+        self.used = 0
+
+        # Counters to see how well the cache is working
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # (file, angle, size) -> (sheet path, rect) for images in an atlas
+        self.atlas = {}
+
+#------------------------------LOAD ATLAS------------------------------#
+    def load_atlas(self, manifest_path):
+        """Serve the images listed in an atlas manifest from its sheet
+
+        The manifest is written by build_assets.py. Images in it are
+        handed out as subsurfaces of the one sheet instead of being
+        loaded from their own files. An image whose file changed since
+        the atlas was built is left out, so it is loaded from the file.
+        Returns False if there is no atlas.
+        """
+        if not os.path.exists(manifest_path):
+            return False
+
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+
+        folder = os.path.dirname(os.path.abspath(manifest_path))
+        sheet = os.path.join(folder, manifest["image"])
+
+        stale = set()
+        for sprite in manifest["sprites"]:
+            path = os.path.join(folder, sprite["file"])
+
+            # Manifests from before the source was saved count as changed
+            source = sprite.get("source")
+            try:
+                info = os.stat(path)
+                changed = source is None \
+                    or info.st_size != source["bytes"] \
+                    or info.st_mtime_ns != source["mtime_ns"]
+            except OSError:
+                changed = True
+
+            if changed:
+                stale.add(sprite["file"])
+                continue
+
+            size = tuple(sprite["size"]) if sprite["size"] else None
+            self.atlas[(path, sprite["angle"], size)] = (
+                sheet, tuple(sprite["rect"]))
+
+        if stale:
+            print(f"{manifest_path} is out of date for "
+                  f"{', '.join(sorted(stale))}, loading them from their "
+                  f"files. Run build_assets.py again.", file=sys.stderr)
+
+        return True
+
+#------------------------------IMAGE------------------------------#
+    def image(self, path, convert="alpha", angle=0, size=None):
+        """Return a surface for an image file
+
+        convert is "alpha" for convert_alpha(), "opaque" for convert(),
+        or None to keep the file's pixel format.
+        angle rotates the image and size scales it to (width, height)
+        before rotating, the changed copies are cached as well.
+        """
+        key = ("image", os.path.abspath(path), convert, angle, size)
+
+        asset = self.get(key)
+        if asset is not None:
+            return asset
+
+        packed = self.atlas.get((key[1], angle, size))
+
+        if packed is not None:
+            # Cut out of the atlas sheet, which shares its pixels
+            sheet, rect = packed
+            asset = self.image(sheet).subsurface(rect)
+
+            if convert == "opaque":
+                # Opaque images blit faster without the sheet's alpha
+                asset = asset.convert()
+        elif angle:
+            # Rotate the cached upright image instead of loading it again
+            asset = pygame.transform.rotate(
+                self.image(path, convert, size=size), angle)
+        elif size is not None:
+            # Scale the cached image instead of loading it again
+            asset = pygame.transform.scale(
+                self.image(path, convert), size)
+        else:
+            # A preprocessed copy skips decoding the file
+            asset = load_raw_image(path)
+            if asset is None:
+                asset = pygame.image.load(path)
+
+            if convert == "alpha":
+                asset = asset.convert_alpha()
+            elif convert == "opaque":
+                asset = asset.convert()
+
+        # Subsurfaces use the sheet's pixels, they cost nothing extra
+        if asset.get_parent() is not None:
+            used = 0
+        else:
+            used = asset.get_pitch() * asset.get_height()
+
+        self.add(key, asset, used)
+        return asset
+
+#------------------------------MASK------------------------------#
+    def mask(self, path, convert="alpha", angle=0):
+        """Return a pygame.mask.Mask of an image's solid pixels
+
+        Built once from the cached image, so collision checks never
+        create masks.
+        """
+        key = ("mask", os.path.abspath(path), convert, angle)
+
+        asset = self.get(key)
+        if asset is not None:
+            return asset
+
+        asset = pygame.mask.from_surface(self.image(path, convert, angle))
+
+        # One bit per pixel
+        width, height = asset.get_size()
+        self.add(key, asset, (width * height + 7) // 8)
+        return asset
+
+#------------------------------SOUND------------------------------#
+    def sound(self, path):
+        """Return a mixer Sound for a sound file"""
+        key = ("sound", os.path.abspath(path))
+
+        asset = self.get(key)
+        if asset is not None:
+            return asset
+
+        # A preprocessed copy is already in the mixer's format
+        asset = load_raw_sound(path)
+        if asset is None:
+            asset = pygame.mixer.Sound(path)
+
+        # Sounds are stored decoded in the mixer's format
+        frequency, size, channels = pygame.mixer.get_init()
+        size = int(asset.get_length() * frequency) * channels * abs(size) // 8
+
+        self.add(key, asset, size)
+        return asset
+
+#------------------------------GET------------------------------#
+    def get(self, key):
+        """Return a cached asset and mark it as recently used, or None"""
+        entry = self.assets.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.assets.move_to_end(key)
+        return entry[0]
+
+#------------------------------ADD------------------------------#
+    def add(self, key, asset, size):
+        """Cache an asset, dropping the least recently used ones over budget"""
+        self.assets[key] = (asset, size)
+        self.used += size
+
+        # Always keep the newest asset, even if it is over budget by itself
+        while self.used > self.budget and len(self.assets) > 1:
+            _, (_, old_size) = self.assets.popitem(last=False)
+            self.used -= old_size
+            self.evictions += 1
+
+#------------------------------CLEAR------------------------------#
+    def clear(self):
+        """Drop every cached asset"""
+        self.assets.clear()
+        self.used = 0
+
+#------------------------------STATS------------------------------#
+    def stats(self):
+        """Return the cache counters as a dictionary"""
+        return {
+            "assets": len(self.assets),
+            "bytes": self.used,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# One cache shared by every game object in the process
+asset_cache = AssetCache()
@@ -0,0 +1,163 @@
+"""
+Filename: collision.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Swept collision tests that fast moving objects can't tunnel through
+"""
+
+from collections import namedtuple
+from math import ceil
+
+# time is the fraction of the move (0.0 to 1.0) when the objects first touch,
+# normal is the (x, y) direction of the side that was hit, pointing away from it
+Contact = namedtuple("Contact", ["time", "normal"])
+
+# Most pixels a mask moves between two pixel tests along a sweep
+MASK_STEP = 4
+
+
+#------------------------------RAY VS RECT------------------------------#
+def ray_rect(origin, direction, rect):
+    """Return the Contact where a ray first enters a rect, or None
+
+    The ray starts at origin and travels the whole direction vector
+    in one move, so only times from 0.0 to 1.0 are a hit.
+    Like Rect.colliderect, touching the edge of the rect is not a hit.
+    """
+    left, top, width, height = rect
+
+    t_enter = float("-inf")
+    t_exit = float("inf")
+    normal = (0, 0)
+
+    # Check the x axis and then the y axis (slab test)
+    for position, speed, low, high, axis in (
+        (origin[0], direction[0], left, left + width, 0),
+        (origin[1], direction[1], top, top + height, 1),
+    ):
+        if speed == 0:
+            # Not moving on this axis, the ray has to already be between the sides
+            if not low < position < high:
+                return None
+            continue
+
+        # Time the ray crosses the near and far side on this axis
+        if speed > 0:
+            near, far, side = (low - position) / speed, (high - position) / speed, -1
+        else:
+            near, far, side = (high - position) / speed, (low - position) / speed, 1
+
+        # The last axis to be entered is the side that gets hit
+        if near > t_enter:
+            t_enter = near
+            normal = (side, 0) if axis == 0 else (0, side)
+
+        t_exit = min(t_exit, far)
+
+    # Missed, already past the rect, or doesn't reach it this move
+    if t_enter >= t_exit or t_exit <= 0 or t_enter > 1:
+        return None
+
+    # Started inside the rect, the normal is the side closest to getting out
+    return Contact(max(t_enter, 0.0), normal)
+
+
+#------------------------------SWEEP RECT------------------------------#
+def sweep_rect(moving, velocity, target):
+    """Return the Contact when moving rect travels by velocity into target, or None
+
+    The target is grown by the size of the moving rect so the moving rect
+    can be treated as a single point (its top left corner).
+    """
+    grown = (
+        target[0] - moving[2],      # left
+        target[1] - moving[3],      # top
+        target[2] + moving[2],      # width
+        target[3] + moving[3],      # height
+    )
+
+    return ray_rect((moving[0], moving[1]), velocity, grown)
+
+
+#------------------------------FIRST CONTACT------------------------------#
+def first_contact(moving, velocity, targets):
+    """Return (index, Contact) of the first target hit along velocity, or None"""
+    first = None
+
+    for index, target in enumerate(targets):
+        contact = sweep_rect(moving, velocity, target)
+
+        if contact is not None and (first is None or contact.time < first[1].time):
+            first = (index, contact)
+
+    return first
+
+
+#------------------------------SWEEP MASK------------------------------#
+def sweep_mask(moving, moving_mask, velocity, target, target_mask, time=0.0):
+    """Return True if the solid pixels of moving touch target's along velocity
+
+    Only the part of the move after time is tested, pass the time of the
+    Contact from sweep_rect so the rects are already known to overlap.
+    The masks are tested at least every MASK_STEP pixels and at the end.
+    """
+    distance = max(abs(velocity[0]), abs(velocity[1])) * (1.0 - time)
+    steps = max(1, ceil(distance / MASK_STEP))
+
+    for step in range(steps + 1):
+        t = time + (1.0 - time) * step / steps
+        offset = (
+            round(moving[0] + velocity[0] * t) - target[0],
+            round(moving[1] + velocity[1] * t) - target[1],
+        )
+        if target_mask.overlap(moving_mask, offset) is not None:
+            return True
+
+    return False
+
+
+#------------------------------COLUMN SPANS------------------------------#
+def column_spans(mask):
+    """Return the (top, bottom) solid row of each column of a mask
+
+    Columns with no solid pixels are None. Made once per mask for
+    sweep_columns().
+    """
+    width, height = mask.get_size()
+    spans = []
+
+    for x in range(width):
+        rows = [y for y in range(height) if mask.get_at((x, y))]
+        spans.append((rows[0], rows[-1]) if rows else None)
+
+    return spans
+
+
+#------------------------------SWEEP COLUMNS------------------------------#
+def sweep_columns(moving, moving_spans, velocity, target, target_spans):
+    """Return True if solid columns of moving touch target's along velocity
+
+    Only for a move straight up or down. Each column of moving covers
+    its solid rows at the start and end of the move and everything in
+    between, so the whole move is tested in one pass without steps.
+    Gaps inside a column count as solid.
+    """
+    offset_x = moving[0] - target[0]
+    start_y = moving[1] - target[1]
+    end_y = start_y + velocity[1]
+
+    for x, span in enumerate(moving_spans):
+        column = x + offset_x
+        if span is None or not 0 <= column < len(target_spans):
+            continue
+
+        target_span = target_spans[column]
+        if target_span is None:
+            continue
+
+        top = min(start_y, end_y) + span[0]
+        bottom = max(start_y, end_y) + span[1]
+        if top <= target_span[1] and bottom >= target_span[0]:
+            return True
+
+    return False
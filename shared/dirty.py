@@ -0,0 +1,82 @@
+"""
+Filename: dirty.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Only redraw and update the parts of the window that changed
+"""
+
+# pip install pygame-ce
+import os
+import pygame
+
+
+#------------------------------ENABLED------------------------------#
+def enabled():
+    """Dirty rectangle mode is opt-in, set DIRTY_RECTS=1 to turn it on"""
+    return os.environ.get("DIRTY_RECTS", "0") not in ("", "0")
+
+
+class DirtyRects:
+    """Track what was drawn each frame and push only those rects to the window
+
+    Each frame call clear() before drawing, add() with the rect of every
+    moving object or text drawn, then update() instead of
+    pygame.display.update(). Last frame's rects are restored from the
+    background and updated too, so nothing is left behind.
+
+    When not enabled, clear() blits the whole background and update()
+    updates the whole window.
+    """
+
+    def __init__(self, surface, background, enabled=True):
+        self.surface = surface
+        self.background = background
+        self.enabled = enabled
+
+        # Rects drawn last frame and this frame
+        self.last = []
+        self.current = []
+
+        # The whole window is drawn on the first frame
+        self.full = True
+
+#------------------------------INVALIDATE------------------------------#
+    def invalidate(self):
+        """Redraw the whole window next frame, e.g. after a menu covered it"""
+        self.full = True
+
+#------------------------------SET BACKGROUND------------------------------#
+    def set_background(self, background):
+        """Use a new background surface and redraw the whole window"""
+        self.background = background
+        self.invalidate()
+
+#------------------------------CLEAR------------------------------#
+    def clear(self):
+        """Restore the background under everything drawn last frame"""
+        if self.full or not self.enabled:
+            self.surface.blit(self.background, (0, 0))
+            return
+
+        for rect in self.last:
+            self.surface.blit(self.background, rect, rect)
+
+#------------------------------ADD------------------------------#
+    def add(self, rect):
+        """Remember a rect drawn this frame, return it for chaining"""
+        if self.enabled:
+            self.current.append(pygame.Rect(rect))
+        return rect
+
+#------------------------------UPDATE------------------------------#
+    def update(self):
+        """Copy the changed parts of the backbuffer to the window"""
+        if not self.enabled or self.full:
+            pygame.display.update()
+            self.full = False
+        else:
+            pygame.display.update(self.last + self.current)
+
+        # This frame's rects are cleared at the start of the next frame
+        self.last = self.current
+        self.current = []
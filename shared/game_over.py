@@ -0,0 +1,88 @@
+"""
+Filename: game_over.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Go from playing to the game over menu without freezing the game loop
+"""
+
+# pip install pygame-ce
+import pygame
+
+# States of a game
+PLAYING = "playing"
+DYING = "dying"
+MENU = "menu"
+
+
+class GameOverScreen:
+    """Game state machine: playing -> dying -> menu -> playing
+
+    While dying the crash sound plays and the game loop keeps pumping
+    events with the last frame on screen. The menu opens when the sound
+    ends or the delay runs out, whichever comes first. The menu is then
+    updated and drawn one frame at a time instead of with its own mainloop.
+    """
+
+    def __init__(self, surface, build_menu):
+        self.surface = surface
+
+        # Called with no arguments to create the pygame_menu Menu
+        self.build_menu = build_menu
+
+        self.state = PLAYING
+        self.menu = None
+        self.channel = None
+        self.started = 0
+        self.delay_ms = 0
+
+#------------------------------PLAYING------------------------------#
+    def playing(self):
+        """Return True while the game itself is running"""
+        return self.state == PLAYING
+
+#------------------------------START------------------------------#
+    def start(self, play_sound=None, delay_ms=0):
+        """End the game and open the menu after the crash sound or delay_ms
+
+        play_sound is called with no arguments to play the crash sound,
+        it returns the Channel the sound plays on or None.
+        """
+        # Collisions can end the game more than once in the same update
+        if self.state != PLAYING:
+            return
+
+        self.state = DYING
+        self.started = pygame.time.get_ticks()
+        self.delay_ms = delay_ms
+
+        # None when the sound was dropped, the delay still opens the menu
+        self.channel = play_sound() if play_sound is not None else None
+
+#------------------------------UPDATE------------------------------#
+    def update(self, events):
+        """Run one frame of the dying or menu state"""
+        if self.state == DYING:
+            elapsed = pygame.time.get_ticks() - self.started
+            sound_done = self.channel is not None \
+                and not self.channel.get_busy()
+
+            if elapsed >= self.delay_ms or sound_done:
+                self.menu = self.build_menu()
+                self.state = MENU
+
+        if self.state == MENU:
+            self.menu.update(events)
+
+            # A button may have closed the menu
+            if self.state == MENU:
+                self.menu.draw(self.surface)
+                pygame.display.update()
+
+#------------------------------CLOSE------------------------------#
+    def close(self):
+        """Close the menu and go back to playing"""
+        if self.menu is not None:
+            self.menu.disable()
+            self.menu = None
+
+        self.state = PLAYING
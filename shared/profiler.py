@@ -0,0 +1,236 @@
+"""
+Filename: profiler.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Time each phase of the game loop, show it on screen and save it to CSV
+"""
+
+# pip install pygame-ce
+import atexit
+import csv
+import os
+from collections import deque
+from time import perf_counter
+import pygame
+
+# Frames kept for the rolling p50/p99 on the overlay
+DEFAULT_WINDOW = 120
+
+# Most frames kept for the CSV, the oldest are dropped after this
+# many so a long session doesn't keep growing (5 minutes at 60 fps)
+CSV_FRAMES = 18_000
+
+# The overlay text is rendered again every this many frames
+HUD_REFRESH = 15
+
+# Key that turns the profiler on and off while playing
+TOGGLE_KEY = pygame.K_F3
+
+
+#------------------------------ENABLED------------------------------#
+def enabled():
+    """The profiler is off by default, set FRAME_PROFILER=1 to start it on"""
+    return os.environ.get("FRAME_PROFILER", "0") not in ("", "0")
+
+
+#------------------------------PERCENTILE------------------------------#
+def percentile(values, p):
+    """Return the p-th percentile (0 to 100) of values, nearest rank"""
+    ordered = sorted(values)
+    rank = round(p / 100 * (len(ordered) - 1))
+    return ordered[rank]
+
+
+class _Phase:
+    """Context manager that adds the time spent inside it to one phase
+
+    Phases can be nested, like collision inside update. The outer phase
+    is paused while the inner one runs, so no time is counted twice.
+    """
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        now = perf_counter()
+        stack = self.profiler.stack
+        if stack:
+            stack[-1].pause(now)
+        stack.append(self)
+        self.start = now
+        return self
+
+    def __exit__(self, *exc):
+        now = perf_counter()
+        stack = self.profiler.stack
+        stack.pop()
+        self.pause(now)
+        if stack:
+            stack[-1].start = now
+        return False
+
+    def pause(self, now):
+        """Add the time since start to this phase"""
+        frame = self.profiler.frame
+        frame[self.name] = frame.get(self.name, 0.0) \
+            + (now - self.start) * 1000
+
+
+class _NoPhase:
+    """Does nothing, used while the profiler is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FrameProfiler:
+    """Milliseconds spent in each phase of every frame
+
+    Wrap each part of the game loop in "with profiler.phase(name):" and
+    call end_frame() once at the end of the loop. A phase used more than
+    once in a frame, like update with several fixed updates, is added up.
+    Press F3 to turn it on and off. The last CSV_FRAMES profiled frames
+    are written to CSV when the program exits.
+    """
+
+    def __init__(self, enabled=False, window=DEFAULT_WINDOW, csv_path=None):
+        self.enabled = enabled
+
+        # Phases in the order they were first seen, the CSV columns
+        self.phases = []
+
+        # Phase -> ms for the frame being timed
+        self.frame = {}
+
+        # Last few frames for the overlay, and (number, frame) for the
+        # CSV, numbered from the first profiled frame
+        self.recent = deque(maxlen=window)
+        self.frames = deque(maxlen=CSV_FRAMES)
+        self.frame_number = 0
+
+        # Where the CSV goes, in the game's folder by default. Made a full
+        # path now, the launcher changes folder before the program exits.
+        self.csv_path = os.path.abspath(csv_path or os.environ.get(
+            "FRAME_PROFILER_CSV", "frame_profile.csv"))
+
+        # Rendered overlay lines, refreshed every HUD_REFRESH frames
+        self.font = None
+        self.lines = []
+        self.count = 0
+
+        # Reused context managers so timing a phase doesn't allocate,
+        # and the ones running right now, innermost last
+        self.timers = {}
+        self.stack = []
+        self.no_phase = _NoPhase()
+
+        # F3 is pressed while a phase is running, toggle at the frame's end
+        self.toggle_pending = False
+
+        atexit.register(self.write_csv)
+
+#------------------------------TOGGLE------------------------------#
+    def toggle(self):
+        """Turn the profiler on or off, only call this between frames"""
+        self.enabled = not self.enabled
+        self.frame = {}
+        self.stack = []
+        self.recent.clear()
+        self.lines = []
+
+#------------------------------HANDLE EVENT------------------------------#
+    def handle_event(self, event):
+        """Toggle at the end of the frame when the profiler key is pressed"""
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.toggle_pending = not self.toggle_pending
+
+#------------------------------PHASE------------------------------#
+    def phase(self, name):
+        """Return a context manager that times one phase"""
+        if not self.enabled:
+            return self.no_phase
+
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = _Phase(self, name)
+            self.phases.append(name)
+        return timer
+
+#------------------------------END FRAME------------------------------#
+    def end_frame(self):
+        """Store the timings of the frame that just finished"""
+        if self.enabled:
+            self.recent.append(self.frame)
+            self.frames.append((self.frame_number, self.frame))
+            self.frame_number += 1
+            self.frame = {}
+            self.count += 1
+
+        if self.toggle_pending:
+            self.toggle_pending = False
+            self.toggle()
+
+#------------------------------STATS------------------------------#
+    def stats(self):
+        """Return {phase: (p50, p99)} in ms over the last few frames"""
+        result = {}
+        for name in self.phases:
+            values = [frame.get(name, 0.0) for frame in self.recent]
+            if values:
+                result[name] = (percentile(values, 50), percentile(values, 99))
+
+        totals = [sum(frame.values()) for frame in self.recent]
+        if totals:
+            result["total"] = (percentile(totals, 50), percentile(totals, 99))
+        return result
+
+#------------------------------DRAW------------------------------#
+    def draw(self, surface):
+        """Draw the p50/p99 overlay at the top right under the scores
+
+        Returns the rect drawn so it can be added to the dirty rects.
+        """
+        if self.font is None:
+            self.font = pygame.font.SysFont("monospace", 14)
+
+        # Rendering text every frame would show up in the draw phase
+        if not self.lines or self.count % HUD_REFRESH == 0:
+            text = ["phase        p50    p99 ms"]
+            for name, (p50, p99) in self.stats().items():
+                text.append(f"{name:<10} {p50:6.2f} {p99:6.2f}")
+            self.lines = [
+                self.font.render(line, True, "white", "black")
+                for line in text
+            ]
+
+        width = max(line.get_width() for line in self.lines)
+        height = sum(line.get_height() for line in self.lines)
+        rect = pygame.Rect(surface.get_width() - width - 5, 40, width, height)
+
+        y = rect.top
+        for line in self.lines:
+            surface.blit(line, (rect.left, y))
+            y += line.get_height()
+
+        return rect
+
+#------------------------------WRITE CSV------------------------------#
+    def write_csv(self):
+        """Write one row per kept frame, ms per phase"""
+        if not self.frames:
+            return
+
+        with open(self.csv_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame"] + self.phases + ["total"])
+            for number, frame in self.frames:
+                times = [frame.get(name, 0.0) for name in self.phases]
+                writer.writerow(
+                    [number] + [f"{ms:.3f}" for ms in times]
+                    + [f"{sum(times):.3f}"]
+                )
@@ -0,0 +1,207 @@
+"""
+Filename: replay.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Record the keys pressed in a game and play them back exactly
+
+    RECORD_INPUT=session.keys python pong.py    Record a game
+    REPLAY_INPUT=session.keys python pong.py    Watch it again
+    REPLAY_INPUT=session.keys REPLAY_SPEED=max python pong.py
+
+A log is a small header with the random seed and the game's variant,
+then one byte for every fixed update with the arrow keys and ESC held
+down in that update. Restarting after game over is one more byte. The
+games take all their random numbers from a Random seeded from the log,
+and update at a fixed rate, so the same bytes always play the same game.
+
+The variant is one number for a setting that changes how the game
+plays, like how many pipe pairs Flappy Bird has. A replay plays with the
+variant it was recorded with, whatever the config says now.
+"""
+
+# pip install pygame-ce
+import atexit
+import os
+import random
+import struct
+import pygame
+
+# File header: magic bytes, format version, random seed
+HEADER = struct.Struct("<4sBQ")
+MAGIC = b"KEYS"
+VERSION = 2
+
+# Version 2 adds the game's variant after the header
+VARIANT = struct.Struct("<H")
+
+# Bit for each key in an update's byte
+KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT,
+        pygame.K_ESCAPE)
+
+# Byte written when the player restarts after game over
+RESTART = 0x80
+
+# Fast-forward replays run this many updates for each frame drawn
+FAST_FORWARD_UPDATES = 5
+
+
+class KeyState:
+    """The keys held in one update, indexed like pygame.key.get_pressed()"""
+
+    def __init__(self, mask):
+        self.pressed = {key for bit, key in enumerate(KEYS) if mask >> bit & 1}
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class FastClock:
+    """Clock for fast-forward replays, never waits between frames
+
+    get_time() reports enough time for FAST_FORWARD_UPDATES fixed updates,
+    so every frame drawn runs that many.
+    """
+
+    def __init__(self, timestep):
+        self.timestep = timestep
+
+    def tick(self, framerate=0):
+        return 0
+
+    def get_time(self):
+        return self.timestep.step_ms * FAST_FORWARD_UPDATES
+
+    def get_fps(self):
+        return 0.0
+
+
+class InputLog:
+    """Reads the keyboard once per update and records or replays it
+
+    Games call get_pressed() where they used pygame.key.get_pressed(),
+    once per fixed update, and restarted() when a new game starts.
+    With neither a record nor a replay path it only reads the keyboard.
+    """
+
+    def __init__(self, record_path=None, replay_path=None, fast=False):
+        self.record_path = record_path
+        self.replaying = replay_path is not None
+        self.fast = fast
+
+        # One byte per update, read from or written to the log
+        self.data = bytearray()
+        self.position = 0
+
+        if self.replaying:
+            with open(replay_path, "rb") as file:
+                magic, version, self.seed = HEADER.unpack(
+                    file.read(HEADER.size))
+                if magic != MAGIC or version not in (1, VERSION):
+                    raise ValueError(f"{replay_path} is not a key log")
+
+                # Version 1 logs were made before there was a variant
+                if version == 1:
+                    self.recorded_variant = None
+                else:
+                    self.recorded_variant, = VARIANT.unpack(
+                        file.read(VARIANT.size))
+
+                self.data = bytearray(file.read())
+        else:
+            self.seed = random.randrange(2 ** 63)
+
+        # Set by variant(), saved in the header of a recording
+        self.variant_value = 0
+
+        # Every possible byte's key state, so replaying doesn't allocate
+        self.states = [KeyState(mask) for mask in range(1 << len(KEYS))]
+
+        if record_path is not None:
+            atexit.register(self.save)
+
+#------------------------------RANDOM------------------------------#
+    def random(self):
+        """Return a Random seeded from the log for all of a game's randomness"""
+        return random.Random(self.seed)
+
+#------------------------------VARIANT------------------------------#
+    def variant(self, value, old_value=0):
+        """Return the variant to play, like Flappy Bird's pipe count
+
+        value is what the config asks for, a recording keeps it in its
+        header. A replay returns the variant it was recorded with, or
+        old_value for a version 1 log, the setting those logs played with.
+        """
+        if self.replaying:
+            value = self.recorded_variant
+            if value is None:
+                value = old_value
+
+        self.variant_value = value
+        return value
+
+#------------------------------GET PRESSED------------------------------#
+    def get_pressed(self):
+        """Return the keys held in this update"""
+        if self.replaying:
+            if self.finished():
+                return self.states[0]
+
+            mask = self.data[self.position]
+            if mask & RESTART:
+                raise ValueError("replay does not match the game, "
+                                 "the recorded game restarted here")
+            self.position += 1
+            return self.states[mask]
+
+        keys = pygame.key.get_pressed()
+
+        if self.record_path is not None:
+            mask = 0
+            for bit, key in enumerate(KEYS):
+                if keys[key]:
+                    mask |= 1 << bit
+            self.data.append(mask)
+
+        return keys
+
+#------------------------------RESTART DUE------------------------------#
+    def restart_due(self):
+        """Return True when the replay restarts the game next"""
+        return self.replaying and not self.finished() \
+            and self.data[self.position] == RESTART
+
+#------------------------------RESTARTED------------------------------#
+    def restarted(self):
+        """A new game started, record it or step past it in the replay"""
+        if self.replaying:
+            if self.restart_due():
+                self.position += 1
+        elif self.record_path is not None:
+            self.data.append(RESTART)
+
+#------------------------------FINISHED------------------------------#
+    def finished(self):
+        """Return True when a replay has used up the whole log"""
+        return self.replaying and self.position >= len(self.data)
+
+#------------------------------SAVE------------------------------#
+    def save(self):
+        """Write the recorded log, this runs when the program exits"""
+        with open(self.record_path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.seed))
+            file.write(VARIANT.pack(self.variant_value))
+            file.write(self.data)
+
+
+#------------------------------FROM ENVIRONMENT------------------------------#
+def from_environment():
+    """Create an InputLog from RECORD_INPUT, REPLAY_INPUT and REPLAY_SPEED
+
+    REPLAY_SPEED is "real" (the default) or "max" for fast-forward.
+    """
+    return InputLog(
+        record_path=os.environ.get("RECORD_INPUT") or None,
+        replay_path=os.environ.get("REPLAY_INPUT") or None,
+        fast=os.environ.get("REPLAY_SPEED", "real") == "max",
+    )
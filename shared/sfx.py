@@ -0,0 +1,359 @@
+"""
+Filename: sfx.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Play sound effects on mixer channels kept just for them
+
+Every effect is loaded once when the game starts. Playing one never
+reads a file or makes a new Sound, it only picks one of the reserved
+channels. Each effect has a limit on how many voices play at once.
+When it already has that many, its oldest voice starts over with the new
+sound. When every channel is busy, the oldest sound of the same or a
+lower priority is cut off. If there is none, the play is dropped and
+counted, the counts are printed when the game closes.
+
+Long clips, or clips that would push the decoded sound effects past a
+memory budget, are not loaded at all. They stream from their file
+through mixer.music when played, like the game over sounds that play
+after the background music has stopped. SFX_BUDGET sets the budget in
+bytes. The background music goes through load_music() and play_music()
+so it is loaded again after a streamed clip took its place.
+
+With no mixer, like on a computer without a sound card, nothing is
+loaded and every method does nothing, so the game plays silently.
+"""
+
+# pip install pygame-ce
+import atexit
+import os
+import struct
+import sys
+import pygame
+from shared.assets import asset_cache, raw_path, SOUND_HEADER, SOUND_MAGIC
+
+# Channels kept for sound effects, Sound.play() never picks them
+DEFAULT_CHANNELS = 6
+
+# Most bytes of decoded sound effects kept in memory
+DEFAULT_BUDGET = 512 * 1024
+
+# Clips longer than this many seconds are streamed
+DEFAULT_STREAM_SECONDS = 2.0
+
+
+#------------------------------WAV SECONDS------------------------------#
+def wav_seconds(path):
+    """Return how long a WAV file plays from its header, or None"""
+    with open(path, "rb") as file:
+        riff, _, wave = struct.unpack("<4sI4s", file.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            return None
+
+        bytes_per_second = None
+        while True:
+            header = file.read(8)
+            if len(header) < 8:
+                return None
+            chunk, length = struct.unpack("<4sI", header)
+
+            if chunk == b"fmt ":
+                # Format, channels and sample rate come before it
+                bytes_per_second, = struct.unpack_from("<I", file.read(length), 8)
+            elif chunk == b"data":
+                return length / bytes_per_second if bytes_per_second else None
+            else:
+                file.seek(length, 1)
+
+            # Chunks start on an even byte
+            if length % 2:
+                file.seek(1, 1)
+
+
+#------------------------------CLIP SECONDS------------------------------#
+def clip_seconds(path):
+    """Return how long a sound file plays in seconds, or None if unknown
+
+    Only headers are read, from the raw copy build_assets.py made or the
+    WAV file itself. Nothing is decoded.
+    """
+    raw = raw_path(path)
+    if raw is not None:
+        with open(raw, "rb") as file:
+            magic, frequency, size, channels = SOUND_HEADER.unpack(
+                file.read(SOUND_HEADER.size))
+        if magic == SOUND_MAGIC:
+            samples = os.path.getsize(raw) - SOUND_HEADER.size
+            return samples / (frequency * channels * abs(size) // 8)
+
+    if path.lower().endswith(".wav"):
+        return wav_seconds(path)
+    return None
+
+
+#------------------------------DECODED SIZE------------------------------#
+def decoded_size(seconds):
+    """Return the bytes a clip this long takes in the mixer's format"""
+    frequency, size, channels = pygame.mixer.get_init()
+    return int(seconds * frequency) * channels * abs(size) // 8
+
+
+class MusicChannel:
+    """Stands in for the Channel of an effect streamed through mixer.music"""
+
+    def get_busy(self):
+        return pygame.mixer.music.get_busy()
+
+    def stop(self):
+        pygame.mixer.music.stop()
+
+
+class SoundEffect:
+    """A loaded sound and how it may be played"""
+
+    def __init__(self, sound, voices, priority, path=None, volume=1.0):
+        # None when the effect is streamed from path instead
+        self.sound = sound
+        self.path = path
+        self.volume = volume
+
+        # Most channels this effect can play on at the same time
+        self.voices = voices
+
+        # Higher priority sounds can cut off lower ones when all channels
+        # are busy, like a crash cutting off a bounce
+        self.priority = priority
+
+
+class SoundEffects:
+    """Named sound effects played on a pool of reserved mixer channels
+
+    Call load() for each effect before the game starts and play(name)
+    when it should be heard. Start the mixer first, without one the
+    effects stay silent.
+    """
+
+    def __init__(self, channels=DEFAULT_CHANNELS, budget=None,
+                 stream_seconds=DEFAULT_STREAM_SECONDS):
+        # False when the mixer didn't start, then there are no channels
+        self.enabled = pygame.mixer.get_init() is not None
+        if not self.enabled:
+            channels = 0
+        else:
+            # The mixer needs at least this many channels, the first ones
+            # are reserved so only this pool uses them
+            if pygame.mixer.get_num_channels() < channels:
+                pygame.mixer.set_num_channels(channels)
+            pygame.mixer.set_reserved(channels)
+
+        # Made once, they are reused for every play
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+
+        # Effect last played on each channel and when it started
+        self.playing = [None] * channels
+        self.started = [0] * channels
+
+        # name -> SoundEffect
+        self.effects = {}
+
+        # Bytes of decoded effects in memory and the most there can be
+        if budget is None:
+            budget = int(os.environ.get("SFX_BUDGET", DEFAULT_BUDGET))
+        self.budget = budget
+        self.resident = 0
+        self.stream_seconds = stream_seconds
+
+        # The one effect streaming through mixer.music
+        self.music_channel = MusicChannel()
+        self.streaming = None
+
+        # Background music, and the file mixer.music has loaded now
+        self.music_path = None
+        self.music_volume = 1.0
+        self.music_loaded = None
+
+        # Counters to see how well the pool is working
+        self.plays = 0
+        self.stolen = 0
+        self.dropped = 0
+
+        atexit.register(self.report)
+
+#------------------------------LOAD------------------------------#
+    def load(self, name, path, volume=1.0, voices=1, priority=0):
+        """Load a sound effect once and give it a name to play it by
+
+        Clips longer than stream_seconds, or too big for what is left of
+        the budget, are streamed instead and only one plays at a time.
+        """
+        # Without a mixer only the name is kept, play() does nothing
+        if not self.enabled:
+            self.effects[name] = SoundEffect(None, 1, priority, path, volume)
+            return
+
+        # Clips of unknown length, like MP3s without a raw copy, are loaded
+        seconds = clip_seconds(path)
+        if seconds is not None and (
+                seconds > self.stream_seconds
+                or self.resident + decoded_size(seconds) > self.budget):
+            self.effects[name] = SoundEffect(None, 1, priority, path, volume)
+            return
+
+        sound = asset_cache.sound(path)
+        sound.set_volume(volume)
+        self.resident += decoded_size(sound.get_length())
+
+        self.effects[name] = SoundEffect(sound, voices, priority)
+
+#------------------------------PLAY------------------------------#
+    def play(self, name, loops=0):
+        """Play an effect, return the Channel it plays on or None if dropped"""
+        effect = self.effects[name]
+        if not self.enabled:
+            return None
+
+        if effect.sound is None:
+            return self.stream(effect, loops)
+
+        # Look at every channel once: a free one, this effect's oldest
+        # voice and the oldest sound that can be cut off
+        free = None
+        voices = 0
+        oldest_voice = None
+        oldest_other = None
+
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                if free is None:
+                    free = i
+                continue
+
+            playing = self.playing[i]
+            if playing is effect:
+                voices += 1
+                if oldest_voice is None \
+                        or self.started[i] < self.started[oldest_voice]:
+                    oldest_voice = i
+
+            # A busy channel with no effect was played from outside the pool
+            elif playing is None or playing.priority <= effect.priority:
+                if oldest_other is None \
+                        or self.started[i] < self.started[oldest_other]:
+                    oldest_other = i
+
+        if voices >= effect.voices:
+            # Start this effect's oldest voice over
+            i = oldest_voice
+            self.stolen += 1
+        elif free is not None:
+            i = free
+        elif oldest_other is not None:
+            # Cut off the oldest sound that isn't more important
+            i = oldest_other
+            self.stolen += 1
+        else:
+            self.dropped += 1
+            return None
+
+        channel = self.channels[i]
+        channel.play(effect.sound, loops)
+        self.playing[i] = effect
+        self.started[i] = pygame.time.get_ticks()
+        self.plays += 1
+
+        return channel
+
+#------------------------------STREAM------------------------------#
+    def stream(self, effect, loops):
+        """Play a streamed effect through mixer.music in place of anything on it"""
+        if pygame.mixer.music.get_busy():
+            self.stolen += 1
+
+        pygame.mixer.music.load(effect.path)
+        pygame.mixer.music.set_volume(effect.volume)
+        pygame.mixer.music.play(loops)
+        self.music_loaded = effect.path
+        self.streaming = effect
+        self.plays += 1
+
+        return self.music_channel
+
+#------------------------------LOAD MUSIC------------------------------#
+    def load_music(self, path, volume=1.0):
+        """Load the background music, it streams through mixer.music
+
+        A missing or broken music file, or no mixer at all, only means
+        the game plays without music.
+        """
+        self.music_volume = volume
+
+        if not self.enabled:
+            self.music_path = None
+            return
+
+        try:
+            pygame.mixer.music.load(path)
+        except pygame.error as error:
+            print(f"No music, {path} can't be played: {error}",
+                  file=sys.stderr)
+            self.music_path = None
+            return
+
+        self.music_path = path
+        pygame.mixer.music.set_volume(volume)
+        self.music_loaded = path
+
+#------------------------------PLAY MUSIC------------------------------#
+    def play_music(self, loops=-1):
+        """Play the background music, loading it again if a clip replaced it"""
+        if self.music_path is None:
+            # No music to go back to, only stop a clip still streaming
+            if self.streaming is not None:
+                pygame.mixer.music.stop()
+                self.streaming = None
+            return
+
+        if self.music_loaded != self.music_path:
+            self.load_music(self.music_path, self.music_volume)
+
+        self.streaming = None
+        pygame.mixer.music.play(loops)
+
+#------------------------------STOP------------------------------#
+    def stop(self):
+        """Stop every sound effect playing, streamed ones too"""
+        for channel in self.channels:
+            channel.stop()
+
+        if self.streaming is not None:
+            pygame.mixer.music.stop()
+            self.streaming = None
+
+#------------------------------STOP MUSIC------------------------------#
+    def stop_music(self):
+        """Stop the background music or a streamed clip"""
+        if self.enabled:
+            pygame.mixer.music.stop()
+        self.streaming = None
+
+#------------------------------STATS------------------------------#
+    def stats(self):
+        """Return the pool counters as a dictionary"""
+        return {
+            "channels": len(self.channels),
+            "effects": len(self.effects),
+            "streamed": sum(
+                effect.sound is None for effect in self.effects.values()),
+            "resident_bytes": self.resident,
+            "budget": self.budget,
+            "plays": self.plays,
+            "stolen": self.stolen,
+            "dropped": self.dropped,
+        }
+
+#------------------------------REPORT------------------------------#
+    def report(self):
+        """Print how many plays were dropped, this runs when the program exits"""
+        if self.dropped:
+            print(f"Sound effects: {self.dropped} of "
+                  f"{self.plays + self.dropped} plays dropped, "
+                  f"{self.stolen} voices cut off", file=sys.stderr)
@@ -0,0 +1,141 @@
+"""
+Filename: startup.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Start pygame quickly and report where the startup time goes
+
+    STARTUP_REPORT=1 python pong.py    Print the startup times
+
+Each game notes perf_counter() before it imports anything and times
+each part of its startup: import, init, display, font and assets.
+The report is printed when the first frame is on screen.
+"""
+
+# pip install pygame-ce
+import importlib
+import os
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+import pygame
+
+# Order of the parts in the report, anything else is listed after them
+STAGES = ("import", "init", "display", "font", "assets")
+
+
+#------------------------------ENABLED------------------------------#
+def enabled():
+    """Return True if STARTUP_REPORT is set to something other than 0"""
+    return os.environ.get("STARTUP_REPORT", "0") not in ("", "0")
+
+
+#------------------------------INIT PYGAME------------------------------#
+def init_pygame():
+    """Start only the parts of pygame the games use
+
+    pygame.init() also starts the joystick, camera and other modules the
+    games never touch. pygame_menu starts the joystick itself if a menu
+    needs it.
+    """
+    pygame.display.init()
+    pygame.font.init()
+
+    # Like pygame.init(), carry on without sound if there is no sound card
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pass
+
+
+#------------------------------LOAD MENU------------------------------#
+def load_menu():
+    """Return the pygame_menu module, ready to make a menu
+
+    pygame_menu is only needed at game over, so it is not imported when
+    the game starts. It also refuses to make a menu before pygame.init()
+    has been called, so that runs here, where the few milliseconds it
+    takes for the modules not started yet don't delay the first frame.
+    """
+    if not pygame.get_init():
+        pygame.init()
+
+    import pygame_menu
+    return pygame_menu
+
+
+#------------------------------PREWARM MENU------------------------------#
+def prewarm_menu():
+    """Import pygame_menu on a background thread while the game plays
+
+    Most of the import happens while the game loop waits in clock.tick(),
+    so the menu opens without a pause at game over. If the game ends
+    before it is done, load_menu() waits for the import to finish.
+    Only the import runs on the thread, pygame.init() stays on the
+    main thread in load_menu().
+    """
+    thread = threading.Thread(
+        target=importlib.import_module, args=("pygame_menu",), daemon=True
+    )
+    thread.start()
+    return thread
+
+
+class StartupTimer:
+    """Time spent in each part of a game's startup
+
+    start is the perf_counter() the game took before its imports,
+    everything from then until the timer is made counts as "import".
+    """
+
+    def __init__(self, start, enabled=False):
+        self.start = start
+        self.enabled = enabled
+
+        # Part name -> seconds, parts can be timed more than once
+        self.stages = {"import": perf_counter() - start}
+
+        self.first_frame_time = None
+
+#------------------------------STAGE------------------------------#
+    @contextmanager
+    def stage(self, name):
+        """Add the time spent in the with block to the named part"""
+        began = perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) \
+                + perf_counter() - began
+
+#------------------------------FIRST FRAME------------------------------#
+    def first_frame(self):
+        """Call after each frame is shown, True after only the first one"""
+        if self.first_frame_time is not None:
+            return False
+
+        self.first_frame_time = perf_counter() - self.start
+        if self.enabled:
+            print(self.report())
+        return True
+
+#------------------------------TIMES MS------------------------------#
+    def times_ms(self):
+        """Return {part: milliseconds}, with "other" for untimed startup code"""
+        order = [name for name in STAGES if name in self.stages]
+        order += [name for name in self.stages if name not in STAGES]
+        times = {name: self.stages[name] * 1000 for name in order}
+
+        if self.first_frame_time is not None:
+            total = self.first_frame_time * 1000
+            times["other"] = max(0.0, total - sum(times.values()))
+            times["first_frame"] = total
+
+        return times
+
+#------------------------------REPORT------------------------------#
+    def report(self):
+        """Return the startup times as a small table"""
+        lines = ["Startup time:"]
+        for name, ms in self.times_ms().items():
+            lines.append(f"  {name:<12}{ms:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,61 @@
+"""
+Filename: text.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Keep rendered text surfaces so the same text isn't rendered every frame
+"""
+
+# pip install pygame-ce
+from collections import OrderedDict
+import pygame
+
+# Default number of text surfaces to keep
+DEFAULT_SIZE = 64
+
+
+class TextCache:
+    """Rendered text keyed by font, text, antialias and color
+
+    Font.render is only called when the text changes, like when the score
+    goes up. The least recently used surfaces are dropped past maxsize.
+    """
+
+    def __init__(self, maxsize=DEFAULT_SIZE):
+        self.maxsize = maxsize
+
+        # key -> surface, oldest used first
+        self.surfaces = OrderedDict()
+
+        # Counters to see how well the cache is working
+        self.hits = 0
+        self.misses = 0
+
+#------------------------------RENDER------------------------------#
+    def render(self, font, text, antialias, color):
+        """Return the same surface as font.render(text, antialias, color)"""
+        # Colors can be names or tuples, compare them as RGBA
+        key = (font, text, antialias, tuple(pygame.Color(color)))
+
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+
+        return surface
+
+#------------------------------CLEAR------------------------------#
+    def clear(self):
+        """Drop every cached surface"""
+        self.surfaces.clear()
+
+
+# One cache shared by every game in the process
+text_cache = TextCache()
@@ -0,0 +1,82 @@
+"""
+Filename: timestep.py
+Author: Lee Dillard
+Created: 10/18/2026
+Purpose: Run game updates at a fixed rate no matter how fast frames are drawn
+"""
+
+# pip install pygame-ce
+import pygame
+
+# Moves longer than this many pixels in one update are jumps (respawns),
+# they are drawn at the new position instead of blended
+SNAP_DISTANCE = 200
+
+
+class FixedTimestep:
+    """Turn the time each frame took into a number of fixed length updates
+
+    Each frame pass clock.get_time() to advance() and run update that many
+    times. alpha() is how far the game is between the last two updates,
+    for drawing moving objects between their old and new positions.
+    """
+
+    def __init__(self, updates_per_second=60, max_updates=5):
+        # Length of one update in milliseconds
+        self.step_ms = 1000 / updates_per_second
+
+        # Most updates to run in one frame when catching up after a slow
+        # frame, so a long stall can't freeze the game while it catches up
+        self.max_updates = max_updates
+
+        # Time that has passed but hasn't been simulated yet
+        self.accumulator = 0.0
+
+        # Counts updates dropped because the game fell too far behind
+        self.dropped = 0
+
+#------------------------------RESET------------------------------#
+    def reset(self):
+        """Forget any time that hasn't been simulated, like after a menu"""
+        self.accumulator = 0.0
+
+#------------------------------ADVANCE------------------------------#
+    def advance(self, frame_ms):
+        """Add the time of the last frame, return how many updates to run"""
+        self.accumulator += frame_ms
+        updates = int(self.accumulator // self.step_ms)
+
+        if updates > self.max_updates:
+            # Too far behind, drop the time instead of speeding up
+            self.dropped += updates - self.max_updates
+            updates = self.max_updates
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= updates * self.step_ms
+
+        return updates
+
+#------------------------------ALPHA------------------------------#
+    def alpha(self):
+        """Return how far from 0.0 to 1.0 time is into the next update"""
+        return self.accumulator / self.step_ms
+
+
+#------------------------------LERP RECT------------------------------#
+def lerp_rect(previous, current, alpha):
+    """Return a copy of current moved alpha of the way from previous
+
+    Jumps longer than SNAP_DISTANCE are not blended.
+    """
+    dx = current[0] - previous[0]
+    dy = current[1] - previous[1]
+
+    if abs(dx) + abs(dy) > SNAP_DISTANCE:
+        return pygame.Rect(current)
+
+    return pygame.Rect(
+        round(previous[0] + dx * alpha),
+        round(previous[1] + dy * alpha),
+        current[2],
+        current[3]
+    )